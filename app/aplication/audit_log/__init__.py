@@ -0,0 +1,7 @@
+"""
+Casos de Uso de Auditoria
+"""
+
+from .audit_log_query_use_case import AuditLogQueryUseCase
+
+__all__ = ["AuditLogQueryUseCase"]
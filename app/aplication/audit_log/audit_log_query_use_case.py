@@ -0,0 +1,149 @@
+import base64
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.infrastructure.repositories.audit_log.audit_log_repository import (
+    AUDIT_LOG_FIELDS,
+    AuditLogCursor,
+    AuditLogFilter,
+    AuditLogRepository,
+)
+from app.shared.ndjson import encode_ndjson
+
+
+def encode_cursor(created_at: datetime, log_id: str) -> str:
+    """Codifica a posição (created_at, id) em um cursor opaco"""
+    raw = f"{created_at.isoformat()}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> AuditLogCursor:
+    """
+    Decodifica um cursor gerado por encode_cursor
+    
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, log_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), log_id
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido")
+
+
+def _as_utc_naive(moment: Optional[datetime]) -> Optional[datetime]:
+    """Os registros guardam UTC sem fuso; datas com fuso são convertidas"""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class AuditLogQueryUseCase:
+    """Caso de uso para consulta paginada dos registros de auditoria"""
+    
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 500
+    
+    def __init__(self, audit_log_repository: AuditLogRepository, export_batch_size: int = 1000):
+        self.audit_log_repository = audit_log_repository
+        self.export_batch_size = export_batch_size
+    
+    @staticmethod
+    def _validate_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        unknown = [field for field in fields if field not in AUDIT_LOG_FIELDS and field != "id"]
+        if unknown:
+            raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}")
+        return [field for field in fields if field != "id"]
+    
+    @staticmethod
+    def _build_filter(
+        account_id: Optional[str],
+        user_id: Optional[str],
+        action: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> AuditLogFilter:
+        return AuditLogFilter(
+            account_id=account_id,
+            user_id=user_id,
+            action=action,
+            created_from=_as_utc_naive(created_from),
+            created_to=_as_utc_naive(created_to)
+        )
+    
+    async def execute(
+        self,
+        account_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Busca uma página de registros, do mais recente ao mais antigo
+        
+        Args:
+            account_id: Filtra pela conta
+            user_id: Filtra pelo usuário
+            action: Filtra pela ação (ex.: "auth.signin")
+            created_from: Início do intervalo (inclusivo)
+            created_to: Fim do intervalo (exclusivo)
+            limit: Registros por página (1 a MAX_LIMIT)
+            cursor: next_cursor da página anterior
+            fields: Campos a retornar ("id" e "created_at" sempre vêm)
+            
+        Returns:
+            Dict[str, Any]: items e next_cursor (None na última página)
+            
+        Raises:
+            ValueError: Se o cursor, o limite ou algum campo for inválido
+        """
+        if not 1 <= limit <= self.MAX_LIMIT:
+            raise ValueError(f"limit deve estar entre 1 e {self.MAX_LIMIT}")
+        fields = self._validate_fields(fields)
+        filters = self._build_filter(account_id, user_id, action, created_from, created_to)
+        after = decode_cursor(cursor) if cursor else None
+        
+        # Um registro a mais indica se existe próxima página
+        items = await self.audit_log_repository.find_page(filters, limit + 1, after, fields)
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        
+        for item in items:
+            item["created_at"] = item["created_at"].isoformat()
+        return {"items": items, "next_cursor": next_cursor}
+    
+    def export(
+        self,
+        account_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        fields: Optional[List[str]] = None,
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Exporta todos os registros do filtro em NDJSON, lote a lote
+        
+        Os filtros e os campos são validados antes do primeiro byte, para que
+        erros virem 400 e não um fluxo interrompido.
+        
+        Returns:
+            AsyncIterator[bytes]: Blocos NDJSON (gzip se compress=True)
+            
+        Raises:
+            ValueError: Se algum campo for inválido
+        """
+        fields = self._validate_fields(fields)
+        filters = self._build_filter(account_id, user_id, action, created_from, created_to)
+        batches = self.audit_log_repository.iter_batches(filters, self.export_batch_size, fields)
+        return encode_ndjson(batches, compress=compress)
@@ -5,5 +5,6 @@ Casos de Uso de Autenticação
 from .signin_use_case import SignInUseCase
 from .signup_use_case import SignUpUseCase
 from .token_validation_use_case import TokenValidationUseCase
+from .user_export_use_case import UserExportUseCase
 
-__all__ = ["SignInUseCase", "SignUpUseCase", "TokenValidationUseCase"]
+__all__ = ["SignInUseCase", "SignUpUseCase", "TokenValidationUseCase", "UserExportUseCase"]
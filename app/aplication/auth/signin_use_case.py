@@ -1,10 +1,14 @@
+import asyncio
 from typing import Optional, Dict, Any
+from app.domain.audit_log.audit_log import AuditLog
 from app.domain.auth.user import User
 from app.domain.auth.auth_session import AuthSession
 from app.domain.auth.auth_provider import AuthProviderType
 from app.domain.auth.services.auth_service import AuthService
 from app.infrastructure.repositories.auth.user_repository import UserRepository
 from app.infrastructure.repositories.auth.auth_session_repository import AuthSessionRepository
+from app.infrastructure.repositories.auth.session_epoch_repository import SessionEpochRepository
+from app.infrastructure.audit.audit_log_sink import AuditLogSink
 
 
 class SignInUseCase:
@@ -14,19 +18,35 @@ class SignInUseCase:
         self,
         auth_service: AuthService,
         user_repository: UserRepository,
-        session_repository: AuthSessionRepository
+        session_repository: AuthSessionRepository,
+        epoch_repository: Optional[SessionEpochRepository] = None,
+        audit_sink: Optional[AuditLogSink] = None
     ):
         self.auth_service = auth_service
         self.user_repository = user_repository
         self.session_repository = session_repository
+        self.epoch_repository = epoch_repository
+        self.audit_sink = audit_sink
     
-    async def execute_basic(self, email: str, password: str) -> Optional[Dict[str, Any]]:
+    def _audit(self, action: str, user_id: Optional[str], entity_id: Optional[str], metadata: Dict[str, Any]) -> None:
+        """Enfileira o evento de auditoria (sem I/O no caminho da requisição)"""
+        if self.audit_sink is not None:
+            self.audit_sink.emit(AuditLog.create(action, "session", entity_id, user_id=user_id, metadata=metadata))
+    
+    async def _get_session_epoch(self, user_id: str) -> int:
+        """Época de sessão vigente do usuário (0 sem repositório de épocas)"""
+        if self.epoch_repository is None:
+            return 0
+        return await self.epoch_repository.get_epoch(user_id)
+    
+    async def execute_basic(self, email: str, password: str, client_ip: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Executa login básico com email e senha
         
         Args:
             email: Email do usuário
             password: Senha do usuário
+            client_ip: IP de origem da requisição (controle de admissão)
             
         Returns:
             Optional[Dict[str, Any]]: Dados da sessão se autenticação bem-sucedida
@@ -34,15 +54,19 @@ class SignInUseCase:
         # Buscar usuário por email
         user = await self.user_repository.get_by_email(email)
         if not user:
+            self._audit("auth.signin_failed", None, None, {"provider": "basic", "email": email, "client_ip": client_ip})
             return None
         
         # Autenticar com email e senha
-        session = self.auth_service.authenticate_basic(email, password, user)
+        session_epoch = await self._get_session_epoch(user.id)
+        session = await self.auth_service.authenticate_basic(email, password, user, client_ip, session_epoch)
         if not session:
+            self._audit("auth.signin_failed", user.id, None, {"provider": "basic", "email": email, "client_ip": client_ip})
             return None
         
-        # Salvar sessão
-        await self.session_repository.create(session)
+        # Salvar sessão e o last_login_at (o usuário lido é uma cópia: precisa ser gravado)
+        await asyncio.gather(self.session_repository.create(session), self.user_repository.update(user))
+        self._audit("auth.signin", user.id, session.id, {"provider": "basic", "client_ip": client_ip})
         
         return {
             "access_token": session.access_token,
@@ -72,15 +96,19 @@ class SignInUseCase:
         # Buscar usuário por email
         user = await self.user_repository.get_by_email(email)
         if not user:
+            self._audit("auth.signin_failed", None, None, {"provider": provider_type.value, "email": email})
             return None
         
         # Autenticar com provedor social
-        session = self.auth_service.authenticate_social(provider_type, email, provider_id, user)
+        session_epoch = await self._get_session_epoch(user.id)
+        session = self.auth_service.authenticate_social(provider_type, email, provider_id, user, session_epoch)
         if not session:
+            self._audit("auth.signin_failed", user.id, None, {"provider": provider_type.value, "email": email})
             return None
         
-        # Salvar sessão
-        await self.session_repository.create(session)
+        # Salvar sessão e o last_login_at (o usuário lido é uma cópia: precisa ser gravado)
+        await asyncio.gather(self.session_repository.create(session), self.user_repository.update(user))
+        self._audit("auth.signin", user.id, session.id, {"provider": provider_type.value})
         
         return {
             "access_token": session.access_token,
@@ -1,9 +1,11 @@
 from typing import Optional, Dict, Any
+from app.domain.audit_log.audit_log import AuditLog
 from app.domain.auth.user import User, UserStatus
 from app.domain.auth.auth_provider import AuthProvider, AuthProviderType
 from app.domain.auth.services.auth_service import AuthService
 from app.infrastructure.repositories.auth.user_repository import UserRepository
 from app.infrastructure.repositories.auth.auth_provider_repository import AuthProviderRepository
+from app.infrastructure.audit.audit_log_sink import AuditLogSink
 
 
 class SignUpUseCase:
@@ -13,11 +15,18 @@ class SignUpUseCase:
         self,
         auth_service: AuthService,
         user_repository: UserRepository,
-        provider_repository: AuthProviderRepository
+        provider_repository: AuthProviderRepository,
+        audit_sink: Optional[AuditLogSink] = None
     ):
         self.auth_service = auth_service
         self.user_repository = user_repository
         self.provider_repository = provider_repository
+        self.audit_sink = audit_sink
+    
+    def _audit(self, user_id: str, provider: str) -> None:
+        """Enfileira o evento de cadastro (sem I/O no caminho da requisição)"""
+        if self.audit_sink is not None:
+            self.audit_sink.emit(AuditLog.create("auth.signup", "user", user_id, user_id=user_id, metadata={"provider": provider}))
     
     async def execute_basic(self, email: str, name: str, password: str) -> Dict[str, Any]:
         """
@@ -37,7 +46,7 @@ class SignUpUseCase:
             raise ValueError("Usuário já existe com este email")
         
         # Criar usuário
-        user, auth_provider = self.auth_service.create_user(email, name, password)
+        user, auth_provider = await self.auth_service.create_user(email, name, password)
         
         # Salvar usuário
         created_user = await self.user_repository.create(user)
@@ -45,6 +54,7 @@ class SignUpUseCase:
         # Salvar provedor de autenticação
         if auth_provider:
             await self.provider_repository.create(auth_provider)
+        self._audit(created_user.id, AuthProviderType.BASIC.value)
         
         return {
             "user": {
@@ -78,7 +88,7 @@ class SignUpUseCase:
             raise ValueError("Usuário já existe com este email")
         
         # Criar usuário (sem senha para autenticação social)
-        user, auth_provider = self.auth_service.create_user(email, name)
+        user, auth_provider = await self.auth_service.create_user(email, name)
         
         # Salvar usuário
         created_user = await self.user_repository.create(user)
@@ -91,6 +101,7 @@ class SignUpUseCase:
         
         if auth_provider:
             await self.provider_repository.create(auth_provider)
+        self._audit(created_user.id, provider_type.value)
         
         return {
             "user": {
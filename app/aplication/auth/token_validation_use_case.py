@@ -1,8 +1,16 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from app.domain.auth.services.token_service import TokenService
 from app.infrastructure.repositories.auth.user_repository import UserRepository
 from app.infrastructure.repositories.auth.auth_session_repository import AuthSessionRepository
+from app.infrastructure.repositories.auth.auth_context_repository import (
+    AuthContextRepository,
+    CompositeAuthContextRepository
+)
+from app.infrastructure.repositories.auth.session_epoch_repository import SessionEpochRepository
+from app.shared.cache import LRUTTLCache
+from app.shared.token_digest import token_digest
 
 
 class TokenValidationUseCase:
@@ -12,11 +20,54 @@ class TokenValidationUseCase:
         self,
         token_service: TokenService,
         user_repository: UserRepository,
-        session_repository: AuthSessionRepository
+        session_repository: AuthSessionRepository,
+        auth_context_repository: Optional[AuthContextRepository] = None,
+        principal_cache_ttl_seconds: float = 5.0,
+        principal_cache_size: int = 10000,
+        epoch_repository: Optional[SessionEpochRepository] = None,
+        epoch_cache_ttl_seconds: float = 1.0,
+        early_refresh_beta: float = 1.0
     ):
         self.token_service = token_service
         self.user_repository = user_repository
         self.session_repository = session_repository
+        self.auth_context_repository = auth_context_repository or CompositeAuthContextRepository(
+            session_repository, user_repository
+        )
+        # Principal materializado (usuário + sessão) por token; TTL curto limita a defasagem
+        self._principal_cache: Optional[LRUTTLCache] = (
+            LRUTTLCache(max_size=principal_cache_size, default_ttl_seconds=principal_cache_ttl_seconds)
+            if principal_cache_ttl_seconds > 0 else None
+        )
+        # Expiração antecipada probabilística: evita que todos os pedidos percam o cache juntos
+        self.early_refresh_beta = early_refresh_beta
+        # Época de sessão vigente por usuário; o TTL limita a defasagem entre workers
+        self.epoch_repository = epoch_repository
+        self._epoch_cache: Optional[LRUTTLCache] = (
+            LRUTTLCache(max_size=principal_cache_size, default_ttl_seconds=epoch_cache_ttl_seconds)
+            if epoch_repository is not None and epoch_cache_ttl_seconds > 0 else None
+        )
+    
+    async def _get_session_epoch(self, user_id: str) -> int:
+        """Época de sessão vigente do usuário, consultando o cache antes do repositório"""
+        if self.epoch_repository is None:
+            return 0
+        
+        if self._epoch_cache is not None:
+            cached = self._epoch_cache.get(user_id)
+            if cached is not None:
+                return cached
+        
+        epoch = await self.epoch_repository.get_epoch(user_id)
+        if self._epoch_cache is not None:
+            self._epoch_cache.set(user_id, epoch)
+        return epoch
+    
+    async def _is_current_epoch(self, payload: Dict[str, Any]) -> bool:
+        """Verifica se o token foi emitido na época de sessão vigente do usuário"""
+        if self.epoch_repository is None:
+            return True
+        return payload.get("sep", 0) >= await self._get_session_epoch(payload["user_id"])
     
     async def execute(self, access_token: str) -> Optional[Dict[str, Any]]:
         """
@@ -33,17 +84,25 @@ class TokenValidationUseCase:
         if not payload or payload.get("type") != "access":
             return None
         
-        # Buscar sessão
-        session = await self.session_repository.get_by_access_token(access_token)
-        if not session or not session.is_valid():
+        # Tokens de épocas anteriores foram revogados em bloco
+        if not await self._is_current_epoch(payload):
             return None
         
-        # Buscar usuário
-        user = await self.user_repository.get_by_id(payload["user_id"])
-        if not user or not user.can_login():
+        cache_key = token_digest(access_token)
+        if self._principal_cache is not None:
+            cached = self._principal_cache.get(cache_key, early_refresh_beta=self.early_refresh_beta)
+            if cached is not None:
+                return {"user": dict(cached["user"]), "session": dict(cached["session"])}
+        
+        # Buscar sessão e usuário em uma única consulta
+        started_at = time.perf_counter()
+        context = await self.auth_context_repository.get_by_access_token(access_token)
+        lookup_seconds = time.perf_counter() - started_at
+        if not context or not context.is_valid() or context.user.id != payload.get("user_id"):
             return None
         
-        return {
+        session, user = context.session, context.user
+        principal = {
             "user": {
                 "id": user.id,
                 "email": user.email,
@@ -56,6 +115,58 @@ class TokenValidationUseCase:
                 "expires_at": session.expires_at.isoformat()
             }
         }
+        
+        if self._principal_cache is not None:
+            ttl = min(
+                self._principal_cache.default_ttl_seconds,
+                (session.expires_at - datetime.utcnow()).total_seconds()
+            )
+            self._principal_cache.set(cache_key, principal, ttl, compute_seconds=lookup_seconds)
+        
+        return {"user": dict(principal["user"]), "session": dict(principal["session"])}
+    
+    async def revoke_user_sessions(self, user_id: str) -> int:
+        """
+        Revoga todos os tokens do usuário incrementando sua época de sessão (O(1))
+        
+        Args:
+            user_id: ID do usuário
+            
+        Returns:
+            int: Nova época de sessão do usuário
+        """
+        if self.epoch_repository is None:
+            raise ValueError("Revogação por época requer um repositório de épocas")
+        
+        epoch = await self.epoch_repository.bump_epoch(user_id)
+        if self._epoch_cache is not None:
+            self._epoch_cache.set(user_id, epoch)
+        return epoch
+    
+    def invalidate_principal(self, access_token: str) -> bool:
+        """
+        Remove o principal em cache de um token (ex.: logout ou alteração do usuário)
+        
+        Args:
+            access_token: Token de acesso JWT
+            
+        Returns:
+            bool: True se havia um principal em cache
+        """
+        if self._principal_cache is None:
+            return False
+        return self._principal_cache.delete(token_digest(access_token))
+    
+    def clear_principal_cache(self) -> None:
+        """Limpa o cache de principais"""
+        if self._principal_cache is not None:
+            self._principal_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do cache de principais"""
+        if self._principal_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._principal_cache.get_stats()}
     
     async def refresh_token(self, refresh_token: str) -> Optional[Dict[str, Any]]:
         """
@@ -72,14 +183,18 @@ class TokenValidationUseCase:
         if not payload or payload.get("type") != "refresh":
             return None
         
+        if not await self._is_current_epoch(payload):
+            return None
+        
         # Buscar usuário
         user = await self.user_repository.get_by_id(payload["user_id"])
         if not user or not user.can_login():
             return None
         
         # Gerar novos tokens
-        new_access_token = self.token_service.generate_access_token(user)
-        new_refresh_token = self.token_service.generate_refresh_token(user)
+        session_epoch = payload.get("sep", 0)
+        new_access_token = self.token_service.generate_access_token(user, session_epoch=session_epoch)
+        new_refresh_token = self.token_service.generate_refresh_token(user, session_epoch=session_epoch)
         
         return {
             "access_token": new_access_token,
@@ -0,0 +1,35 @@
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List
+from app.infrastructure.repositories.auth.user_repository import UserRepository
+from app.shared.ndjson import encode_ndjson
+
+
+class UserExportUseCase:
+    """Caso de uso para exportação dos usuários em NDJSON"""
+    
+    def __init__(self, user_repository: UserRepository, batch_size: int = 1000):
+        self.user_repository = user_repository
+        self.batch_size = batch_size
+    
+    async def _records(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Lotes de usuários sem o hash da senha"""
+        async with aclosing(self.user_repository.iter_batches(self.batch_size)) as batches:
+            async for users in batches:
+                records = []
+                for user in users:
+                    record = user.to_row()
+                    del record["password_hash"]
+                    records.append(record)
+                yield records
+    
+    def execute(self, compress: bool = False) -> AsyncIterator[bytes]:
+        """
+        Exporta todos os usuários, lote a lote
+        
+        Args:
+            compress: Comprime o fluxo em gzip
+            
+        Returns:
+            AsyncIterator[bytes]: Blocos NDJSON (gzip se compress=True)
+        """
+        return encode_ndjson(self._records(), compress=compress)
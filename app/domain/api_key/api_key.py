@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiKey:
     id: str
     account_id: str
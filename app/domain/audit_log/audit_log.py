@@ -1,15 +1,38 @@
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Dict, Any
+from app.shared.id_generator import new_id
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditLog:
     id: str
-    account_id: str
-    user_id: str
+    account_id: Optional[str]
+    user_id: Optional[str]
     action: str
     entity_type: str
-    entity_id: str
+    entity_id: Optional[str]
     metadata: Optional[Dict[str, Any]]
     created_at: datetime
+
+    @classmethod
+    def create(
+        cls,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        account_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Cria um registro de auditoria com ID ordenado pelo tempo"""
+        return cls(
+            id=new_id("audit_"),
+            account_id=account_id,
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            metadata=metadata,
+            created_at=datetime.utcnow()
+        )
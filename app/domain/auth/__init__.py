@@ -6,5 +6,6 @@ Módulo responsável pelas regras de negócio relacionadas à autenticação
 from .user import User
 from .auth_session import AuthSession
 from .auth_provider import AuthProvider
+from .auth_context import AuthContext
 
-__all__ = ["User", "AuthSession", "AuthProvider"]
+__all__ = ["User", "AuthSession", "AuthProvider", "AuthContext"]
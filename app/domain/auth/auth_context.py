@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from app.domain.auth.user import User
+from app.domain.auth.auth_session import AuthSession
+
+
+@dataclass(slots=True)
+class AuthContext:
+    """Sessão e usuário resolvidos juntos a partir de um token de acesso"""
+    session: AuthSession
+    user: User
+
+    def is_valid(self) -> bool:
+        """Verifica se a sessão é válida e o usuário pode acessar"""
+        return (
+            self.session.is_valid() and
+            self.user.can_login() and
+            self.session.user_id == self.user.id
+        )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 from enum import Enum
 
 
@@ -10,7 +10,10 @@ class AuthProviderType(Enum):
     MICROSOFT = "microsoft"
 
 
-@dataclass
+_PROVIDER_TYPES_BY_VALUE = {provider_type.value: provider_type for provider_type in AuthProviderType}
+
+
+@dataclass(slots=True)
 class AuthProvider:
     """Entidade AuthProvider para gerenciar provedores de autenticação"""
     id: str
@@ -22,10 +25,37 @@ class AuthProvider:
     updated_at: datetime = None
 
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
-        if self.updated_at is None:
-            self.updated_at = datetime.utcnow()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.utcnow()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
+
+    def to_row(self) -> Dict[str, Any]:
+        """Converte para um dicionário plano (enum como valor)"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "provider_type": self.provider_type.value,
+            "provider_id": self.provider_id,
+            "provider_data": self.provider_data,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "AuthProvider":
+        """Reconstrói a entidade a partir de um dicionário gerado por to_row"""
+        return cls(
+            row["id"],
+            row["user_id"],
+            _PROVIDER_TYPES_BY_VALUE[row["provider_type"]],
+            row["provider_id"],
+            row["provider_data"],
+            row["created_at"],
+            row["updated_at"]
+        )
 
     @classmethod
     def create_basic(cls, user_id: str):
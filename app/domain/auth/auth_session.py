@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional
 from enum import Enum
+from app.shared.id_generator import new_id
+from app.shared.token_digest import token_digest
 
 
 class SessionStatus(Enum):
@@ -10,23 +12,31 @@ class SessionStatus(Enum):
     REVOKED = "revoked"
 
 
-@dataclass
+_STATUSES_BY_VALUE = {status.value: status for status in SessionStatus}
+
+
+@dataclass(slots=True)
 class AuthSession:
     """Entidade AuthSession para gerenciar sessões de autenticação"""
     id: str
     user_id: str
-    access_token: str
-    refresh_token: str
+    access_token_digest: bytes  # Digest de tamanho fixo do token; o token em si não é persistido
+    refresh_token_digest: bytes
     expires_at: datetime
     status: SessionStatus = SessionStatus.ACTIVE
     created_at: datetime = None
     updated_at: datetime = None
+    # Tokens em texto claro: presentes apenas na sessão recém-criada, para devolver ao cliente
+    access_token: Optional[str] = field(default=None, repr=False, compare=False)
+    refresh_token: Optional[str] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
-        if self.updated_at is None:
-            self.updated_at = datetime.utcnow()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.utcnow()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
     def is_valid(self) -> bool:
         """Verifica se a sessão é válida"""
@@ -39,6 +49,12 @@ class AuthSession:
         """Verifica se a sessão expirou"""
         return self.expires_at <= datetime.utcnow()
 
+    def without_tokens(self) -> "AuthSession":
+        """Retorna uma cópia da sessão sem os tokens em texto claro (para persistência)"""
+        if self.access_token is None and self.refresh_token is None:
+            return self
+        return replace(self, access_token=None, refresh_token=None)
+
     def revoke(self):
         """Revoga a sessão"""
         self.status = SessionStatus.REVOKED
@@ -46,17 +62,49 @@ class AuthSession:
 
     def extend(self, hours: int = 24):
         """Estende a sessão por N horas"""
-        self.expires_at = datetime.utcnow() + timedelta(hours=hours)
-        self.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        self.expires_at = now + timedelta(hours=hours)
+        self.updated_at = now
+
+    def to_row(self) -> Dict[str, Any]:
+        """Converte para um dicionário plano sem os tokens em texto claro"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "access_token_digest": self.access_token_digest,
+            "refresh_token_digest": self.refresh_token_digest,
+            "expires_at": self.expires_at,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "AuthSession":
+        """Reconstrói a entidade a partir de um dicionário gerado por to_row"""
+        return cls(
+            row["id"],
+            row["user_id"],
+            row["access_token_digest"],
+            row["refresh_token_digest"],
+            row["expires_at"],
+            _STATUSES_BY_VALUE[row["status"]],
+            row["created_at"],
+            row["updated_at"]
+        )
 
     @classmethod
     def create(cls, user_id: str, access_token: str, refresh_token: str, expires_in_hours: int = 24):
         """Cria uma nova sessão"""
-        expires_at = datetime.utcnow() + timedelta(hours=expires_in_hours)
+        now = datetime.utcnow()
         return cls(
-            id=f"session_{user_id}_{int(datetime.utcnow().timestamp())}",
+            id=new_id("session_"),
             user_id=user_id,
+            access_token_digest=token_digest(access_token),
+            refresh_token_digest=token_digest(refresh_token),
+            expires_at=now + timedelta(hours=expires_in_hours),
+            created_at=now,
+            updated_at=now,
             access_token=access_token,
-            refresh_token=refresh_token,
-            expires_at=expires_at
+            refresh_token=refresh_token
         )
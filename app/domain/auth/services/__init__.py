@@ -4,6 +4,9 @@ Serviços de Domínio para Autenticação
 
 from .auth_service import AuthService
 from .password_service import PasswordService
+from .password_hasher import AsyncPasswordHasher, PasswordHasherError
+from .login_admission import LoginAdmissionController, AdmissionRejectedError
 from .token_service import TokenService
 
-__all__ = ["AuthService", "PasswordService", "TokenService"]
+__all__ = ["AuthService", "PasswordService", "AsyncPasswordHasher", "PasswordHasherError",
+           "LoginAdmissionController", "AdmissionRejectedError", "TokenService"]
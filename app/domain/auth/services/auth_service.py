@@ -1,20 +1,36 @@
-from datetime import datetime
 from typing import Optional, Tuple
 from app.domain.auth.user import User, UserStatus
 from app.domain.auth.auth_session import AuthSession
 from app.domain.auth.auth_provider import AuthProvider, AuthProviderType
+from app.shared.id_generator import new_id
 from .password_service import PasswordService
+from .password_hasher import AsyncPasswordHasher
+from .login_admission import LoginAdmissionController
 from .token_service import TokenService
 
 
 class AuthService:
     """Serviço principal de autenticação"""
     
-    def __init__(self, token_service: TokenService):
+    def __init__(
+        self,
+        token_service: TokenService,
+        password_hasher: Optional[AsyncPasswordHasher] = None,
+        admission_controller: Optional[LoginAdmissionController] = None
+    ):
         self.token_service = token_service
         self.password_service = PasswordService()
+        self.password_hasher = password_hasher or AsyncPasswordHasher()
+        self.admission_controller = admission_controller or LoginAdmissionController()
     
-    def authenticate_basic(self, email: str, password: str, user: User) -> Optional[AuthSession]:
+    async def authenticate_basic(
+        self,
+        email: str,
+        password: str,
+        user: User,
+        client_ip: Optional[str] = None,
+        session_epoch: int = 0
+    ) -> Optional[AuthSession]:
         """
         Autentica usuário com email e senha
         
@@ -22,6 +38,8 @@ class AuthService:
             email: Email do usuário
             password: Senha em texto plano
             user: Usuário encontrado no banco
+            client_ip: IP de origem da requisição (orçamento por IP)
+            session_epoch: Época de sessão vigente do usuário
             
         Returns:
             Optional[AuthSession]: Sessão criada se autenticação bem-sucedida
@@ -31,15 +49,15 @@ class AuthService:
         
         # Verificar senha (assumindo que o hash e salt estão armazenados no user)
         # Por enquanto, vamos simular a verificação
-        if not self._verify_user_password(user, password):
+        if not await self._verify_user_password(user, password, client_ip):
             return None
         
         # Atualizar último login
         user.update_last_login()
         
         # Gerar tokens
-        access_token = self.token_service.generate_access_token(user)
-        refresh_token = self.token_service.generate_refresh_token(user)
+        access_token = self.token_service.generate_access_token(user, session_epoch=session_epoch)
+        refresh_token = self.token_service.generate_refresh_token(user, session_epoch=session_epoch)
         
         # Criar sessão
         session = AuthSession.create(
@@ -50,7 +68,14 @@ class AuthService:
         
         return session
     
-    def authenticate_social(self, provider_type: AuthProviderType, email: str, provider_id: str, user: Optional[User] = None) -> Optional[AuthSession]:
+    def authenticate_social(
+        self,
+        provider_type: AuthProviderType,
+        email: str,
+        provider_id: str,
+        user: Optional[User] = None,
+        session_epoch: int = 0
+    ) -> Optional[AuthSession]:
         """
         Autentica usuário com provedor social
         
@@ -59,6 +84,7 @@ class AuthService:
             email: Email do usuário
             provider_id: ID do usuário no provedor
             user: Usuário existente (opcional)
+            session_epoch: Época de sessão vigente do usuário
             
         Returns:
             Optional[AuthSession]: Sessão criada se autenticação bem-sucedida
@@ -73,8 +99,8 @@ class AuthService:
         user.update_last_login()
         
         # Gerar tokens
-        access_token = self.token_service.generate_access_token(user)
-        refresh_token = self.token_service.generate_refresh_token(user)
+        access_token = self.token_service.generate_access_token(user, session_epoch=session_epoch)
+        refresh_token = self.token_service.generate_refresh_token(user, session_epoch=session_epoch)
         
         # Criar sessão
         session = AuthSession.create(
@@ -85,7 +111,7 @@ class AuthService:
         
         return session
     
-    def create_user(self, email: str, name: str, password: str = None) -> Tuple[User, Optional[AuthProvider]]:
+    async def create_user(self, email: str, name: str, password: str = None) -> Tuple[User, Optional[AuthProvider]]:
         """
         Cria um novo usuário
         
@@ -97,7 +123,7 @@ class AuthService:
         Returns:
             Tuple[User, Optional[AuthProvider]]: Usuário criado e provedor de auth
         """
-        user_id = f"user_{int(datetime.utcnow().timestamp())}"
+        user_id = new_id("user_")
         
         # Criar usuário
         user = User(
@@ -111,7 +137,7 @@ class AuthService:
         # Se tem senha, criar provedor básico
         auth_provider = None
         if password:
-            password_hash, salt = self.password_service.hash_password(password)
+            password_hash, salt = await self.password_hasher.hash_password(password)
             user.password_hash = f"{password_hash}:{salt}"  # Armazenar hash e salt juntos
             auth_provider = AuthProvider.create_basic(user_id)
         else:
@@ -139,16 +165,20 @@ class AuthService:
         # Por enquanto, retornamos None para indicar que precisa ser implementado
         return None
     
-    def _verify_user_password(self, user: User, password: str) -> bool:
+    async def _verify_user_password(self, user: User, password: str, client_ip: Optional[str] = None) -> bool:
         """
-        Verifica a senha do usuário
+        Verifica a senha do usuário, sujeito ao controle de admissão
         
         Args:
             user: Usuário
             password: Senha em texto plano
+            client_ip: IP de origem da requisição
             
         Returns:
             bool: True se a senha está correta
+            
+        Raises:
+            AdmissionRejectedError: Se o orçamento de verificações estiver esgotado
         """
         if not user.password_hash:
             return False
@@ -156,6 +186,8 @@ class AuthService:
         try:
             # Assumindo que password_hash está no formato "hash:salt"
             password_hash, salt = user.password_hash.split(":", 1)
-            return self.password_service.verify_password(password, password_hash, salt)
         except ValueError:
             return False
+        
+        async with self.admission_controller.admit(user.email, client_ip):
+            return await self.password_hasher.verify_password(password, password_hash, salt)
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+
+class AdmissionRejectedError(Exception):
+    """Lançado quando uma verificação de senha é descartada por excesso de carga"""
+
+    REASON_GLOBAL = "global"
+    REASON_KEY = "key"
+
+    def __init__(self, reason: str, retry_after_seconds: int):
+        super().__init__(f"Verificação de senha rejeitada ({reason})")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class LoginAdmissionController:
+    """
+    Controle de admissão para verificações de senha
+
+    Limita quantas verificações PBKDF2 rodam ao mesmo tempo (globalmente, por
+    email e por IP) e quantas podem aguardar na fila. Acima do limite a chamada
+    é rejeitada imediatamente em vez de enfileirar sem limite.
+
+    Email e IP têm limites próprios: vários usuários legítimos podem compartilhar
+    um IP (NAT, rede corporativa), enquanto um email raramente tem mais de um
+    login simultâneo.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_waiting: int = 32,
+        max_per_email: int = 2,
+        max_per_ip: int = 16,
+        wait_timeout_seconds: float = 2.0,
+        retry_after_seconds: int = 1
+    ):
+        if max_concurrent < 1 or max_per_email < 1 or max_per_ip < 1 or max_waiting < 0:
+            raise ValueError("Limites de admissão inválidos")
+
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._per_key: Dict[str, int] = {}
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._shed: Dict[str, int] = {
+            AdmissionRejectedError.REASON_GLOBAL: 0,
+            AdmissionRejectedError.REASON_KEY: 0
+        }
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        self._shed[reason] += 1
+        return AdmissionRejectedError(reason, self.retry_after_seconds)
+
+    def _release_keys(self, keys: tuple) -> None:
+        for key in keys:
+            remaining = self._per_key[key] - 1
+            if remaining:
+                self._per_key[key] = remaining
+            else:
+                del self._per_key[key]
+
+    @asynccontextmanager
+    async def admit(self, email: Optional[str] = None, client_ip: Optional[str] = None):
+        """
+        Reserva uma vaga para uma verificação de senha
+
+        Args:
+            email: Email da tentativa (orçamento max_per_email); None é ignorado
+            client_ip: IP de origem (orçamento max_per_ip); None é ignorado
+
+        Raises:
+            AdmissionRejectedError: Se o orçamento global, do email ou do IP estiver esgotado
+        """
+        limits = []
+        if email:
+            limits.append((f"email:{email.lower()}", self.max_per_email))
+        if client_ip:
+            limits.append((f"ip:{client_ip}", self.max_per_ip))
+        keys = tuple(key for key, _ in limits)
+
+        for key, limit in limits:
+            if self._per_key.get(key, 0) >= limit:
+                raise self._reject(AdmissionRejectedError.REASON_KEY)
+
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            raise self._reject(AdmissionRejectedError.REASON_GLOBAL)
+
+        for key in keys:
+            self._per_key[key] = self._per_key.get(key, 0) + 1
+
+        self._waiting += 1
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._release_keys(keys)
+            raise self._reject(AdmissionRejectedError.REASON_GLOBAL)
+        except BaseException:
+            self._release_keys(keys)
+            raise
+        finally:
+            self._waiting -= 1
+            waited = time.perf_counter() - started_at
+            self._waits += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+
+        self._in_flight += 1
+        self._admitted += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            self._release_keys(keys)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas de admissão (fila, descartes e tempo de espera)"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "max_per_email": self.max_per_email,
+            "max_per_ip": self.max_per_ip,
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "admitted": self._admitted,
+            "shed": dict(self._shed),
+            "shed_total": sum(self._shed.values()),
+            "wait_time_avg_ms": (self._wait_time_total / self._waits * 1000) if self._waits else 0.0,
+            "wait_time_max_ms": self._wait_time_max * 1000
+        }
@@ -0,0 +1,138 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .password_service import PasswordService
+
+
+class PasswordHasherError(Exception):
+    """Erro base do motor assíncrono de hash de senhas"""
+
+
+class PasswordHasherBusyError(PasswordHasherError):
+    """Lançado quando o número de operações pendentes atinge o limite"""
+
+
+class PasswordHasherTimeoutError(PasswordHasherError):
+    """Lançado quando uma operação de hash excede o tempo limite"""
+
+
+class AsyncPasswordHasher:
+    """
+    Motor assíncrono de hash de senhas
+
+    Executa o PBKDF2 do PasswordService em um pool de threads ou processos,
+    evitando bloquear o event loop durante login e cadastro.
+    """
+
+    EXECUTOR_TYPES = ("thread", "process")
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        timeout_seconds: float = 5.0
+    ):
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(f"Tipo de executor inválido: {executor_type}")
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers e max_pending devem ser maiores que zero")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _get_executor(self) -> Executor:
+        """Cria o pool sob demanda"""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    def _release(self, future: "asyncio.Future[Any]") -> None:
+        """Libera a vaga quando o trabalho termina no pool (não quando o chamador desiste)"""
+        self._pending -= 1
+        if not future.cancelled():
+            # Marca a exceção como consumida quando ninguém mais aguarda o resultado
+            future.exception()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa a função no pool respeitando limite de fila e timeout
+
+        Um hash que excede o tempo limite continua ocupando sua vaga até terminar
+        no pool, então `pending` reflete o trabalho realmente em andamento. Se o
+        trabalho ainda estiver na fila do pool, ele é cancelado.
+        """
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusyError("Fila de hash de senhas cheia")
+
+        job = self._get_executor().submit(func, *args)
+        self._pending += 1
+        future = asyncio.wrap_future(job)
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            job.cancel()
+            self._timeouts += 1
+            raise PasswordHasherTimeoutError("Tempo limite excedido no hash de senha")
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+        self._completed += 1
+        return result
+
+    async def hash_password(self, password: str) -> Tuple[str, str]:
+        """
+        Gera hash da senha com salt fora do event loop
+
+        Returns:
+            Tuple[str, str]: (password_hash, salt)
+        """
+        return await self._run(PasswordService.hash_password, password)
+
+    async def verify_password(self, password: str, password_hash: str, salt: str) -> bool:
+        """
+        Verifica a senha fora do event loop
+
+        Args:
+            password: Senha em texto plano
+            password_hash: Hash da senha armazenado
+            salt: Salt usado no hash
+
+        Returns:
+            bool: True se a senha está correta
+        """
+        return await self._run(PasswordService.verify_password, password, password_hash, salt)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do motor de hash"""
+        return {
+            "executor_type": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts
+        }
+
+    def shutdown(self) -> None:
+        """Encerra o pool de execução"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,24 +1,39 @@
 import jwt
 import secrets
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from app.domain.auth.user import User
+from app.shared.cache import LRUTTLCache
+from app.shared.token_digest import token_digest
 
 
 class TokenService:
     """Serviço para gerenciamento de tokens JWT"""
     
-    def __init__(self, secret_key: str, algorithm: str = "HS256"):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        cache_max_size: int = 10000,
+        cache_ttl_seconds: float = 300.0
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
+        # Cache de tokens já verificados (chave: digest do token; cache_max_size=0 desativa)
+        self._verified_cache: Optional[LRUTTLCache] = (
+            LRUTTLCache(max_size=cache_max_size, default_ttl_seconds=cache_ttl_seconds)
+            if cache_max_size > 0 else None
+        )
     
-    def generate_access_token(self, user: User, expires_in_hours: int = 24) -> str:
+    def generate_access_token(self, user: User, expires_in_hours: int = 24, session_epoch: int = 0) -> str:
         """
         Gera token de acesso JWT
         
         Args:
             user: Usuário para o qual gerar o token
             expires_in_hours: Tempo de expiração em horas
+            session_epoch: Época de sessão vigente do usuário (claim "sep")
             
         Returns:
             str: Token JWT
@@ -29,18 +44,22 @@ class TokenService:
             "role": user.role.value,
             "exp": datetime.utcnow() + timedelta(hours=expires_in_hours),
             "iat": datetime.utcnow(),
-            "type": "access"
+            "type": "access",
+            "sep": session_epoch,
+            # Único por emissão: dois logins no mesmo segundo não geram o mesmo token (nem a mesma chave de sessão)
+            "jti": secrets.token_urlsafe(12)
         }
         
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
     
-    def generate_refresh_token(self, user: User, expires_in_days: int = 30) -> str:
+    def generate_refresh_token(self, user: User, expires_in_days: int = 30, session_epoch: int = 0) -> str:
         """
         Gera token de refresh JWT
         
         Args:
             user: Usuário para o qual gerar o token
             expires_in_days: Tempo de expiração em dias
+            session_epoch: Época de sessão vigente do usuário (claim "sep")
             
         Returns:
             str: Token JWT de refresh
@@ -49,7 +68,9 @@ class TokenService:
             "user_id": user.id,
             "exp": datetime.utcnow() + timedelta(days=expires_in_days),
             "iat": datetime.utcnow(),
-            "type": "refresh"
+            "type": "refresh",
+            "sep": session_epoch,
+            "jti": secrets.token_urlsafe(12)
         }
         
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
@@ -64,13 +85,54 @@ class TokenService:
         Returns:
             Optional[Dict[str, Any]]: Payload do token se válido, None caso contrário
         """
+        cache_key = None
+        if self._verified_cache is not None:
+            cache_key = token_digest(token)
+            cached = self._verified_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        
+        if cache_key is not None:
+            # A entrada nunca sobrevive ao "exp" do próprio token
+            ttl = self._verified_cache.default_ttl_seconds
+            exp_timestamp = payload.get("exp")
+            if exp_timestamp:
+                ttl = min(ttl, exp_timestamp - time.time())
+            self._verified_cache.set(cache_key, payload, ttl)
+        
+        return dict(payload)
+    
+    def invalidate_token(self, token: str) -> bool:
+        """
+        Remove um token do cache de verificação (ex.: na revogação)
+        
+        Args:
+            token: Token JWT
+            
+        Returns:
+            bool: True se o token estava em cache
+        """
+        if self._verified_cache is None:
+            return False
+        return self._verified_cache.delete(token_digest(token))
+    
+    def clear_token_cache(self) -> None:
+        """Limpa o cache de tokens verificados"""
+        if self._verified_cache is not None:
+            self._verified_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do cache de tokens verificados"""
+        if self._verified_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._verified_cache.get_stats()}
     
     def extract_user_id(self, token: str) -> Optional[str]:
         """
@@ -87,6 +149,28 @@ class TokenService:
             return payload.get("user_id")
         return None
     
+    @staticmethod
+    def peek_user_id(token: str) -> Optional[str]:
+        """
+        Lê o ID do usuário do token sem verificar assinatura nem expiração
+        
+        Serve apenas para localizar dados (ex.: o slot das chaves de sessão no
+        Redis), nunca para autorizar: um token adulterado muda de digest e não
+        encontra sessão alguma.
+        
+        Args:
+            token: Token JWT
+            
+        Returns:
+            Optional[str]: ID do usuário, ou None se o token não puder ser lido
+        """
+        try:
+            payload = jwt.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return None
+        user_id = payload.get("user_id")
+        return user_id if isinstance(user_id, str) else None
+    
     def is_token_expired(self, token: str) -> bool:
         """
         Verifica se o token está expirado
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional
 from enum import Enum
 
 
@@ -17,7 +17,12 @@ class UserRole(Enum):
     MODERATOR = "moderator"
 
 
-@dataclass
+# Lookup direto valor -> membro: Enum(valor) custa ~0,7 µs por chamada
+_ROLES_BY_VALUE = {role.value: role for role in UserRole}
+_STATUSES_BY_VALUE = {status.value: status for status in UserStatus}
+
+
+@dataclass(slots=True)
 class User:
     """Entidade User para autenticação"""
     id: str
@@ -33,10 +38,12 @@ class User:
     updated_at: datetime = None
 
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
-        if self.updated_at is None:
-            self.updated_at = datetime.utcnow()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.utcnow()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
     def is_active(self) -> bool:
         """Verifica se o usuário está ativo"""
@@ -48,5 +55,39 @@ class User:
 
     def update_last_login(self):
         """Atualiza o timestamp do último login"""
-        self.last_login_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        self.last_login_at = now
+        self.updated_at = now
+
+    def to_row(self) -> Dict[str, Any]:
+        """Converte para um dicionário plano (enums como valores, datas como datetime)"""
+        return {
+            "id": self.id,
+            "email": self.email,
+            "name": self.name,
+            "password_hash": self.password_hash,
+            "phone": self.phone,
+            "role": self.role.value,
+            "status": self.status.value,
+            "email_verified": self.email_verified,
+            "last_login_at": self.last_login_at,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "User":
+        """Reconstrói a entidade a partir de um dicionário gerado por to_row"""
+        return cls(
+            row["id"],
+            row["email"],
+            row["name"],
+            row["password_hash"],
+            row["phone"],
+            _ROLES_BY_VALUE[row["role"]],
+            _STATUSES_BY_VALUE[row["status"]],
+            row["email_verified"],
+            row["last_login_at"],
+            row["created_at"],
+            row["updated_at"]
+        )
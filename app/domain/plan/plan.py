@@ -2,13 +2,13 @@ from dataclasses import dataclass
 from typing import Dict, List, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class BillingCycle:
     interval: str  # monthly, yearly, etc.
     interval_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     id: str
     code: str
@@ -3,21 +3,21 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledChange:
     plan_id: str
     effective_date: datetime
     reason: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Cancellation:
     reason: str
     effective_date: datetime
     feedback: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Subscription:
     id: str
     account_id: str
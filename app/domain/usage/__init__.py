@@ -1,3 +1,3 @@
-from .usage import Usage
+from .usage import USAGE_METRICS, Usage, monthly_period
 
-__all__ = ["Usage"]
+__all__ = ["Usage", "USAGE_METRICS", "monthly_period"]
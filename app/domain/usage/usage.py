@@ -1,8 +1,20 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Tuple
 
+# Contadores de consumo por conta e período
+USAGE_METRICS = ("messages_count", "groups_count", "storage_bytes")
 
-@dataclass
+
+def monthly_period(moment: datetime) -> Tuple[datetime, datetime]:
+    """Retorna o início e o fim (exclusivo) do mês de `moment`"""
+    start = datetime(moment.year, moment.month, 1)
+    if moment.month == 12:
+        return start, datetime(moment.year + 1, 1, 1)
+    return start, datetime(moment.year, moment.month + 1, 1)
+
+
+@dataclass(slots=True)
 class Usage:
     id: str
     account_id: str
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Webhook:
     id: str
     account_id: str
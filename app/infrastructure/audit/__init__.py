@@ -0,0 +1,7 @@
+"""
+Auditoria
+"""
+
+from .audit_log_sink import AuditLogSink
+
+__all__ = ["AuditLogSink"]
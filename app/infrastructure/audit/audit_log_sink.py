@@ -0,0 +1,197 @@
+"""
+Gravação assíncrona e em lote dos registros de auditoria
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.domain.audit_log.audit_log import AuditLog
+from app.infrastructure.repositories.audit_log.audit_log_repository import AuditLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogSink:
+    """
+    Fila limitada em memória que grava registros de auditoria em lote
+
+    - emit() é síncrono e O(1): só enfileira; nenhuma requisição espera o banco
+    - Um lote é gravado quando a fila atinge batch_size ou a cada
+      flush_interval_seconds, o que ocorrer primeiro
+    - Fila cheia (backpressure), conforme overflow_policy:
+      "drop_oldest" descarta o registro mais antigo, "drop_newest" descarta o
+      novo. Os descartes são contados em get_stats()["dropped"]
+    - Falha na gravação: o lote volta para o início da fila e a próxima
+      tentativa espera um backoff exponencial (até max_backoff_seconds)
+    - stop() grava o que estiver na fila, limitado a shutdown_timeout_seconds
+    """
+
+    POLICY_DROP_OLDEST = "drop_oldest"
+    POLICY_DROP_NEWEST = "drop_newest"
+
+    def __init__(
+        self,
+        repository: AuditLogRepository,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        overflow_policy: str = POLICY_DROP_OLDEST,
+        max_backoff_seconds: float = 30.0,
+        shutdown_timeout_seconds: float = 5.0
+    ):
+        if max_queue_size < 1 or batch_size < 1:
+            raise ValueError("max_queue_size e batch_size devem ser maiores que zero")
+        if overflow_policy not in (self.POLICY_DROP_OLDEST, self.POLICY_DROP_NEWEST):
+            raise ValueError(f"Política de descarte inválida: {overflow_policy}")
+
+        self.repository = repository
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self.max_backoff_seconds = max_backoff_seconds
+        self.shutdown_timeout_seconds = shutdown_timeout_seconds
+
+        self._queue: Deque[AuditLog] = deque()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.last_batch_ms = 0.0
+
+    def emit(self, log: AuditLog) -> bool:
+        """
+        Enfileira um registro de auditoria (sem I/O)
+
+        Args:
+            log: Registro a gravar
+
+        Returns:
+            bool: False se o registro foi descartado pela política de fila cheia
+        """
+        self.emitted += 1
+        queue = self._queue
+        if len(queue) >= self.max_queue_size:
+            self.dropped += 1
+            if self.overflow_policy == self.POLICY_DROP_NEWEST:
+                return False
+            queue.popleft()
+        queue.append(log)
+        if len(queue) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def _take_batch(self) -> List[AuditLog]:
+        queue = self._queue
+        return [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+
+    def _requeue(self, batch: List[AuditLog]) -> None:
+        """Devolve um lote não gravado ao início da fila, respeitando max_queue_size"""
+        space = self.max_queue_size - len(self._queue)
+        if space < len(batch):
+            # Sem espaço: mantém os registros mais recentes do lote
+            self.dropped += len(batch) - max(space, 0)
+            batch = batch[len(batch) - max(space, 0):]
+        self._queue.extendleft(reversed(batch))
+
+    async def flush(self) -> int:
+        """
+        Grava um lote (até batch_size registros)
+
+        Returns:
+            int: Número de registros gravados
+        """
+        batch = self._take_batch()
+        if not batch:
+            return 0
+        if len(self._queue) < self.batch_size:
+            self._batch_ready.clear()
+
+        started_at = time.perf_counter()
+        try:
+            await self.repository.insert_many(batch)
+        except asyncio.CancelledError:
+            # Encerramento no meio da gravação: o lote volta para a fila (reinserir é idempotente)
+            self._requeue(batch)
+            raise
+        except Exception as e:
+            self.write_errors += 1
+            self._failures += 1
+            self._requeue(batch)
+            logger.warning(f"Falha ao gravar {len(batch)} registros de auditoria: {e}")
+            return 0
+
+        self._failures = 0
+        self.batches += 1
+        self.written += len(batch)
+        self.last_batch_ms = round((time.perf_counter() - started_at) * 1000, 3)
+        return len(batch)
+
+    def _backoff_seconds(self) -> float:
+        return min(self.flush_interval_seconds * (2 ** self._failures), self.max_backoff_seconds)
+
+    async def _run(self) -> None:
+        while True:
+            if self._failures:
+                await asyncio.sleep(self._backoff_seconds())
+            else:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            # Esvazia a fila em lotes; para na primeira falha (o backoff assume)
+            while self._queue:
+                if not await self.flush():
+                    break
+                await asyncio.sleep(0)
+
+    async def start(self) -> None:
+        """Inicia a gravação periódica"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Encerra a gravação periódica, gravando a fila dentro de shutdown_timeout_seconds"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        deadline = time.monotonic() + self.shutdown_timeout_seconds
+        while self._queue and time.monotonic() < deadline:
+            try:
+                # Uma gravação travada não pode segurar o encerramento além do prazo
+                written = await asyncio.wait_for(self.flush(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                # O lote cancelado voltou para a fila e é contado como descartado abaixo
+                break
+            if not written:
+                await asyncio.sleep(min(0.1, max(0.0, deadline - time.monotonic())))
+        if self._queue:
+            self.dropped += len(self._queue)
+            logger.warning(f"{len(self._queue)} registros de auditoria descartados no encerramento")
+            self._queue.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas da fila de auditoria"""
+        return {
+            "queued": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "overflow_policy": self.overflow_policy,
+            "emitted": self.emitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "last_batch_ms": self.last_batch_ms
+        }
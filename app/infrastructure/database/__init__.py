@@ -3,6 +3,7 @@ Inicialização e gerenciamento dos bancos de dados
 """
 import asyncio
 import logging
+import time
 from typing import Dict, Any
 
 from .config import get_database_config
@@ -22,55 +23,95 @@ class DatabaseManager:
         self.mongo = mongo_setup
         self.redis = redis_setup
         self._initialized = False
-    
-    async def initialize_all(self) -> Dict[str, bool]:
-        """Inicializa todos os bancos de dados"""
-        results = {
-            "postgres": False,
-            "mongo": False,
-            "redis": False
+        self._backends = {
+            "postgres": self.postgres,
+            "mongo": self.mongo,
+            "redis": self.redis
         }
-        
+        self._lazy = {
+            name.strip() for name in self.config.lazy_backends.split(",") if name.strip()
+        }
+        self._ready: Dict[str, bool] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._startup_report: Dict[str, Any] = {}
+    
+    async def _initialize_backend(self, name: str) -> bool:
+        """Inicializa um backend, pré-aquece o pool e registra o tempo gasto"""
+        backend = self._backends[name]
+        started_at = time.perf_counter()
+        entry: Dict[str, Any] = {"status": "ok"}
         try:
-            logger.info("Iniciando inicialização dos bancos de dados...")
-            
-            # Inicializa PostgreSQL
-            try:
-                await self.postgres.initialize()
-                results["postgres"] = True
-                logger.info("PostgreSQL inicializado com sucesso")
-            except Exception as e:
-                logger.error(f"Erro ao inicializar PostgreSQL: {e}")
-            
-            # Inicializa MongoDB
-            try:
-                await self.mongo.initialize()
-                results["mongo"] = True
-                logger.info("MongoDB inicializado com sucesso")
-            except Exception as e:
-                logger.error(f"Erro ao inicializar MongoDB: {e}")
-            
-            # Inicializa Redis
-            try:
-                await self.redis.initialize()
-                results["redis"] = True
-                logger.info("Redis inicializado com sucesso")
-            except Exception as e:
-                logger.error(f"Erro ao inicializar Redis: {e}")
-            
-            self._initialized = all(results.values())
-            
-            if self._initialized:
-                logger.info("Todos os bancos de dados foram inicializados com sucesso")
-            else:
-                failed_dbs = [db for db, status in results.items() if not status]
-                logger.warning(f"Alguns bancos falharam na inicialização: {failed_dbs}")
+            await backend.initialize()
+            if self.config.prewarm_connections:
+                entry["prewarmed_connections"] = await backend.prewarm()
+            self._ready[name] = True
+            logger.info(f"{name} inicializado com sucesso")
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = str(e)
+            logger.error(f"Erro ao inicializar {name}: {e}")
+        entry["duration_ms"] = round((time.perf_counter() - started_at) * 1000, 2)
+        self._startup_report[name] = entry
+        return entry["status"] == "ok"
+    
+    async def ensure_initialized(self, name: str) -> bool:
+        """
+        Inicializa o backend no primeiro uso (uma única vez, mesmo com chamadas concorrentes)
+        
+        Args:
+            name: "postgres", "mongo" ou "redis"
             
-            return results
+        Returns:
+            bool: True se o backend está pronto
+        """
+        if name not in self._backends:
+            raise ValueError(f"Backend desconhecido: {name}")
+        if self._ready.get(name):
+            return True
         
-        except Exception as e:
-            logger.error(f"Erro geral na inicialização dos bancos: {e}")
-            return results
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if self._ready.get(name):
+                return True
+            return await self._initialize_backend(name)
+    
+    async def initialize_all(self) -> Dict[str, bool]:
+        """
+        Inicializa todos os bancos de dados em paralelo
+        
+        Backends listados em DB_LAZY_BACKENDS são adiados para o primeiro
+        `ensure_initialized`. O tempo de startup passa a ser o do backend mais lento,
+        e não a soma dos três.
+        """
+        logger.info("Iniciando inicialização dos bancos de dados...")
+        started_at = time.perf_counter()
+        
+        eager = [name for name in self._backends if name not in self._lazy]
+        for name in self._lazy & self._backends.keys():
+            self._startup_report[name] = {"status": "lazy"}
+        
+        outcomes = await asyncio.gather(*(self.ensure_initialized(name) for name in eager))
+        results = {name: False for name in self._backends}
+        results.update(zip(eager, outcomes))
+        
+        self._startup_report["total_ms"] = round((time.perf_counter() - started_at) * 1000, 2)
+        self._initialized = all(results[name] for name in eager)
+        
+        if self._initialized:
+            logger.info(
+                f"Bancos de dados inicializados em {self._startup_report['total_ms']} ms "
+                f"(adiados: {sorted(self._lazy) or 'nenhum'})"
+            )
+        else:
+            failed_dbs = [name for name in eager if not results[name]]
+            logger.warning(f"Alguns bancos falharam na inicialização: {failed_dbs}")
+        
+        return results
+    
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Retorna status, duração e conexões pré-aquecidas de cada backend"""
+        return {name: dict(entry) if isinstance(entry, dict) else entry
+                for name, entry in self._startup_report.items()}
     
     async def test_all_connections(self) -> Dict[str, bool]:
         """Testa todas as conexões"""
@@ -146,13 +187,17 @@ class DatabaseManager:
         """Retorna status dos bancos de dados"""
         return {
             "initialized": self._initialized,
+            "startup": self.get_startup_report(),
             "config": {
                 "postgres_host": self.config.postgres_host,
                 "postgres_port": self.config.postgres_port,
                 "mongo_host": self.config.mongo_host,
                 "mongo_port": self.config.mongo_port,
                 "redis_host": self.config.redis_host,
-                "redis_port": self.config.redis_port
+                "redis_port": self.config.redis_port,
+                "async_only": self.config.async_only,
+                "pool_min_connections": self.postgres.pool_min,
+                "pool_max_connections": self.postgres.pool_max
             }
         }
 
@@ -2,8 +2,11 @@
 Configurações dos bancos de dados
 """
 import os
-from typing import Optional
-from pydantic import BaseSettings
+from typing import Optional, Tuple
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:  # pydantic v1
+    from pydantic import BaseSettings
 
 
 class DatabaseConfig(BaseSettings):
@@ -31,11 +34,23 @@ class DatabaseConfig(BaseSettings):
     redis_password: Optional[str] = None
     redis_database: int = 0
     redis_url: Optional[str] = None
+    redis_scan_count: int = 1000  # COUNT do SCAN e tamanho do lote de UNLINK
     
     # Configurações de pool de conexões
     max_connections: int = 20
     min_connections: int = 5
     connection_timeout: int = 30
+    # Orçamento global de conexões por banco, dividido entre os workers (0 = sem orçamento)
+    connection_budget: int = 0
+    # Workers da API; se não informado, usa WEB_CONCURRENCY
+    workers: Optional[int] = None
+    # Apenas clientes assíncronos no startup; os síncronos são criados sob demanda (scripts)
+    async_only: bool = True
+    
+    # Inicialização: backends adiados para o primeiro uso (ex.: "mongo,redis")
+    # e pré-aquecimento dos pools até min_connections no startup
+    lazy_backends: str = ""
+    prewarm_connections: bool = True
     
     class Config:
         env_file = ".env"
@@ -48,6 +63,23 @@ def get_database_config() -> DatabaseConfig:
     return DatabaseConfig()
 
 
+def get_pool_limits(config: Optional[DatabaseConfig] = None) -> Tuple[int, int]:
+    """
+    Retorna os limites (mínimo, máximo) de conexões por pool neste worker
+    
+    Com DB_CONNECTION_BUDGET definido, o máximo é o orçamento dividido pelo número
+    de workers, de modo que escalar os workers do uvicorn não ultrapasse o limite
+    de conexões do banco.
+    """
+    config = config or get_database_config()
+    max_size = config.max_connections
+    if config.connection_budget > 0:
+        workers = config.workers or int(os.getenv("WEB_CONCURRENCY", "1"))
+        max_size = min(max_size, config.connection_budget // max(1, workers))
+    max_size = max(1, max_size)  # ao menos uma conexão, mesmo com orçamento menor que os workers
+    return min(config.min_connections, max_size), max_size
+
+
 def get_postgres_url() -> str:
     """Retorna a URL de conexão do PostgreSQL"""
     config = get_database_config()
@@ -7,9 +7,10 @@ from typing import Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import MongoClient
 from pymongo.database import Database
+from pymongo.errors import OperationFailure
 from contextlib import asynccontextmanager
 
-from ..config import get_database_config, get_mongo_url
+from ..config import get_database_config, get_pool_limits, get_mongo_url
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ class MongoSetup:
     
     def __init__(self):
         self.config = get_database_config()
+        self.pool_min, self.pool_max = get_pool_limits(self.config)
         self.client: Optional[AsyncIOMotorClient] = None
         self.sync_client: Optional[MongoClient] = None
         self.database: Optional[AsyncIOMotorDatabase] = None
@@ -29,8 +31,8 @@ class MongoSetup:
         try:
             self.client = AsyncIOMotorClient(
                 get_mongo_url(),
-                maxPoolSize=self.config.max_connections,
-                minPoolSize=self.config.min_connections,
+                maxPoolSize=self.pool_max,
+                minPoolSize=self.pool_min,
                 serverSelectionTimeoutMS=self.config.connection_timeout * 1000,
                 connectTimeoutMS=self.config.connection_timeout * 1000,
                 socketTimeoutMS=self.config.connection_timeout * 1000
@@ -46,8 +48,8 @@ class MongoSetup:
         try:
             self.sync_client = MongoClient(
                 get_mongo_url(),
-                maxPoolSize=self.config.max_connections,
-                minPoolSize=self.config.min_connections,
+                maxPoolSize=self.pool_max,
+                minPoolSize=self.pool_min,
                 serverSelectionTimeoutMS=self.config.connection_timeout * 1000,
                 connectTimeoutMS=self.config.connection_timeout * 1000,
                 socketTimeoutMS=self.config.connection_timeout * 1000
@@ -97,7 +99,7 @@ class MongoSetup:
     async def create_indexes(self) -> None:
         """Cria índices básicos para o banco"""
         try:
-            if not self.database:
+            if self.database is None:
                 self.create_client()
             
             # Índices para coleções comuns
@@ -109,13 +111,7 @@ class MongoSetup:
                 ],
                 'sessions': [
                     ('user_id', 1),
-                    ('expires_at', 1),
-                    ('token', 1)
-                ],
-                'audit_logs': [
-                    ('user_id', 1),
-                    ('action', 1),
-                    ('created_at', 1)
+                    ('access_token_digest', 1)
                 ]
             }
             
@@ -127,22 +123,94 @@ class MongoSetup:
                     except Exception as e:
                         logger.warning(f"Erro ao criar índice {index_spec} na coleção {collection_name}: {e}")
             
+            # Sessões vencidas são removidas pelo próprio MongoDB (sem varredura na aplicação)
+            await self.ensure_ttl_index('sessions', 'expires_at')
+            
+            # Um documento de consumo por conta e período (upsert da consolidação)
+            try:
+                await self.database['usage'].create_index([('account_id', 1), ('period_start', 1)], unique=True)
+            except Exception as e:
+                logger.warning(f"Erro ao criar índice (account_id, period_start) na coleção usage: {e}")
+            
+            await self.create_audit_log_indexes()
+            
             logger.info("Índices MongoDB criados com sucesso")
         
         except Exception as e:
             logger.error(f"Erro ao criar índices: {e}")
             raise
     
+    async def create_audit_log_indexes(self) -> None:
+        """
+        Cria os índices compostos da consulta de auditoria
+        
+        Cada índice tem os campos de igualdade de um filtro seguidos da ordenação
+        (created_at, _id) decrescente: o filtro, o intervalo de datas e o cursor
+        são resolvidos no índice, sem ordenação em memória nem skip. Combinações
+        sem índice próprio (ex.: user_id + action) usam o índice do campo mais
+        seletivo e filtram o restante.
+        """
+        if self.database is None:
+            self.create_client()
+        
+        order = [('created_at', -1), ('_id', -1)]
+        indexes = [
+            [('account_id', 1), ('action', 1)] + order,
+            [('account_id', 1)] + order,
+            [('user_id', 1)] + order,
+            [('action', 1)] + order,
+            order
+        ]
+        collection = self.database['audit_logs']
+        for keys in indexes:
+            try:
+                await collection.create_index(keys)
+            except Exception as e:
+                logger.warning(f"Erro ao criar índice {keys} na coleção audit_logs: {e}")
+    
+    async def ensure_ttl_index(self, collection_name: str, field: str, expire_after_seconds: int = 0) -> None:
+        """
+        Garante um índice TTL no campo informado
+        
+        Com expire_after_seconds=0 o documento é removido quando o instante gravado
+        no campo passa. Um índice comum já existente no mesmo campo é convertido
+        em TTL via collMod.
+        
+        Args:
+            collection_name: Nome da coleção
+            field: Campo de data usado como vencimento
+            expire_after_seconds: Atraso da remoção após o vencimento
+        """
+        if self.database is None:
+            self.create_client()
+        
+        collection = self.database[collection_name]
+        try:
+            await collection.create_index([(field, 1)], expireAfterSeconds=expire_after_seconds)
+        except OperationFailure as e:
+            # 85/86: já existe índice no campo com outras opções (ex.: sem TTL)
+            if e.code not in (85, 86):
+                logger.warning(f"Erro ao criar índice TTL em {collection_name}.{field}: {e}")
+                return
+            try:
+                await self.database.command(
+                    "collMod",
+                    collection_name,
+                    index={"keyPattern": {field: 1}, "expireAfterSeconds": expire_after_seconds}
+                )
+            except Exception as mod_error:
+                logger.warning(f"Erro ao converter índice {collection_name}.{field} em TTL: {mod_error}")
+    
     def get_collection(self, collection_name: str):
         """Retorna uma coleção síncrona"""
-        if not self.sync_database:
+        if self.sync_database is None:
             self.create_sync_client()
         
         return self.sync_database[collection_name]
     
     def get_async_collection(self, collection_name: str):
         """Retorna uma coleção assíncrona"""
-        if not self.database:
+        if self.database is None:
             self.create_client()
         
         return self.database[collection_name]
@@ -163,7 +231,7 @@ class MongoSetup:
     async def create_collection_if_not_exists(self, collection_name: str) -> None:
         """Cria uma coleção se não existir"""
         try:
-            if not self.database:
+            if self.database is None:
                 self.create_client()
             
             collections = await self.database.list_collection_names()
@@ -177,11 +245,40 @@ class MongoSetup:
             logger.error(f"Erro ao criar coleção '{collection_name}': {e}")
             raise
     
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """
+        Abre conexões no pool assíncrono antes da primeira requisição
+        
+        Args:
+            connections: Quantidade de conexões (padrão: mínimo do pool)
+            
+        Returns:
+            int: Número de comandos concorrentes concluídos
+        """
+        if not self.client:
+            self.create_client()
+        
+        count = self.pool_min if connections is None else connections
+        if count <= 0:
+            return 0
+        
+        # Pings concorrentes forçam o driver a abrir uma conexão para cada um;
+        # depois disso o minPoolSize mantém o pool aquecido
+        results = await asyncio.gather(
+            *(self.client.admin.command('ping') for _ in range(count)),
+            return_exceptions=True
+        )
+        warmed = sum(1 for result in results if not isinstance(result, BaseException))
+        logger.info(f"Pool MongoDB pré-aquecido com {warmed} conexões")
+        return warmed
+    
     async def initialize(self) -> None:
         """Inicializa o MongoDB"""
         try:
             self.create_client()
-            self.create_sync_client()
+            if not self.config.async_only:
+                # MongoClient síncrono resolve DNS/SRV no construtor: fora do event loop
+                await asyncio.to_thread(self.create_sync_client)
             await self.create_database_if_not_exists()
             await self.create_indexes()
             await self.test_connection()
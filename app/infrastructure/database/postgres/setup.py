@@ -10,7 +10,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from contextlib import asynccontextmanager
 
-from ..config import get_database_config, get_postgres_url
+from ..config import get_database_config, get_pool_limits, get_postgres_url
+from .tables import metadata
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ class PostgreSQLSetup:
     
     def __init__(self):
         self.config = get_database_config()
+        self.pool_min, self.pool_max = get_pool_limits(self.config)
         self.engine = None
         self.async_engine = None
         self.session_factory = None
@@ -31,8 +33,8 @@ class PostgreSQLSetup:
             self.engine = create_engine(
                 get_postgres_url(),
                 poolclass=QueuePool,
-                pool_size=self.config.max_connections,
-                max_overflow=self.config.max_connections - self.config.min_connections,
+                pool_size=self.pool_min,
+                max_overflow=self.pool_max - self.pool_min,
                 pool_timeout=self.config.connection_timeout,
                 pool_recycle=3600,
                 echo=False
@@ -50,8 +52,8 @@ class PostgreSQLSetup:
             
             self.async_engine = create_async_engine(
                 async_url,
-                pool_size=self.config.max_connections,
-                max_overflow=self.config.max_connections - self.config.min_connections,
+                pool_size=self.pool_min,
+                max_overflow=self.pool_max - self.pool_min,
                 pool_timeout=self.config.connection_timeout,
                 pool_recycle=3600,
                 echo=False
@@ -94,18 +96,19 @@ class PostgreSQLSetup:
             logger.error(f"Erro ao testar conexão PostgreSQL: {e}")
             return False
     
-    async def create_database_if_not_exists(self) -> None:
-        """Cria o banco de dados se não existir"""
+    def _create_database_sync(self) -> None:
+        """Verifica/cria o banco usando o driver síncrono (executado fora do event loop)"""
+        # Conecta ao PostgreSQL sem especificar database
+        admin_url = f"postgresql://{self.config.postgres_user}:{self.config.postgres_password}@{self.config.postgres_host}:{self.config.postgres_port}/postgres"
+        admin_engine = create_engine(admin_url, isolation_level="AUTOCOMMIT")
+        
         try:
-            # Conecta ao PostgreSQL sem especificar database
-            admin_url = f"postgresql://{self.config.postgres_user}:{self.config.postgres_password}@{self.config.postgres_host}:{self.config.postgres_port}/postgres"
-            admin_engine = create_engine(admin_url)
-            
             with admin_engine.connect() as conn:
                 # Verifica se o banco existe
-                result = conn.execute(text(
-                    f"SELECT 1 FROM pg_database WHERE datname = '{self.config.postgres_database}'"
-                ))
+                result = conn.execute(
+                    text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                    {"name": self.config.postgres_database}
+                )
                 
                 if not result.fetchone():
                     # Cria o banco
@@ -113,11 +116,30 @@ class PostgreSQLSetup:
                     logger.info(f"Banco de dados '{self.config.postgres_database}' criado com sucesso")
                 else:
                     logger.info(f"Banco de dados '{self.config.postgres_database}' já existe")
-        
+        finally:
+            admin_engine.dispose()
+    
+    async def create_database_if_not_exists(self) -> None:
+        """Cria o banco de dados se não existir"""
+        try:
+            await asyncio.to_thread(self._create_database_sync)
         except Exception as e:
             logger.error(f"Erro ao criar banco de dados: {e}")
             raise
     
+    async def create_tables(self) -> None:
+        """Cria as tabelas e índices definidos em tables.py (se não existirem)"""
+        try:
+            if not self.async_engine:
+                self.create_engine_async()
+            
+            async with self.async_engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+            logger.info("Tabelas PostgreSQL criadas com sucesso")
+        except Exception as e:
+            logger.error(f"Erro ao criar tabelas PostgreSQL: {e}")
+            raise
+    
     def get_session(self):
         """Retorna uma sessão síncrona"""
         if not self.session_factory:
@@ -146,15 +168,44 @@ class PostgreSQLSetup:
         """Inicializa o PostgreSQL"""
         try:
             await self.create_database_if_not_exists()
-            self.create_engine_sync()
+            if not self.config.async_only:
+                self.create_engine_sync()
             self.create_engine_async()
             self.create_session_factories()
             await self.test_connection()
+            await self.create_tables()
             logger.info("PostgreSQL inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar PostgreSQL: {e}")
             raise
     
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """
+        Abre conexões no pool assíncrono antes da primeira requisição
+        
+        Args:
+            connections: Quantidade de conexões (padrão: mínimo do pool)
+            
+        Returns:
+            int: Número de conexões abertas e devolvidas ao pool
+        """
+        if not self.async_engine:
+            self.create_engine_async()
+        
+        count = self.pool_min if connections is None else connections
+        if count <= 0:
+            return 0
+        
+        # Mantém todas abertas ao mesmo tempo para que o pool cresça até `count`
+        opened = await asyncio.gather(
+            *(self.async_engine.connect() for _ in range(count)),
+            return_exceptions=True
+        )
+        conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+        await asyncio.gather(*(conn.close() for conn in conns))
+        logger.info(f"Pool PostgreSQL pré-aquecido com {len(conns)} conexões")
+        return len(conns)
+    
     def close_connections(self) -> None:
         """Fecha todas as conexões"""
         if self.engine:
@@ -0,0 +1,72 @@
+"""
+Definição das tabelas do PostgreSQL (SQLAlchemy Core)
+"""
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+metadata = MetaData()
+
+
+users_table = Table(
+    "users",
+    metadata,
+    Column("id", String(64), primary_key=True),
+    Column("email", String(320), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("password_hash", String(255), nullable=True),
+    Column("phone", String(32), nullable=True),
+    Column("role", String(16), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("email_verified", Boolean, nullable=False, default=False),
+    Column("last_login_at", DateTime, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Email único sem diferenciar maiúsculas/minúsculas (mesma regra do repositório em memória)
+Index("ux_users_email_lower", func.lower(users_table.c.email), unique=True)
+
+
+auth_providers_table = Table(
+    "auth_providers",
+    metadata,
+    Column("id", String(128), primary_key=True),
+    Column("user_id", String(64), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("provider_type", String(16), nullable=False),
+    Column("provider_id", String(255), nullable=False),
+    Column("provider_data", JSON().with_variant(JSONB(), "postgresql"), nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    UniqueConstraint("provider_type", "provider_id", name="ux_auth_providers_provider"),
+)
+
+
+# Sessões ficam no PostgreSQL quando AUTH_SESSION_BACKEND=postgres: a validação de token
+# resolve sessão e usuário com um único JOIN (tokens só como digest, nunca em texto claro)
+auth_sessions_table = Table(
+    "auth_sessions",
+    metadata,
+    Column("id", String(64), primary_key=True),
+    Column("user_id", String(64), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("access_token_digest", LargeBinary, nullable=False),
+    Column("refresh_token_digest", LargeBinary, nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    Column("status", String(16), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Index("ux_auth_sessions_access_token_digest", auth_sessions_table.c.access_token_digest, unique=True)
@@ -2,22 +2,32 @@
 Setup e configuração do Redis
 """
 import asyncio
+import inspect
 import logging
-from typing import Optional, Any, Dict, Union
+from typing import Optional, Any, AsyncIterator, Callable, Dict, List, Union
 import redis.asyncio as redis
 import redis as sync_redis
 from contextlib import asynccontextmanager
 
-from ..config import get_database_config, get_redis_url
+from ..config import get_database_config, get_pool_limits, get_redis_url
 
 logger = logging.getLogger(__name__)
 
+# Máximo de chaves por comando UNLINK dentro de um lote, para não monopolizar o servidor
+UNLINK_CHUNK_SIZE = 100
+
+
+def _escape_pattern(namespace: str) -> str:
+    """Escapa caracteres de glob do namespace para uso em MATCH"""
+    return "".join(f"\\{char}" if char in "*?[]\\" else char for char in namespace)
+
 
 class RedisSetup:
     """Classe para setup e gerenciamento do Redis"""
     
     def __init__(self):
         self.config = get_database_config()
+        self.pool_min, self.pool_max = get_pool_limits(self.config)
         self.client: Optional[redis.Redis] = None
         self.sync_client: Optional[sync_redis.Redis] = None
         self.connection_pool: Optional[redis.ConnectionPool] = None
@@ -28,7 +38,7 @@ class RedisSetup:
         try:
             self.connection_pool = redis.ConnectionPool.from_url(
                 get_redis_url(),
-                max_connections=self.config.max_connections,
+                max_connections=self.pool_max,
                 retry_on_timeout=True,
                 socket_connect_timeout=self.config.connection_timeout,
                 socket_timeout=self.config.connection_timeout
@@ -43,7 +53,7 @@ class RedisSetup:
         try:
             self.sync_connection_pool = sync_redis.ConnectionPool.from_url(
                 get_redis_url(),
-                max_connections=self.config.max_connections,
+                max_connections=self.pool_max,
                 retry_on_timeout=True,
                 socket_connect_timeout=self.config.connection_timeout,
                 socket_timeout=self.config.connection_timeout
@@ -204,30 +214,84 @@ class RedisSetup:
         full_key = f"{namespace}{key}"
         await self.client.delete(full_key)
     
-    async def get_keys_by_namespace(self, namespace: str) -> list:
-        """Obtém todas as chaves de um namespace"""
+    async def iter_keys_by_namespace(self, namespace: str, count: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Percorre as chaves de um namespace de forma incremental (SCAN)
+        
+        Args:
+            namespace: Prefixo das chaves (ex.: "session:")
+            count: Dica de COUNT por iteração do SCAN (padrão: DB_REDIS_SCAN_COUNT)
+            
+        Returns:
+            AsyncIterator: Chaves encontradas (podem repetir se o keyspace mudar durante a varredura)
+        """
         if not self.client:
             self.create_client()
         
-        pattern = f"{namespace}*"
-        return await self.client.keys(pattern)
+        pattern = f"{_escape_pattern(namespace)}*"
+        async for key in self.client.scan_iter(match=pattern, count=count or self.config.redis_scan_count):
+            yield key
     
-    async def clear_namespace(self, namespace: str) -> None:
-        """Limpa todas as chaves de um namespace"""
-        if not self.client:
-            self.create_client()
+    async def get_keys_by_namespace(self, namespace: str) -> list:
+        """Obtém todas as chaves de um namespace (via SCAN, sem bloquear o servidor)"""
+        return [key async for key in self.iter_keys_by_namespace(namespace)]
+    
+    async def _unlink_batch(self, keys: List[Any]) -> int:
+        """Remove um lote de chaves com UNLINK em pipeline (liberação de memória em background)"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(keys), UNLINK_CHUNK_SIZE):
+                pipe.unlink(*keys[start:start + UNLINK_CHUNK_SIZE])
+            results = await pipe.execute()
+        return sum(int(result) for result in results)
+    
+    async def clear_namespace(
+        self,
+        namespace: str,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int], Any]] = None
+    ) -> int:
+        """
+        Limpa todas as chaves de um namespace em lotes
+        
+        Args:
+            namespace: Prefixo das chaves
+            batch_size: Chaves removidas por round trip (padrão: DB_REDIS_SCAN_COUNT)
+            progress_callback: Chamado com o total removido após cada lote (pode ser async)
+            
+        Returns:
+            int: Número de chaves removidas
+        """
+        batch_size = batch_size or self.config.redis_scan_count
+        deleted = 0
+        batch: List[Any] = []
+        
+        async def flush() -> None:
+            nonlocal deleted
+            deleted += await self._unlink_batch(batch)
+            batch.clear()
+            if progress_callback is not None:
+                result = progress_callback(deleted)
+                if inspect.isawaitable(result):
+                    await result
+        
+        async for key in self.iter_keys_by_namespace(namespace, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
         
-        keys = await self.get_keys_by_namespace(namespace)
-        if keys:
-            await self.client.delete(*keys)
+        logger.info(f"Namespace '{namespace}' limpo: {deleted} chaves removidas")
+        return deleted
     
     async def initialize(self) -> None:
         """Inicializa o Redis"""
         try:
             self.create_connection_pool()
-            self.create_sync_connection_pool()
             self.create_client()
-            self.create_sync_client()
+            if not self.config.async_only:
+                self.create_sync_connection_pool()
+                self.create_sync_client()
             await self.test_connection()
             await self.setup_basic_keys()
             await self.create_namespaces()
@@ -236,6 +300,32 @@ class RedisSetup:
             logger.error(f"Erro ao inicializar Redis: {e}")
             raise
     
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """
+        Abre conexões no pool assíncrono antes da primeira requisição
+        
+        Args:
+            connections: Quantidade de conexões (padrão: mínimo do pool)
+            
+        Returns:
+            int: Número de comandos concorrentes concluídos
+        """
+        if not self.client:
+            self.create_client()
+        
+        count = self.pool_min if connections is None else connections
+        if count <= 0:
+            return 0
+        
+        # Cada PING concorrente retira uma conexão distinta do pool
+        results = await asyncio.gather(
+            *(self.client.ping() for _ in range(count)),
+            return_exceptions=True
+        )
+        warmed = sum(1 for result in results if not isinstance(result, BaseException))
+        logger.info(f"Pool Redis pré-aquecido com {warmed} conexões")
+        return warmed
+    
     def close_connections(self) -> None:
         """Fecha todas as conexões"""
         if self.client:
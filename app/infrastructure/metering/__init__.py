@@ -0,0 +1,8 @@
+"""
+Medição de consumo e verificação de limites do plano
+"""
+
+from .usage_meter import UsageMeter
+from .quota_engine import NoActivePlanError, QuotaCheck, QuotaEngine, QuotaExceededError
+
+__all__ = ["UsageMeter", "QuotaEngine", "QuotaCheck", "QuotaExceededError", "NoActivePlanError"]
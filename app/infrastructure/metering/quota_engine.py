@@ -0,0 +1,237 @@
+"""
+Verificação de limites do plano com estado local por conta
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Set
+
+from app.domain.usage.usage import USAGE_METRICS
+from app.infrastructure.repositories.plan.plan_repository import PlanRepository
+from app.shared.cache import LRUTTLCache
+from app.shared.single_flight import SingleFlight
+from .usage_meter import UsageMeter
+
+logger = logging.getLogger(__name__)
+
+_METRICS = frozenset(USAGE_METRICS)
+
+
+class NoActivePlanError(Exception):
+    """Lançado quando a conta não tem plano vigente (sem plano, nada é admitido)"""
+
+    def __init__(self, account_id: str):
+        super().__init__(f"Conta sem plano vigente: {account_id}")
+        self.account_id = account_id
+
+
+class QuotaExceededError(Exception):
+    """Lançado quando o consumo da conta ultrapassaria o limite do plano"""
+
+    def __init__(self, check: "QuotaCheck"):
+        super().__init__(f"Limite do plano excedido ({check.metric})")
+        self.check = check
+
+
+@dataclass(slots=True)
+class QuotaCheck:
+    """Resultado de uma verificação de limite"""
+    allowed: bool
+    metric: str
+    limit: Optional[int]  # None: sem limite no plano
+    used: int
+    remaining: Optional[int]
+    retry_after_seconds: int  # segundos até o início do próximo período
+
+
+@dataclass(slots=True)
+class _AccountQuota:
+    limits: Optional[Dict[str, Optional[int]]]  # None: conta sem plano vigente
+    used: Dict[str, int]
+    period_ends_at: float
+    reconciled_at: float
+    reconciling: bool = False
+
+
+def _parse_limits(limits: Mapping[str, Any]) -> Dict[str, Optional[int]]:
+    """Extrai de Plan.limits o limite de cada métrica (ausente, None ou negativo: ilimitado)"""
+    parsed: Dict[str, Optional[int]] = dict.fromkeys(USAGE_METRICS)
+    for metric in USAGE_METRICS:
+        value = limits.get(metric)
+        if value is not None and int(value) >= 0:
+            parsed[metric] = int(value)
+    return parsed
+
+
+class QuotaEngine:
+    """
+    Verifica consumo x Plan.limits sem consultar banco na requisição
+
+    Cada conta tem um estado local (limites do plano + consumo do período). A
+    verificação é uma leitura de dicionário; o consumo registrado no worker é
+    somado na hora. O consumo dos demais workers chega por reconciliação
+    assíncrona com os contadores compartilhados do UsageMeter (Redis), disparada
+    em segundo plano quando o estado tem mais de reconcile_interval_seconds.
+
+    Excesso máximo: um worker enxerga o consumo dos outros com atraso de até
+    flush_interval do UsageMeter + reconcile_interval_seconds (+ duração de uma
+    reconciliação). Com W workers admitindo R unidades/s cada, a conta pode
+    ultrapassar o limite em até (W - 1) x R x (flush + reconcile) unidades. Com
+    um único worker, o excesso se limita aos incrementos de um flush em
+    andamento durante a reconciliação. Mudanças de plano valem em até
+    limits_ttl_seconds.
+
+    Conta sem plano vigente é negada (NoActivePlanError), nunca tratada como
+    ilimitada; a ausência de plano também fica em cache por limits_ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        plan_repository: PlanRepository,
+        usage_meter: UsageMeter,
+        limits_ttl_seconds: float = 60.0,
+        reconcile_interval_seconds: float = 1.0,
+        max_accounts: int = 100000,
+        clock: Callable[[], float] = time.time
+    ):
+        self.plan_repository = plan_repository
+        self.usage_meter = usage_meter
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._clock = clock
+        self._states = LRUTTLCache(max_size=max_accounts, default_ttl_seconds=limits_ttl_seconds)
+        self._loads = SingleFlight()
+        self._reconcile_tasks: Set[asyncio.Task] = set()
+        self.checks = 0
+        self.rejections = 0
+        self.loads = 0
+        self.reconciles = 0
+        self.reconcile_errors = 0
+
+    async def _read_used(self, account_id: str) -> Dict[str, int]:
+        """Consumo compartilhado (já descarregado) + pendente neste worker"""
+        used = await self.usage_meter.get_account_totals(account_id)
+        for metric, amount in self.usage_meter.get_pending(account_id).items():
+            used[metric] += amount
+        return used
+
+    async def _load(self, account_id: str) -> _AccountQuota:
+        plan = await self.plan_repository.get_by_account(account_id)
+        used = await self._read_used(account_id)
+        _, period_end = self.usage_meter.get_current_period()
+        state = _AccountQuota(
+            limits=_parse_limits(plan.limits or {}) if plan is not None else None,
+            used=used,
+            period_ends_at=(period_end - datetime(1970, 1, 1)).total_seconds(),
+            reconciled_at=self._clock()
+        )
+        self._states.set(account_id, state)
+        self.loads += 1
+        return state
+
+    async def _get_state(self, account_id: str) -> _AccountQuota:
+        state = self._states.get(account_id)
+        if state is None or self._clock() >= state.period_ends_at:
+            state = await self._loads.do(account_id, lambda: self._load(account_id))
+        return state
+
+    async def _reconcile(self, account_id: str, state: _AccountQuota) -> None:
+        try:
+            state.used = await self._read_used(account_id)
+            self.reconciles += 1
+        except Exception as e:
+            self.reconcile_errors += 1
+            logger.warning(f"Falha ao reconciliar consumo da conta {account_id}: {e}")
+        finally:
+            state.reconciled_at = self._clock()
+            state.reconciling = False
+
+    def _maybe_reconcile(self, account_id: str, state: _AccountQuota, now: float) -> None:
+        if state.reconciling or now - state.reconciled_at < self.reconcile_interval_seconds:
+            return
+        state.reconciling = True
+        task = asyncio.create_task(self._reconcile(account_id, state))
+        self._reconcile_tasks.add(task)
+        task.add_done_callback(self._reconcile_tasks.discard)
+
+    async def check(self, account_id: str, metric: str, amount: int = 1) -> QuotaCheck:
+        """
+        Verifica se a conta pode consumir `amount` unidades da métrica
+
+        Args:
+            account_id: ID da conta
+            metric: "messages_count", "groups_count" ou "storage_bytes"
+            amount: Quantidade a consumir
+
+        Returns:
+            QuotaCheck: Decisão, limite, consumo e tempo até o próximo período
+
+        Raises:
+            ValueError: Se a métrica não existir
+            NoActivePlanError: Se a conta não tiver plano vigente
+        """
+        if metric not in _METRICS:
+            raise ValueError(f"Métrica de consumo desconhecida: {metric}")
+
+        state = await self._get_state(account_id)
+        now = self._clock()
+        self._maybe_reconcile(account_id, state, now)
+
+        self.checks += 1
+        if state.limits is None:
+            self.rejections += 1
+            raise NoActivePlanError(account_id)
+        limit = state.limits[metric]
+        used = state.used[metric]
+        retry_after = max(1, math.ceil(state.period_ends_at - now))
+        if limit is None:
+            return QuotaCheck(True, metric, None, used, None, retry_after)
+
+        allowed = used + amount <= limit
+        if not allowed:
+            self.rejections += 1
+        return QuotaCheck(allowed, metric, limit, used, max(0, limit - used), retry_after)
+
+    def record(self, account_id: str, metric: str, amount: int = 1) -> None:
+        """Registra consumo no UsageMeter e no estado local da conta"""
+        self.usage_meter.increment(account_id, metric, amount)
+        state = self._states.peek(account_id)
+        if state is not None:
+            state.used[metric] += amount
+
+    async def consume(self, account_id: str, metric: str, amount: int = 1) -> QuotaCheck:
+        """
+        Verifica o limite e, se permitido, registra o consumo
+
+        Returns:
+            QuotaCheck: Resultado já considerando o consumo registrado
+
+        Raises:
+            QuotaExceededError: Se o consumo ultrapassaria o limite do plano
+            NoActivePlanError: Se a conta não tiver plano vigente
+        """
+        check = await self.check(account_id, metric, amount)
+        if not check.allowed:
+            raise QuotaExceededError(check)
+        self.record(account_id, metric, amount)
+        if check.limit is None:
+            return replace(check, used=check.used + amount)
+        return replace(check, used=check.used + amount, remaining=max(0, check.remaining - amount))
+
+    def invalidate(self, account_id: str) -> None:
+        """Descarta o estado local da conta (ex.: após mudança de plano)"""
+        self._states.delete(account_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do motor de limites"""
+        return {
+            "accounts": len(self._states),
+            "checks": self.checks,
+            "rejections": self.rejections,
+            "loads": self.loads,
+            "reconciles": self.reconciles,
+            "reconcile_errors": self.reconcile_errors,
+            "reconciling": len(self._reconcile_tasks)
+        }
@@ -0,0 +1,363 @@
+"""
+Medição de consumo por conta com agregação em processo
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.domain.usage.usage import USAGE_METRICS, Usage, monthly_period
+from app.infrastructure.database.redis.setup import RedisSetup
+from app.infrastructure.repositories.usage.usage_repository import UsageRepository
+from app.shared.id_generator import new_id
+
+logger = logging.getLogger(__name__)
+
+_METRICS = frozenset(USAGE_METRICS)
+
+# (período, conta, métrica) -> incremento acumulado desde o último flush
+PendingCounters = Dict[Tuple[str, str, str], int]
+
+
+def _to_str(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class UsageMeter:
+    """
+    Agrega incrementos de consumo em memória e os descarrega periodicamente
+
+    - increment() é síncrono e O(1): só soma em um dicionário do processo, sem
+      I/O por evento
+    - flush() troca o dicionário por um vazio e grava os deltas no Redis com
+      HINCRBY em pipelines MULTI/EXEC de até flush_batch_size comandos, em
+      metrics:usage:{AAAAMM}:{account_id}. Sem Redis, os totais ficam no processo
+    - rollup() lê os totais do período e grava um documento Usage por conta no
+      repositório (upsert idempotente, pode ser repetido)
+
+    Perda máxima em caso de queda do processo: os incrementos ainda não
+    descarregados, ou seja, no máximo flush_interval_seconds de eventos. Se o
+    Redis falhar, os lotes não gravados voltam para a fila até max_pending_keys
+    chaves distintas; acima disso são descartados e contados em dropped_keys.
+    """
+
+    def __init__(
+        self,
+        redis_setup: Optional[RedisSetup] = None,
+        repository: Optional[UsageRepository] = None,
+        namespace: str = "metrics:usage:",
+        flush_interval_seconds: float = 1.0,
+        rollup_interval_seconds: float = 60.0,
+        max_pending_keys: int = 100000,
+        flush_batch_size: int = 1000,
+        retention_seconds: int = 100 * 86400,
+        clock: Callable[[], float] = time.time
+    ):
+        self.redis_setup = redis_setup
+        self.repository = repository
+        self.namespace = namespace
+        self.flush_interval_seconds = flush_interval_seconds
+        self.rollup_interval_seconds = rollup_interval_seconds
+        self.max_pending_keys = max_pending_keys
+        self.flush_batch_size = flush_batch_size
+        self.retention_seconds = retention_seconds
+        self._clock = clock
+
+        self._pending: PendingCounters = {}
+        # Totais locais (sem Redis): (período, conta) -> métrica -> valor
+        self._totals: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(USAGE_METRICS, 0))
+        self._periods: Dict[str, Tuple[datetime, datetime]] = {}
+        self._dirty_periods: Set[str] = set()
+        self._period_key = ""
+        self._period_ends_at = 0.0
+        self._flush_requested = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+        self.increments = 0
+        self.flushes = 0
+        self.flushed_keys = 0
+        self.flush_errors = 0
+        self.dropped_keys = 0
+        self.last_flush_ms = 0.0
+        self.rollups = 0
+        self.rollup_errors = 0
+        self.last_rollup_documents = 0
+
+    def _roll_period(self, now: float) -> None:
+        start, end = monthly_period(datetime.utcfromtimestamp(now))
+        self._period_key = start.strftime("%Y%m")
+        self._periods[self._period_key] = (start, end)
+        self._period_ends_at = (end - datetime(1970, 1, 1)).total_seconds()
+
+    def _current_period_key(self) -> str:
+        now = self._clock()
+        if now >= self._period_ends_at:
+            self._roll_period(now)
+        return self._period_key
+
+    def _hash_key(self, period_key: str, account_id: str) -> str:
+        return f"{self.namespace}{period_key}:{account_id}"
+
+    def _accounts_key(self, period_key: str) -> str:
+        return f"{self.namespace}{period_key}:accounts"
+
+    def increment(self, account_id: str, metric: str, amount: int = 1) -> None:
+        """
+        Registra consumo da conta no período corrente (sem I/O)
+
+        Deve ser chamado a partir do event loop: a troca do dicionário no flush
+        é atômica em relação às chamadas feitas nele.
+
+        Args:
+            account_id: ID da conta
+            metric: "messages_count", "groups_count" ou "storage_bytes"
+            amount: Incremento (negativo para decrementos, ex.: armazenamento liberado)
+
+        Raises:
+            ValueError: Se a métrica não existir
+        """
+        if metric not in _METRICS:
+            raise ValueError(f"Métrica de consumo desconhecida: {metric}")
+
+        now = self._clock()
+        if now >= self._period_ends_at:
+            self._roll_period(now)
+
+        key = (self._period_key, account_id, metric)
+        pending = self._pending
+        pending[key] = pending.get(key, 0) + amount
+        self.increments += 1
+        if len(pending) >= self.max_pending_keys:
+            self._flush_requested.set()
+
+    def _restore(self, counters: PendingCounters) -> None:
+        """Devolve à fila incrementos não gravados, respeitando max_pending_keys"""
+        pending = self._pending
+        for key, amount in counters.items():
+            if key not in pending and len(pending) >= self.max_pending_keys:
+                self.dropped_keys += 1
+                continue
+            pending[key] = pending.get(key, 0) + amount
+
+    async def _write_redis(self, counters: PendingCounters) -> None:
+        items = list(counters.items())
+        written = 0
+        try:
+            client = self.redis_setup.get_async_client()
+            for offset in range(0, len(items), self.flush_batch_size):
+                batch = items[offset:offset + self.flush_batch_size]
+                # MULTI/EXEC por lote: cada lote é gravado inteiro ou não é gravado
+                async with client.pipeline(transaction=True) as pipe:
+                    touched: Set[Tuple[str, str]] = set()
+                    for (period_key, account_id, metric), amount in batch:
+                        pipe.hincrby(self._hash_key(period_key, account_id), metric, amount)
+                        touched.add((period_key, account_id))
+                    for period_key, account_id in touched:
+                        pipe.expire(self._hash_key(period_key, account_id), self.retention_seconds)
+                        pipe.sadd(self._accounts_key(period_key), account_id)
+                    for period_key in {period_key for period_key, _ in touched}:
+                        pipe.expire(self._accounts_key(period_key), self.retention_seconds)
+                    await pipe.execute()
+                written = offset + len(batch)
+        except BaseException:
+            # Inclui CancelledError: lotes não confirmados voltam para a fila
+            self._restore(dict(items[written:]))
+            raise
+
+    def _write_local(self, counters: PendingCounters) -> None:
+        totals = self._totals
+        for (period_key, account_id, metric), amount in counters.items():
+            totals[(period_key, account_id)][metric] += amount
+
+    async def flush(self) -> int:
+        """
+        Descarrega os incrementos pendentes
+
+        Returns:
+            int: Número de contadores (conta, métrica) gravados
+        """
+        counters = self._pending
+        if not counters:
+            return 0
+        self._pending = {}
+        self._flush_requested.clear()
+
+        started_at = time.perf_counter()
+        self._dirty_periods.update(period_key for period_key, _, _ in counters)
+        try:
+            if self.redis_setup is None:
+                self._write_local(counters)
+            else:
+                await self._write_redis(counters)
+        except Exception as e:
+            self.flush_errors += 1
+            logger.warning(f"Falha ao descarregar contadores de consumo: {e}")
+            return 0
+
+        self.flushes += 1
+        self.flushed_keys += len(counters)
+        self.last_flush_ms = round((time.perf_counter() - started_at) * 1000, 3)
+        return len(counters)
+
+    async def get_period_totals(self, period_start: datetime) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna os totais já descarregados de um período
+
+        Args:
+            period_start: Início do período (primeiro dia do mês)
+
+        Returns:
+            Dict[str, Dict[str, int]]: account_id -> métrica -> valor
+        """
+        period_key = period_start.strftime("%Y%m")
+        if self.redis_setup is None:
+            return {
+                account_id: dict(values)
+                for (key, account_id), values in self._totals.items()
+                if key == period_key
+            }
+
+        client = self.redis_setup.get_async_client()
+        account_ids = [_to_str(account_id) async for account_id in client.sscan_iter(self._accounts_key(period_key))]
+        totals: Dict[str, Dict[str, int]] = {}
+        for offset in range(0, len(account_ids), self.flush_batch_size):
+            batch = account_ids[offset:offset + self.flush_batch_size]
+            async with client.pipeline(transaction=False) as pipe:
+                for account_id in batch:
+                    pipe.hgetall(self._hash_key(period_key, account_id))
+                results = await pipe.execute()
+            for account_id, values in zip(batch, results):
+                if values:
+                    totals[account_id] = {metric: int(values.get(metric, 0)) for metric in USAGE_METRICS}
+        return totals
+
+    def get_pending(self, account_id: str) -> Dict[str, int]:
+        """Retorna os incrementos da conta no período corrente ainda não descarregados"""
+        pending = self._pending
+        period_key = self._current_period_key()
+        return {metric: pending.get((period_key, account_id, metric), 0) for metric in USAGE_METRICS}
+
+    async def get_account_totals(self, account_id: str) -> Dict[str, int]:
+        """
+        Retorna os totais já descarregados da conta no período corrente
+
+        Com Redis, inclui os incrementos de todos os workers que já fizeram flush.
+
+        Args:
+            account_id: ID da conta
+
+        Returns:
+            Dict[str, int]: métrica -> valor
+        """
+        period_key = self._current_period_key()
+        if self.redis_setup is None:
+            values = self._totals.get((period_key, account_id))
+            return dict(values) if values is not None else dict.fromkeys(USAGE_METRICS, 0)
+
+        values = await self.redis_setup.get_async_client().hgetall(self._hash_key(period_key, account_id))
+        return {metric: int(values.get(metric, 0)) for metric in USAGE_METRICS}
+
+    def get_current_period(self) -> Tuple[datetime, datetime]:
+        """Retorna o início e o fim do período corrente"""
+        return self._periods[self._current_period_key()]
+
+    async def rollup(self, period_start: Optional[datetime] = None) -> int:
+        """
+        Consolida os totais de um período em documentos Usage
+
+        Args:
+            period_start: Início do período (padrão: período corrente)
+
+        Returns:
+            int: Número de documentos gravados
+        """
+        if self.repository is None:
+            return 0
+
+        await self.flush()
+        start, end = monthly_period(period_start or datetime.utcnow())
+        totals = await self.get_period_totals(start)
+        usages: List[Usage] = [
+            Usage(
+                id=new_id("usage_"),
+                account_id=account_id,
+                period_start=start,
+                period_end=end,
+                **values
+            )
+            for account_id, values in totals.items()
+        ]
+        written = 0
+        for offset in range(0, len(usages), self.flush_batch_size):
+            written += await self.repository.upsert_many(usages[offset:offset + self.flush_batch_size])
+
+        self.rollups += 1
+        self.last_rollup_documents = written
+        return written
+
+    async def _rollup_dirty_periods(self) -> None:
+        periods, self._dirty_periods = self._dirty_periods, set()
+        for period_key in periods:
+            start, _ = self._periods[period_key]
+            try:
+                await self.rollup(start)
+            except Exception as e:
+                self.rollup_errors += 1
+                self._dirty_periods.add(period_key)
+                logger.warning(f"Falha ao consolidar consumo do período {period_key}: {e}")
+
+    async def _run(self) -> None:
+        next_rollup_at = time.monotonic() + self.rollup_interval_seconds
+        while not self._stopping:
+            try:
+                # Acorda no intervalo ou antes, se a fila atingir max_pending_keys ou no stop()
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                break
+            await self.flush()
+            if self.repository is not None and time.monotonic() >= next_rollup_at:
+                await self._rollup_dirty_periods()
+                next_rollup_at = time.monotonic() + self.rollup_interval_seconds
+
+    async def start(self) -> None:
+        """Inicia o descarregamento periódico"""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Encerra o descarregamento periódico, gravando o que estiver pendente
+
+        O laço não é cancelado: um flush em andamento termina antes do flush final,
+        para que nenhum lote seja perdido no meio da gravação.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._flush_requested.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self.repository is not None:
+            await self._rollup_dirty_periods()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do medidor"""
+        return {
+            "backend": "redis" if self.redis_setup is not None else "memory",
+            "increments": self.increments,
+            "pending_keys": len(self._pending),
+            "flushes": self.flushes,
+            "flushed_keys": self.flushed_keys,
+            "flush_errors": self.flush_errors,
+            "dropped_keys": self.dropped_keys,
+            "last_flush_ms": self.last_flush_ms,
+            "rollups": self.rollups,
+            "rollup_errors": self.rollup_errors,
+            "last_rollup_documents": self.last_rollup_documents
+        }
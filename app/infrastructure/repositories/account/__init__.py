@@ -0,0 +1,10 @@
+"""
+Repositórios de Contas
+"""
+
+from .account_membership_repository import AccountMembershipRepository, InMemoryAccountMembershipRepository
+
+__all__ = [
+    "AccountMembershipRepository",
+    "InMemoryAccountMembershipRepository"
+]
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class AccountMembershipRepository(ABC):
+    """Interface do vínculo usuário -> conta (quem é cobrado pelo consumo do usuário)"""
+
+    @abstractmethod
+    async def get_account_id(self, user_id: str) -> Optional[str]:
+        """Busca a conta do usuário (None: usuário sem conta)"""
+        pass
+
+
+class InMemoryAccountMembershipRepository(AccountMembershipRepository):
+    """Implementação em memória do vínculo usuário -> conta (para desenvolvimento)"""
+
+    def __init__(self):
+        self._accounts: Dict[str, str] = {}
+
+    async def assign(self, user_id: str, account_id: str) -> None:
+        """Associa o usuário a uma conta"""
+        self._accounts[user_id] = account_id
+
+    async def get_account_id(self, user_id: str) -> Optional[str]:
+        """Busca a conta do usuário"""
+        return self._accounts.get(user_id)
@@ -0,0 +1,11 @@
+"""
+Repositórios de Auditoria
+"""
+
+from .audit_log_repository import AuditLogFilter, AuditLogRepository, InMemoryAuditLogRepository
+
+__all__ = [
+    "AuditLogFilter",
+    "AuditLogRepository",
+    "InMemoryAuditLogRepository"
+]
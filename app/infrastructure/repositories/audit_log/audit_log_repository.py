@@ -0,0 +1,158 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+from app.domain.audit_log.audit_log import AuditLog
+
+# Posição do cursor: (created_at, id) do último registro da página anterior
+AuditLogCursor = Tuple[datetime, str]
+
+# Campos que podem ser pedidos na projeção (além de "id", sempre presente)
+AUDIT_LOG_FIELDS = ("account_id", "user_id", "action", "entity_type", "entity_id", "metadata", "created_at")
+
+
+@dataclass(slots=True)
+class AuditLogFilter:
+    """Filtros da consulta de auditoria (None: sem filtro no campo)"""
+    account_id: Optional[str] = None
+    user_id: Optional[str] = None
+    action: Optional[str] = None
+    created_from: Optional[datetime] = None  # inclusivo
+    created_to: Optional[datetime] = None  # exclusivo
+
+
+class AuditLogRepository(ABC):
+    """Interface do repositório de auditoria (somente inserção)"""
+
+    @abstractmethod
+    async def insert_many(self, logs: List[AuditLog]) -> int:
+        """
+        Insere um lote de registros
+
+        Reinserir um registro já gravado (mesmo id) não deve duplicá-lo: o lote
+        pode ser reenviado após uma falha ambígua.
+
+        Args:
+            logs: Registros a inserir
+
+        Returns:
+            int: Número de registros gravados no lote
+        """
+        pass
+
+    @abstractmethod
+    async def list_recent(self, limit: int = 100) -> List[AuditLog]:
+        """Lista os registros mais recentes"""
+        pass
+
+    @abstractmethod
+    async def find_page(
+        self,
+        filters: AuditLogFilter,
+        limit: int,
+        after: Optional[AuditLogCursor] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca uma página de registros, do mais recente ao mais antigo
+
+        A paginação é por chave (keyset): a página seguinte começa logo após
+        `after` na ordem (created_at, id) decrescente, sem skip/offset.
+
+        Args:
+            filters: Filtros da consulta
+            limit: Número máximo de registros
+            after: (created_at, id) do último registro da página anterior
+            fields: Campos a retornar (None: todos); "id" e "created_at" sempre vêm
+
+        Returns:
+            List[Dict[str, Any]]: Registros projetados
+        """
+        pass
+
+    async def iter_batches(
+        self,
+        filters: AuditLogFilter,
+        batch_size: int = 1000,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Percorre todos os registros do filtro em lotes, para exportação
+
+        A implementação padrão encadeia find_page pelo cursor (created_at, id):
+        cada lote é uma consulta limitada, sem offset.
+
+        Yields:
+            List[Dict[str, Any]]: Próximo lote (do mais recente ao mais antigo)
+        """
+        after: Optional[AuditLogCursor] = None
+        while True:
+            batch = await self.find_page(filters, batch_size, after, fields)
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after = (batch[-1]["created_at"], batch[-1]["id"])
+
+
+class InMemoryAuditLogRepository(AuditLogRepository):
+    """Implementação em memória do repositório de auditoria (para desenvolvimento, limitada)"""
+
+    def __init__(self, max_size: int = 10000):
+        self._logs: Deque[AuditLog] = deque(maxlen=max_size)
+        self._ids = set()
+
+    async def insert_many(self, logs: List[AuditLog]) -> int:
+        """Insere um lote de registros (ignora ids já gravados)"""
+        inserted = 0
+        for log in logs:
+            if log.id in self._ids:
+                continue
+            if len(self._logs) == self._logs.maxlen:
+                self._ids.discard(self._logs[0].id)
+            self._logs.append(log)
+            self._ids.add(log.id)
+            inserted += 1
+        return inserted
+
+    async def list_recent(self, limit: int = 100) -> List[AuditLog]:
+        """Lista os registros mais recentes"""
+        return list(self._logs)[-limit:][::-1]
+
+    async def find_page(
+        self,
+        filters: AuditLogFilter,
+        limit: int,
+        after: Optional[AuditLogCursor] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Busca uma página de registros (varredura linear: a fila é limitada a max_size)"""
+        matches = (log for log in self._logs if _matches(log, filters, after))
+        page = heapq.nlargest(limit, matches, key=lambda log: (log.created_at, log.id))
+        return [_project(log, fields) for log in page]
+
+
+def _matches(log: AuditLog, filters: AuditLogFilter, after: Optional[AuditLogCursor]) -> bool:
+    if filters.account_id is not None and log.account_id != filters.account_id:
+        return False
+    if filters.user_id is not None and log.user_id != filters.user_id:
+        return False
+    if filters.action is not None and log.action != filters.action:
+        return False
+    if filters.created_from is not None and log.created_at < filters.created_from:
+        return False
+    if filters.created_to is not None and log.created_at >= filters.created_to:
+        return False
+    return after is None or (log.created_at, log.id) < after
+
+
+def _project(log: AuditLog, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if fields is None:
+        fields = AUDIT_LOG_FIELDS
+    item = {"id": log.id, "created_at": log.created_at}
+    for field in fields:
+        item[field] = getattr(log, field)
+    return item
@@ -0,0 +1,142 @@
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError
+from app.domain.audit_log.audit_log import AuditLog
+from app.infrastructure.database.mongo.setup import MongoSetup
+from .audit_log_repository import AUDIT_LOG_FIELDS, AuditLogCursor, AuditLogFilter, AuditLogRepository
+
+_DUPLICATE_KEY = 11000
+
+
+def _to_document(log: AuditLog) -> Dict[str, Any]:
+    return {
+        "_id": log.id,
+        "account_id": log.account_id,
+        "user_id": log.user_id,
+        "action": log.action,
+        "entity_type": log.entity_type,
+        "entity_id": log.entity_id,
+        "metadata": log.metadata,
+        "created_at": log.created_at
+    }
+
+
+def _from_document(document: Mapping[str, Any]) -> AuditLog:
+    return AuditLog(
+        id=document["_id"],
+        account_id=document.get("account_id"),
+        user_id=document.get("user_id"),
+        action=document["action"],
+        entity_type=document["entity_type"],
+        entity_id=document.get("entity_id"),
+        metadata=document.get("metadata"),
+        created_at=document["created_at"]
+    )
+
+
+def _build_query(filters: AuditLogFilter, after: Optional[AuditLogCursor]) -> Dict[str, Any]:
+    """Igualdades + intervalo em created_at + posição do cursor (todos resolvidos no índice)"""
+    query: Dict[str, Any] = {}
+    for field in ("account_id", "user_id", "action"):
+        value = getattr(filters, field)
+        if value is not None:
+            query[field] = value
+
+    created_at: Dict[str, Any] = {}
+    if filters.created_from is not None:
+        created_at["$gte"] = filters.created_from
+    if filters.created_to is not None:
+        created_at["$lt"] = filters.created_to
+    if created_at:
+        query["created_at"] = created_at
+
+    if after is not None:
+        after_created_at, after_id = after
+        query["$or"] = [
+            {"created_at": {"$lt": after_created_at}},
+            {"created_at": after_created_at, "_id": {"$lt": after_id}}
+        ]
+    return query
+
+
+class MongoAuditLogRepository(AuditLogRepository):
+    """
+    Implementação MongoDB do repositório de auditoria (coleção "audit_logs")
+
+    As consultas ordenam por (created_at, _id) decrescente e usam os índices
+    compostos criados em MongoSetup.create_indexes: campos de igualdade
+    primeiro, depois a ordenação. A página seguinte parte do cursor, então o
+    custo de uma página não depende da profundidade.
+    """
+
+    def __init__(self, mongo_setup: MongoSetup, collection_name: str = "audit_logs"):
+        self.mongo_setup = mongo_setup
+        self.collection_name = collection_name
+
+    def _collection(self):
+        return self.mongo_setup.get_async_collection(self.collection_name)
+
+    async def insert_many(self, logs: List[AuditLog]) -> int:
+        """Insere o lote com insert_many(ordered=False); ids já gravados são ignorados"""
+        if not logs:
+            return 0
+        try:
+            result = await self._collection().insert_many([_to_document(log) for log in logs], ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Reenvio após falha ambígua: duplicatas de _id significam "já gravado"
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != _DUPLICATE_KEY for error in errors):
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def list_recent(self, limit: int = 100) -> List[AuditLog]:
+        """Lista os registros mais recentes (o _id é ordenado pelo tempo)"""
+        cursor = self._collection().find().sort("_id", DESCENDING).limit(limit)
+        return [_from_document(document) async for document in cursor]
+
+    async def find_page(
+        self,
+        filters: AuditLogFilter,
+        limit: int,
+        after: Optional[AuditLogCursor] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Busca uma página por cursor (created_at, _id), trazendo só os campos pedidos"""
+        cursor = self._find(filters, after, fields).limit(limit)
+        items = []
+        async for document in cursor:
+            document["id"] = document.pop("_id")
+            items.append(document)
+        return items
+
+    async def iter_batches(
+        self,
+        filters: AuditLogFilter,
+        batch_size: int = 1000,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Percorre o filtro em um único cursor (getMore de batch_size documentos)"""
+        cursor = self._find(filters, None, fields).batch_size(batch_size)
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for document in cursor:
+                document["id"] = document.pop("_id")
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            # Exportação interrompida (ex.: cliente desconectou): libera o cursor no servidor
+            await cursor.close()
+
+    def _find(self, filters: AuditLogFilter, after: Optional[AuditLogCursor], fields: Optional[Sequence[str]]):
+        projection = dict.fromkeys(fields if fields is not None else AUDIT_LOG_FIELDS, 1)
+        projection["created_at"] = 1
+        return (
+            self._collection()
+            .find(_build_query(filters, after), projection)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        )
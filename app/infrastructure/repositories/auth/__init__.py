@@ -2,8 +2,23 @@
 Repositórios de Autenticação
 """
 
-from .user_repository import UserRepository
+from .user_repository import UserAlreadyExistsError, UserRepository
+from .cached_user_repository import CachedUserRepository
+from .single_flight_repository import SingleFlightUserRepository, SingleFlightAuthSessionRepository
 from .auth_session_repository import AuthSessionRepository
+from .session_sweeper import SessionSweeper
 from .auth_provider_repository import AuthProviderRepository
+from .auth_context_repository import AuthContextRepository, CompositeAuthContextRepository
 
-__all__ = ["UserRepository", "AuthSessionRepository", "AuthProviderRepository"]
+__all__ = [
+    "UserAlreadyExistsError",
+    "UserRepository",
+    "CachedUserRepository",
+    "SingleFlightUserRepository",
+    "SingleFlightAuthSessionRepository",
+    "AuthSessionRepository",
+    "SessionSweeper",
+    "AuthProviderRepository",
+    "AuthContextRepository",
+    "CompositeAuthContextRepository"
+]
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from app.domain.auth.auth_context import AuthContext
+from .user_repository import UserRepository
+from .auth_session_repository import AuthSessionRepository
+
+
+class AuthContextRepository(ABC):
+    """
+    Interface para resolver sessão e usuário de um token em uma única consulta
+    
+    Implementações com backend real devem buscar os dois registros em um
+    único round trip (pipeline/hash no Redis, JOIN no PostgreSQL).
+    """
+    
+    @abstractmethod
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthContext]:
+        """Busca sessão e usuário associados ao token de acesso"""
+        pass
+
+
+class CompositeAuthContextRepository(AuthContextRepository):
+    """Implementação que combina os repositórios de sessão e de usuário"""
+    
+    def __init__(self, session_repository: AuthSessionRepository, user_repository: UserRepository):
+        self.session_repository = session_repository
+        self.user_repository = user_repository
+    
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthContext]:
+        """Busca sessão e usuário associados ao token de acesso"""
+        session = await self.session_repository.get_by_access_token(access_token)
+        if not session:
+            return None
+        
+        user = await self.user_repository.get_by_id(session.user_id)
+        if not user:
+            return None
+        
+        return AuthContext(session=session, user=user)
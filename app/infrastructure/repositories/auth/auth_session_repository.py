@@ -1,6 +1,9 @@
+import heapq
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from app.domain.auth.auth_session import AuthSession
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+from app.domain.auth.auth_session import AuthSession, SessionStatus
+from app.shared.token_digest import token_digest
 
 
 class AuthSessionRepository(ABC):
@@ -18,7 +21,7 @@ class AuthSessionRepository(ABC):
     
     @abstractmethod
     async def get_by_access_token(self, access_token: str) -> Optional[AuthSession]:
-        """Busca sessão por token de acesso"""
+        """Busca sessão por token de acesso (indexada pelo digest do token)"""
         pass
     
     @abstractmethod
@@ -40,17 +43,79 @@ class AuthSessionRepository(ABC):
     async def revoke_user_sessions(self, user_id: str) -> int:
         """Revoga todas as sessões de um usuário"""
         pass
+    
+    async def purge_expired(self, limit: int = 1000) -> int:
+        """
+        Remove até `limit` sessões vencidas ou revogadas
+        
+        Backends com expiração nativa (TTL do Redis, índice TTL do MongoDB) não
+        precisam de varredura e mantêm esta implementação padrão.
+        
+        Args:
+            limit: Máximo de sessões removidas nesta chamada
+            
+        Returns:
+            int: Número de sessões removidas
+        """
+        return 0
 
 
 class InMemoryAuthSessionRepository(AuthSessionRepository):
     """Implementação em memória do repositório de sessões (para desenvolvimento)"""
     
-    def __init__(self):
+    def __init__(self, revoked_retention_seconds: float = 0.0):
         self._sessions: dict[str, AuthSession] = {}
+        self.revoked_retention = timedelta(seconds=revoked_retention_seconds)
+        # Heap (remover_em, id): a varredura só toca sessões vencidas. Entradas antigas
+        # (sessão estendida, revogada ou removida) são descartadas ao saírem do heap
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        # Índices secundários: digest do access token -> id e user_id -> ids
+        self._token_index: dict[bytes, str] = {}
+        self._token_by_id: dict[str, bytes] = {}
+        self._user_index: dict[str, set[str]] = {}
+    
+    def _index(self, session: AuthSession) -> None:
+        digest = session.access_token_digest
+        old_digest = self._token_by_id.get(session.id)
+        if old_digest != digest:
+            if old_digest is not None and self._token_index.get(old_digest) == session.id:
+                del self._token_index[old_digest]
+            self._token_index[digest] = session.id
+            self._token_by_id[session.id] = digest
+        self._user_index.setdefault(session.user_id, set()).add(session.id)
+        self._schedule(session)
+    
+    def _purge_at(self, session: AuthSession) -> datetime:
+        if session.status == SessionStatus.ACTIVE:
+            return session.expires_at
+        return min(session.expires_at, session.updated_at + self.revoked_retention)
+    
+    def _schedule(self, session: AuthSession) -> None:
+        heapq.heappush(self._expiry_heap, (self._purge_at(session), session.id))
+        # Compacta quando as entradas antigas passam a dominar o heap
+        if len(self._expiry_heap) > 2 * len(self._sessions) + 1024:
+            self._expiry_heap = [(self._purge_at(stored), session_id) for session_id, stored in self._sessions.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _unindex(self, session: AuthSession) -> None:
+        digest = self._token_by_id.pop(session.id, None)
+        if digest is not None and self._token_index.get(digest) == session.id:
+            del self._token_index[digest]
+        
+        session_ids = self._user_index.get(session.user_id)
+        if session_ids is not None:
+            session_ids.discard(session.id)
+            if not session_ids:
+                del self._user_index[session.user_id]
     
     async def create(self, session: AuthSession) -> AuthSession:
-        """Cria uma nova sessão"""
-        self._sessions[session.id] = session
+        """Cria uma nova sessão (sem armazenar os tokens em texto claro)"""
+        previous = self._sessions.get(session.id)
+        if previous is not None and previous.user_id != session.user_id:
+            self._unindex(previous)
+        stored = session.without_tokens()
+        self._sessions[session.id] = stored
+        self._index(stored)
         return session
     
     async def get_by_id(self, session_id: str) -> Optional[AuthSession]:
@@ -58,34 +123,65 @@ class InMemoryAuthSessionRepository(AuthSessionRepository):
         return self._sessions.get(session_id)
     
     async def get_by_access_token(self, access_token: str) -> Optional[AuthSession]:
-        """Busca sessão por token de acesso"""
-        for session in self._sessions.values():
-            if session.access_token == access_token:
-                return session
-        return None
+        """Busca sessão por token de acesso (O(1) pelo digest do token)"""
+        session_id = self._token_index.get(token_digest(access_token))
+        if session_id is None:
+            return None
+        return self._sessions.get(session_id)
     
     async def get_by_user_id(self, user_id: str) -> List[AuthSession]:
         """Busca todas as sessões de um usuário"""
-        return [session for session in self._sessions.values() if session.user_id == user_id]
+        return [self._sessions[session_id] for session_id in self._user_index.get(user_id, ())]
     
     async def update(self, session: AuthSession) -> AuthSession:
         """Atualiza uma sessão"""
-        if session.id in self._sessions:
-            self._sessions[session.id] = session
+        previous = self._sessions.get(session.id)
+        if previous is not None:
+            if previous is not session and previous.user_id != session.user_id:
+                self._unindex(previous)
+            stored = session.without_tokens()
+            self._sessions[session.id] = stored
+            self._index(stored)
         return session
     
     async def delete(self, session_id: str) -> bool:
         """Remove uma sessão"""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._unindex(session)
             return True
         return False
     
     async def revoke_user_sessions(self, user_id: str) -> int:
         """Revoga todas as sessões de um usuário"""
         count = 0
-        for session in self._sessions.values():
-            if session.user_id == user_id:
-                session.revoke()
-                count += 1
+        for session_id in self._user_index.get(user_id, ()):
+            session = self._sessions[session_id]
+            session.revoke()
+            self._schedule(session)
+            count += 1
         return count
+    
+    async def purge_expired(self, limit: int = 1000) -> int:
+        """
+        Remove sessões vencidas ou revogadas, em ordem de vencimento
+        
+        Cada chamada retira no máximo `limit` entradas do heap, contando também as
+        antigas (sessão estendida ou já removida): o trabalho por chamada fica em
+        O(limit log n) mesmo com muitas entradas antigas. O que restar sai na
+        próxima chamada.
+        """
+        now = datetime.utcnow()
+        heap = self._expiry_heap
+        purged = 0
+        popped = 0
+        while heap and popped < limit and heap[0][0] <= now:
+            _, session_id = heapq.heappop(heap)
+            popped += 1
+            session = self._sessions.get(session_id)
+            if session is None or self._purge_at(session) > now:
+                continue
+            del self._sessions[session_id]
+            self._unindex(session)
+            purged += 1
+        return purged
@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import aclosing
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.domain.auth.user import User
+from app.infrastructure.database.redis.setup import RedisSetup
+from app.shared.cache import LRUTTLCache
+from .user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+_DATETIME_FIELDS = ("last_login_at", "created_at", "updated_at")
+# Marca de usuário removido no L2: impede que um preenchimento atrasado o ressuscite
+_TOMBSTONE = "-"
+
+
+def _serialize(user: User) -> str:
+    row = user.to_row()
+    for name in _DATETIME_FIELDS:
+        if row[name] is not None:
+            row[name] = row[name].isoformat()
+    return json.dumps(row)
+
+
+def _deserialize(raw: Any) -> User:
+    row = json.loads(_to_str(raw))
+    for name in _DATETIME_FIELDS:
+        if row[name] is not None:
+            row[name] = datetime.fromisoformat(row[name])
+    return User.from_row(row)
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Decorator de cache em dois níveis para qualquer UserRepository
+
+    - L1: LRU com TTL no processo (TTL curto: limita a janela de inconsistência)
+    - L2: Redis no namespace cache:user: (compartilhado entre workers)
+
+    Escritas passam pelo repositório de origem e atualizam o L2 (write-through);
+    cada escrita publica o id do usuário no canal de invalidação para que os
+    demais workers descartem suas cópias L1. Se uma mensagem se perder, o TTL do
+    L1 garante que a mudança (ex.: SUSPENDED) chega a todos em no máximo
+    l1_ttl_seconds.
+
+    Leituras que caem na origem preenchem o L2 só se a chave não existir
+    (SET NX): uma leitura iniciada antes de um update e concluída depois não
+    sobrescreve o valor novo gravado pela escrita. Remoções deixam uma marca
+    (tombstone) no L2 pelo mesmo motivo.
+    """
+
+    def __init__(
+        self,
+        repository: UserRepository,
+        redis_setup: Optional[RedisSetup] = None,
+        namespace: str = "cache:user:",
+        l1_max_size: int = 10000,
+        l1_ttl_seconds: float = 5.0,
+        l2_ttl_seconds: int = 300,
+        early_refresh_beta: float = 1.0
+    ):
+        self.repository = repository
+        self.redis_setup = redis_setup
+        self.namespace = namespace
+        self.channel = f"{namespace}invalidate"
+        self.l2_ttl_seconds = l2_ttl_seconds
+        self.early_refresh_beta = early_refresh_beta
+        self._l1 = LRUTTLCache(max_size=l1_max_size, default_ttl_seconds=l1_ttl_seconds)
+        # Índice L1 email normalizado -> id (mesmo TTL das entradas de usuário)
+        self._l1_email = LRUTTLCache(max_size=l1_max_size, default_ttl_seconds=l1_ttl_seconds)
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._l2_errors = 0
+        self._backend_reads = 0
+        self._invalidations_sent = 0
+        self._invalidations_received = 0
+
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def _client(self):
+        return self.redis_setup.get_async_client()
+
+    def _id_key(self, user_id: str) -> str:
+        return f"{self.namespace}id:{user_id}"
+
+    def _email_key(self, email: str) -> str:
+        return f"{self.namespace}email:{self._normalize_email(email)}"
+
+    def _l1_put(self, user: User, compute_seconds: float = 0.0) -> None:
+        self._l1.set(user.id, replace(user), compute_seconds=compute_seconds)
+        self._l1_email.set(self._normalize_email(user.email), user.id)
+
+    def _l1_get(self, user_id: str) -> Optional[User]:
+        user = self._l1.get(user_id, early_refresh_beta=self.early_refresh_beta)
+        # Cópia: quem chama pode alterar o objeto (ex.: update_last_login) antes do update
+        return replace(user) if user is not None else None
+
+    def _l1_evict(self, user_id: str) -> None:
+        cached = self._l1.peek(user_id)
+        if cached is not None:
+            email = self._normalize_email(cached.email)
+            if self._l1_email.peek(email) == user_id:
+                self._l1_email.delete(email)
+        self._l1.delete(user_id)
+
+    async def _l2_get_by_id(self, user_id: str) -> Optional[User]:
+        if self.redis_setup is None:
+            return None
+        try:
+            raw = await self._client().get(self._id_key(user_id))
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"Cache L2 de usuários indisponível: {e}")
+            return None
+        return self._decode_l2(raw)
+
+    def _decode_l2(self, raw: Any) -> Optional[User]:
+        if raw is None or _to_str(raw) == _TOMBSTONE:
+            self._l2_misses += 1
+            return None
+        self._l2_hits += 1
+        return _deserialize(raw)
+
+    async def _l2_get_id_by_email(self, email: str) -> Optional[str]:
+        if self.redis_setup is None:
+            return None
+        try:
+            user_id = await self._client().get(self._email_key(email))
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"Cache L2 de usuários indisponível: {e}")
+            return None
+        return _to_str(user_id)
+
+    async def _l2_put(self, user: User, previous_email: Optional[str] = None, only_if_absent: bool = False) -> None:
+        """Grava no L2; only_if_absent=True (preenchimento por leitura) nunca sobrescreve uma escrita"""
+        if self.redis_setup is None:
+            return
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(self._id_key(user.id), _serialize(user), ex=self.l2_ttl_seconds, nx=only_if_absent)
+                pipe.set(self._email_key(user.email), user.id, ex=self.l2_ttl_seconds, nx=only_if_absent)
+                if previous_email and self._normalize_email(previous_email) != self._normalize_email(user.email):
+                    pipe.unlink(self._email_key(previous_email))
+                await pipe.execute()
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"Falha ao gravar usuário no cache L2: {e}")
+
+    async def _l2_delete(self, user_id: str, email: Optional[str]) -> None:
+        if self.redis_setup is None:
+            return
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(self._id_key(user_id), _TOMBSTONE, ex=self.l2_ttl_seconds)
+                if email:
+                    pipe.unlink(self._email_key(email))
+                await pipe.execute()
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"Falha ao remover usuário do cache L2: {e}")
+
+    async def _publish_invalidation(self, user_id: str) -> None:
+        if self.redis_setup is None:
+            return
+        try:
+            await self._client().publish(self.channel, f"{self._instance_id}:{user_id}")
+            self._invalidations_sent += 1
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"Falha ao publicar invalidação de usuário: {e}")
+
+    async def _listen(self) -> None:
+        """Descarta do L1 os usuários alterados por outros workers; reconecta em caso de falha"""
+        while True:
+            pubsub = self._client().pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    sender, _, user_id = _to_str(message["data"]).partition(":")
+                    if sender != self._instance_id:
+                        self._l1_evict(user_id)
+                        self._invalidations_received += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Mensagens perdidas durante a reconexão ficam cobertas pelo TTL do L1
+                logger.warning(f"Canal de invalidação de usuários interrompido: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """Inicia a escuta do canal de invalidação (no-op sem Redis)"""
+        if self.redis_setup is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Encerra a escuta do canal de invalidação"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def create(self, user: User) -> User:
+        """Cria o usuário na origem e popula o cache"""
+        created = await self.repository.create(user)
+        self._l1_put(created)
+        await self._l2_put(created)
+        return created
+
+    def get_cached(self, user_id: str) -> Optional[User]:
+        """Busca só no L1 (sem I/O)"""
+        return self._l1_get(user_id)
+
+    def l2_key(self, user_id: str) -> Optional[str]:
+        """Chave do usuário no L2, para lê-la no pipeline de outra consulta (None sem Redis)"""
+        return self._id_key(user_id) if self.redis_setup is not None else None
+
+    async def get_by_id_prefetched(self, user_id: str, l2_raw: Any) -> Optional[User]:
+        """
+        Conclui uma busca por ID cujo valor no L2 já foi lido em um pipeline
+
+        Args:
+            user_id: ID do usuário
+            l2_raw: Resultado do GET em l2_key(user_id)
+
+        Returns:
+            Optional[User]: Usuário do L2 ou, em miss, da origem (preenchendo L1 e L2)
+        """
+        return await self._fill(user_id, self._decode_l2(l2_raw), time.perf_counter())
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        """Busca por ID: L1 -> L2 -> origem"""
+        user = self._l1_get(user_id)
+        if user is not None:
+            return user
+
+        started_at = time.perf_counter()
+        return await self._fill(user_id, await self._l2_get_by_id(user_id), started_at)
+
+    async def _fill(self, user_id: str, user: Optional[User], started_at: float) -> Optional[User]:
+        """Completa um miss do L1: usa o valor do L2 ou lê a origem"""
+        if user is None:
+            self._backend_reads += 1
+            user = await self.repository.get_by_id(user_id)
+            if user is None:
+                return None
+            await self._l2_put(user, only_if_absent=True)
+
+        self._l1_put(user, time.perf_counter() - started_at)
+        return replace(user)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Busca por email: índice email -> id em L1/L2, depois get_by_id"""
+        user_id = self._l1_email.get(self._normalize_email(email))
+        if user_id is None:
+            user_id = await self._l2_get_id_by_email(email)
+
+        if user_id is not None:
+            user = await self.get_by_id(user_id)
+            if user is not None and self._normalize_email(user.email) == self._normalize_email(email):
+                return user
+
+        self._backend_reads += 1
+        user = await self.repository.get_by_email(email)
+        if user is None:
+            return None
+        self._l1_put(user)
+        await self._l2_put(user, only_if_absent=True)
+        return replace(user)
+
+    async def update(self, user: User) -> User:
+        """Atualiza na origem, grava no cache (write-through) e invalida os demais workers"""
+        cached = self._l1.peek(user.id)
+        previous_email = cached.email if cached is not None else None
+        updated = await self.repository.update(user)
+        self._l1_evict(user.id)
+        self._l1_put(updated)
+        await self._l2_put(updated, previous_email)
+        await self._publish_invalidation(user.id)
+        return updated
+
+    async def delete(self, user_id: str) -> bool:
+        """Remove da origem e de todos os níveis de cache"""
+        cached = self._l1.peek(user_id)
+        email = cached.email if cached is not None else None
+        if email is None:
+            user = await self._l2_get_by_id(user_id)
+            email = user.email if user is not None else None
+
+        deleted = await self.repository.delete(user_id)
+        self._l1_evict(user_id)
+        await self._l2_delete(user_id, email)
+        await self._publish_invalidation(user_id)
+        return deleted
+
+    async def list_all(self, limit: int = 100, offset: int = 0) -> List[User]:
+        """Listagem não passa pelo cache"""
+        return await self.repository.list_all(limit, offset)
+
+    async def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[User]]:
+        """Exportação não passa pelo cache"""
+        async with aclosing(self.repository.iter_batches(batch_size)) as batches:
+            async for batch in batches:
+                yield batch
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Métricas por nível: taxa de acerto do L1 e do L2, leituras na origem e invalidações"""
+        l2_lookups = self._l2_hits + self._l2_misses
+        return {
+            "l1": self._l1.get_stats(),
+            "l2": {
+                "enabled": self.redis_setup is not None,
+                "hits": self._l2_hits,
+                "misses": self._l2_misses,
+                "hit_rate": self._l2_hits / l2_lookups if l2_lookups else 0.0,
+                "errors": self._l2_errors
+            },
+            "backend_reads": self._backend_reads,
+            "invalidations_sent": self._invalidations_sent,
+            "invalidations_received": self._invalidations_received
+        }
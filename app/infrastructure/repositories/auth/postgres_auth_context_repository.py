@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy import bindparam, select
+from app.domain.auth.auth_context import AuthContext
+from app.domain.auth.auth_session import AuthSession
+from app.domain.auth.user import User
+from app.infrastructure.database.postgres.setup import PostgreSQLSetup
+from app.infrastructure.database.postgres.tables import auth_sessions_table, users_table
+from app.shared.token_digest import token_digest
+from .auth_context_repository import AuthContextRepository
+
+# Colunas do usuário com prefixo: sessão e usuário têm id, created_at e updated_at
+_USER_PREFIX = "user__"
+
+# Sessão e usuário em uma única consulta (índice único no digest + PK de users)
+_SELECT_CONTEXT = (
+    select(
+        auth_sessions_table,
+        *(column.label(f"{_USER_PREFIX}{column.name}") for column in users_table.c)
+    )
+    .join(users_table, users_table.c.id == auth_sessions_table.c.user_id)
+    .where(auth_sessions_table.c.access_token_digest == bindparam("digest"))
+)
+
+
+class PostgresAuthContextRepository(AuthContextRepository):
+    """Resolve sessão e usuário de um token com um único JOIN no PostgreSQL"""
+
+    def __init__(self, postgres_setup: PostgreSQLSetup):
+        self.postgres_setup = postgres_setup
+
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthContext]:
+        """Busca sessão e usuário associados ao token de acesso"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(_SELECT_CONTEXT, {"digest": token_digest(access_token)})
+            row = result.mappings().first()
+        if row is None:
+            return None
+
+        user_row = {
+            name[len(_USER_PREFIX):]: value
+            for name, value in row.items()
+            if name.startswith(_USER_PREFIX)
+        }
+        return AuthContext(session=AuthSession.from_row(row), user=User.from_row(user_row))
@@ -0,0 +1,73 @@
+from typing import Any, List, Mapping, Optional
+from sqlalchemy import bindparam, delete, insert, select, update
+from app.domain.auth.auth_provider import AuthProvider, AuthProviderType
+from app.infrastructure.database.postgres.setup import PostgreSQLSetup
+from app.infrastructure.database.postgres.tables import auth_providers_table
+from .auth_provider_repository import AuthProviderRepository
+
+
+# Statements construídos uma única vez (compilação em cache no SQLAlchemy e no asyncpg)
+_SELECT_BY_ID = select(auth_providers_table).where(auth_providers_table.c.id == bindparam("provider_id"))
+_SELECT_BY_USER_ID = select(auth_providers_table).where(auth_providers_table.c.user_id == bindparam("user_id"))
+_SELECT_BY_PROVIDER_INFO = select(auth_providers_table).where(
+    auth_providers_table.c.provider_type == bindparam("provider_type"),
+    auth_providers_table.c.provider_id == bindparam("provider_user_id")
+)
+_INSERT = insert(auth_providers_table)
+_UPDATE = update(auth_providers_table).where(auth_providers_table.c.id == bindparam("provider_key"))
+_DELETE = delete(auth_providers_table).where(auth_providers_table.c.id == bindparam("provider_id"))
+
+
+def _from_row(row: Optional[Mapping[str, Any]]) -> Optional[AuthProvider]:
+    return AuthProvider.from_row(row) if row is not None else None
+
+
+class PostgresAuthProviderRepository(AuthProviderRepository):
+    """Implementação PostgreSQL do repositório de provedores (SQLAlchemy assíncrono)"""
+
+    def __init__(self, postgres_setup: PostgreSQLSetup):
+        self.postgres_setup = postgres_setup
+
+    async def create(self, provider: AuthProvider) -> AuthProvider:
+        """Cria um novo provedor"""
+        async with self.postgres_setup.get_async_session() as session:
+            await session.execute(_INSERT, provider.to_row())
+            await session.commit()
+        return provider
+
+    async def get_by_id(self, provider_id: str) -> Optional[AuthProvider]:
+        """Busca provedor por ID"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_SELECT_BY_ID, {"provider_id": provider_id})
+            return _from_row(result.mappings().first())
+
+    async def get_by_user_id(self, user_id: str) -> List[AuthProvider]:
+        """Busca todos os provedores de um usuário"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_SELECT_BY_USER_ID, {"user_id": user_id})
+            return [_from_row(row) for row in result.mappings()]
+
+    async def get_by_provider_info(self, provider_type: AuthProviderType, provider_user_id: str) -> Optional[AuthProvider]:
+        """Busca provedor por tipo e ID do usuário no provedor (índice único)"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(
+                _SELECT_BY_PROVIDER_INFO,
+                {"provider_type": provider_type.value, "provider_user_id": provider_user_id}
+            )
+            return _from_row(result.mappings().first())
+
+    async def update(self, provider: AuthProvider) -> AuthProvider:
+        """Atualiza um provedor"""
+        values = provider.to_row()
+        del values["id"]
+        async with self.postgres_setup.get_async_session() as session:
+            await session.execute(_UPDATE, {"provider_key": provider.id, **values})
+            await session.commit()
+        return provider
+
+    async def delete(self, provider_id: str) -> bool:
+        """Remove um provedor"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_DELETE, {"provider_id": provider_id})
+            await session.commit()
+            return result.rowcount > 0
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Mapping, Optional
+from sqlalchemy import bindparam, delete, insert, or_, select, update
+from app.domain.auth.auth_session import AuthSession, SessionStatus
+from app.infrastructure.database.postgres.setup import PostgreSQLSetup
+from app.infrastructure.database.postgres.tables import auth_sessions_table
+from app.shared.token_digest import token_digest
+from .auth_session_repository import AuthSessionRepository
+
+
+# Statements construídos uma única vez (compilação em cache no SQLAlchemy e no asyncpg)
+_SELECT_BY_ID = select(auth_sessions_table).where(auth_sessions_table.c.id == bindparam("session_id"))
+_SELECT_BY_DIGEST = select(auth_sessions_table).where(
+    auth_sessions_table.c.access_token_digest == bindparam("digest")
+)
+_SELECT_BY_USER_ID = select(auth_sessions_table).where(auth_sessions_table.c.user_id == bindparam("user_id"))
+_INSERT = insert(auth_sessions_table)
+_UPDATE = update(auth_sessions_table).where(auth_sessions_table.c.id == bindparam("session_id"))
+_DELETE = delete(auth_sessions_table).where(auth_sessions_table.c.id == bindparam("session_id"))
+_REVOKE_USER_SESSIONS = (
+    update(auth_sessions_table)
+    .where(
+        auth_sessions_table.c.user_id == bindparam("owner_id"),
+        auth_sessions_table.c.status == SessionStatus.ACTIVE.value
+    )
+    .values(status=SessionStatus.REVOKED.value, updated_at=bindparam("now"))
+)
+# Lote limitado pelo índice de expires_at: a varredura nunca prende a tabela inteira
+_PURGE_EXPIRED = delete(auth_sessions_table).where(
+    auth_sessions_table.c.id.in_(
+        select(auth_sessions_table.c.id)
+        .where(or_(
+            auth_sessions_table.c.expires_at <= bindparam("now"),
+            (auth_sessions_table.c.status != SessionStatus.ACTIVE.value)
+            & (auth_sessions_table.c.updated_at <= bindparam("revoked_before"))
+        ))
+        .limit(bindparam("limit"))
+    )
+)
+
+
+def _from_row(row: Optional[Mapping[str, Any]]) -> Optional[AuthSession]:
+    return AuthSession.from_row(row) if row is not None else None
+
+
+class PostgresAuthSessionRepository(AuthSessionRepository):
+    """
+    Implementação PostgreSQL do repositório de sessões (SQLAlchemy assíncrono)
+
+    Guarda só os digests dos tokens. Sessões vencidas ou revogadas são removidas
+    em lotes por purge_expired (via SessionSweeper).
+    """
+
+    def __init__(self, postgres_setup: PostgreSQLSetup, revoked_retention_seconds: float = 0.0):
+        self.postgres_setup = postgres_setup
+        self.revoked_retention = timedelta(seconds=revoked_retention_seconds)
+
+    async def create(self, session: AuthSession) -> AuthSession:
+        """Cria uma nova sessão"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            await db_session.execute(_INSERT, session.to_row())
+            await db_session.commit()
+        return session
+
+    async def get_by_id(self, session_id: str) -> Optional[AuthSession]:
+        """Busca sessão por ID"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(_SELECT_BY_ID, {"session_id": session_id})
+            return _from_row(result.mappings().first())
+
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthSession]:
+        """Busca sessão por token de acesso (índice único no digest)"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(_SELECT_BY_DIGEST, {"digest": token_digest(access_token)})
+            return _from_row(result.mappings().first())
+
+    async def get_by_user_id(self, user_id: str) -> List[AuthSession]:
+        """Busca todas as sessões de um usuário"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(_SELECT_BY_USER_ID, {"user_id": user_id})
+            return [_from_row(row) for row in result.mappings()]
+
+    async def update(self, session: AuthSession) -> AuthSession:
+        """Atualiza uma sessão"""
+        values = session.to_row()
+        del values["id"]
+        async with self.postgres_setup.get_async_session() as db_session:
+            await db_session.execute(_UPDATE, {"session_id": session.id, **values})
+            await db_session.commit()
+        return session
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove uma sessão"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(_DELETE, {"session_id": session_id})
+            await db_session.commit()
+            return result.rowcount > 0
+
+    async def revoke_user_sessions(self, user_id: str) -> int:
+        """Revoga todas as sessões ativas de um usuário em um único UPDATE"""
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(
+                _REVOKE_USER_SESSIONS,
+                {"owner_id": user_id, "now": datetime.utcnow()}
+            )
+            await db_session.commit()
+            return result.rowcount
+
+    async def purge_expired(self, limit: int = 1000) -> int:
+        """Remove até `limit` sessões vencidas ou revogadas"""
+        now = datetime.utcnow()
+        async with self.postgres_setup.get_async_session() as db_session:
+            result = await db_session.execute(
+                _PURGE_EXPIRED,
+                {"now": now, "revoked_before": now - self.revoked_retention, "limit": limit}
+            )
+            await db_session.commit()
+            return result.rowcount
@@ -0,0 +1,102 @@
+from typing import Any, AsyncIterator, List, Mapping, Optional
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.domain.auth.user import User
+from app.infrastructure.database.postgres.setup import PostgreSQLSetup
+from app.infrastructure.database.postgres.tables import users_table
+from .user_repository import UserAlreadyExistsError, UserRepository
+
+
+# Statements construídos uma única vez: o SQLAlchemy reaproveita a compilação em cache
+# e o asyncpg reaproveita o prepared statement por conexão
+_SELECT_BY_ID = select(users_table).where(users_table.c.id == bindparam("user_id"))
+_SELECT_BY_EMAIL = select(users_table).where(
+    func.lower(users_table.c.email) == func.lower(bindparam("email"))
+)
+_SELECT_PAGE = (
+    select(users_table)
+    .order_by(users_table.c.created_at, users_table.c.id)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+_SELECT_ALL = select(users_table).order_by(users_table.c.created_at, users_table.c.id)
+_INSERT = insert(users_table)
+_UPDATE = update(users_table).where(users_table.c.id == bindparam("user_id"))
+_DELETE = delete(users_table).where(users_table.c.id == bindparam("user_id"))
+
+
+def _from_row(row: Optional[Mapping[str, Any]]) -> Optional[User]:
+    return User.from_row(row) if row is not None else None
+
+
+def _is_email_conflict(error: IntegrityError) -> bool:
+    """Violação do índice único ux_users_email_lower (cadastros concorrentes do mesmo email)"""
+    return "ux_users_email_lower" in str(error.orig)
+
+
+class PostgresUserRepository(UserRepository):
+    """Implementação PostgreSQL do repositório de usuários (SQLAlchemy assíncrono)"""
+
+    def __init__(self, postgres_setup: PostgreSQLSetup):
+        self.postgres_setup = postgres_setup
+
+    async def create(self, user: User) -> User:
+        """Cria um novo usuário"""
+        try:
+            async with self.postgres_setup.get_async_session() as session:
+                await session.execute(_INSERT, user.to_row())
+                await session.commit()
+        except IntegrityError as e:
+            if _is_email_conflict(e):
+                raise UserAlreadyExistsError() from e
+            raise
+        return user
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        """Busca usuário por ID"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_SELECT_BY_ID, {"user_id": user_id})
+            return _from_row(result.mappings().first())
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Busca usuário por email (usa o índice único em lower(email))"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_SELECT_BY_EMAIL, {"email": email.strip()})
+            return _from_row(result.mappings().first())
+
+    async def update(self, user: User) -> User:
+        """Atualiza um usuário"""
+        values = user.to_row()
+        del values["id"]
+        try:
+            async with self.postgres_setup.get_async_session() as session:
+                await session.execute(_UPDATE, {"user_id": user.id, **values})
+                await session.commit()
+        except IntegrityError as e:
+            if _is_email_conflict(e):
+                raise UserAlreadyExistsError() from e
+            raise
+        return user
+
+    async def delete(self, user_id: str) -> bool:
+        """Remove um usuário"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_DELETE, {"user_id": user_id})
+            await session.commit()
+            return result.rowcount > 0
+
+    async def list_all(self, limit: int = 100, offset: int = 0) -> List[User]:
+        """Lista todos os usuários ordenados por data de criação"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.execute(_SELECT_PAGE, {"limit": limit, "offset": offset})
+            return [_from_row(row) for row in result.mappings()]
+
+    async def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[User]]:
+        """Percorre os usuários com um cursor no servidor (yield_per), sem offset"""
+        async with self.postgres_setup.get_async_session() as session:
+            result = await session.stream(_SELECT_ALL.execution_options(yield_per=batch_size))
+            try:
+                async for partition in result.mappings().partitions(batch_size):
+                    yield [User.from_row(row) for row in partition]
+            finally:
+                await result.close()
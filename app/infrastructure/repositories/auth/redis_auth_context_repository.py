@@ -0,0 +1,64 @@
+import asyncio
+from typing import Optional
+from app.domain.auth.auth_context import AuthContext
+from app.domain.auth.services.token_service import TokenService
+from app.shared.token_digest import token_digest
+from .auth_context_repository import AuthContextRepository
+from .cached_user_repository import CachedUserRepository
+from .redis_auth_session_repository import RedisAuthSessionRepository
+from .user_repository import UserRepository
+
+
+class RedisAuthContextRepository(AuthContextRepository):
+    """
+    Resolve sessão (Redis) e usuário em um único round trip
+
+    O user_id vem do próprio token, então as duas chaves são conhecidas antes da
+    consulta: o hash da sessão e a entrada do usuário no L2 (cache:user:id:{user_id})
+    são lidos no mesmo pipeline. Com o usuário no L1 basta o HGETALL da sessão;
+    sem L2 as duas leituras correm em paralelo.
+    """
+
+    def __init__(
+        self,
+        session_repository: RedisAuthSessionRepository,
+        user_repository: UserRepository,
+        user_cache: Optional[CachedUserRepository] = None
+    ):
+        self.session_repository = session_repository
+        self.user_repository = user_repository
+        self.user_cache = user_cache
+
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthContext]:
+        """Busca sessão e usuário associados ao token de acesso"""
+        user_id = TokenService.peek_user_id(access_token)
+        if not user_id:
+            return None
+
+        client = self.session_repository.redis_setup.get_async_client()
+        session_key = self.session_repository.session_key(user_id, token_digest(access_token).hex())
+        user = self.user_cache.get_cached(user_id) if self.user_cache is not None else None
+        l2_key = self.user_cache.l2_key(user_id) if self.user_cache is not None and user is None else None
+
+        if user is not None:
+            session = RedisAuthSessionRepository.deserialize(await client.hgetall(session_key))
+        elif l2_key is not None:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(session_key)
+                pipe.get(l2_key)
+                session_data, l2_raw = await pipe.execute()
+            session = RedisAuthSessionRepository.deserialize(session_data)
+            if session is None:
+                return None
+            # Miss no L2: só então a origem é consultada
+            user = await self.user_cache.get_by_id_prefetched(user_id, l2_raw)
+        else:
+            session_data, user = await asyncio.gather(
+                client.hgetall(session_key),
+                self.user_repository.get_by_id(user_id)
+            )
+            session = RedisAuthSessionRepository.deserialize(session_data)
+
+        if session is None or user is None or session.user_id != user.id:
+            return None
+        return AuthContext(session=session, user=user)
@@ -0,0 +1,216 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.domain.auth.auth_session import AuthSession, SessionStatus
+from app.domain.auth.services.token_service import TokenService
+from app.infrastructure.database.redis.setup import RedisSetup
+from app.shared.token_digest import token_digest
+from .auth_session_repository import AuthSessionRepository
+
+
+# Revoga as sessões ativas do usuário e limpa do índice os digests cujas sessões expiraram.
+# Todas as chaves chegam por KEYS (mesmo slot pelo hash tag {user_id}):
+# KEYS[1] = índice do usuário; KEYS[i] (i >= 2) = hash da sessão cujo digest é ARGV[i + 1]
+_REVOKE_USER_SESSIONS_SCRIPT = """
+local revoked = 0
+for i = 2, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        redis.call('HSET', KEYS[i], 'status', ARGV[1], 'updated_at', ARGV[2])
+        revoked = revoked + 1
+    else
+        redis.call('SREM', KEYS[1], ARGV[i + 1])
+    end
+end
+return revoked
+"""
+
+
+_DATETIME_FIELDS = ("expires_at", "created_at", "updated_at")
+
+
+def _to_str(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisAuthSessionRepository(AuthSessionRepository):
+    """
+    Implementação Redis do repositório de sessões
+
+    Layout das chaves (namespace "session:"; o hash tag {user_id} põe as chaves
+    de um usuário no mesmo slot do Redis Cluster):
+    - session:{user_id}:{digest}  hash com os dados da sessão (só digests, nunca os
+                                  tokens), indexado pelo digest do access token;
+                                  TTL acompanha expires_at
+    - session:{user_id}:index     set com os digests das sessões do usuário
+    - session:id:{id}             localizador "digest:user_id" para as buscas por ID
+
+    A busca por token (caminho quente) é um único HGETALL: o user_id sai do próprio
+    token e o digest, do token inteiro. Scripts Lua recebem todas as chaves que
+    tocam via KEYS.
+    """
+
+    def __init__(self, redis_setup: RedisSetup, namespace: str = "session:"):
+        self.redis_setup = redis_setup
+        self.namespace = namespace
+        self._revoke_script = None
+
+    def _client(self):
+        return self.redis_setup.get_async_client()
+
+    def session_key(self, user_id: str, access_token_digest_hex: str) -> str:
+        """Chave do hash da sessão (pública para leituras em pipeline, ex.: contexto de autenticação)"""
+        return f"{self.namespace}{{{user_id}}}:{access_token_digest_hex}"
+
+    def session_key_for_token(self, access_token: str) -> Optional[str]:
+        """Chave do hash da sessão de um token de acesso (None se o token não traz user_id)"""
+        user_id = TokenService.peek_user_id(access_token)
+        if not user_id:
+            return None
+        return self.session_key(user_id, token_digest(access_token).hex())
+
+    def _index_key(self, user_id: str) -> str:
+        return f"{self.namespace}{{{user_id}}}:index"
+
+    def _locator_key(self, session_id: str) -> str:
+        return f"{self.namespace}id:{session_id}"
+
+    async def _locate(self, session_id: str) -> Optional[Tuple[str, str]]:
+        """Retorna (digest, user_id) da sessão a partir do localizador"""
+        locator = await self._client().get(self._locator_key(session_id))
+        if locator is None:
+            return None
+        digest_hex, user_id = _to_str(locator).split(":", 1)
+        return digest_hex, user_id
+
+    @staticmethod
+    def _ttl_seconds(session: AuthSession) -> int:
+        remaining = (session.expires_at - datetime.utcnow()).total_seconds()
+        return max(1, math.ceil(remaining))
+
+    @staticmethod
+    def _serialize(session: AuthSession) -> Dict[str, str]:
+        row = session.to_row()
+        row["access_token_digest"] = session.access_token_digest.hex()
+        row["refresh_token_digest"] = session.refresh_token_digest.hex()
+        for name in _DATETIME_FIELDS:
+            row[name] = row[name].isoformat()
+        return row
+
+    @staticmethod
+    def deserialize(data: Dict[Any, Any]) -> Optional[AuthSession]:
+        """Reconstrói a sessão a partir do resultado de um HGETALL (None se vazio)"""
+        if not data:
+            return None
+
+        row = {_to_str(key): _to_str(value) for key, value in data.items()}
+        row["access_token_digest"] = bytes.fromhex(row["access_token_digest"])
+        row["refresh_token_digest"] = bytes.fromhex(row["refresh_token_digest"])
+        for name in _DATETIME_FIELDS:
+            row[name] = datetime.fromisoformat(row[name])
+        return AuthSession.from_row(row)
+
+    def _write(self, pipe, session: AuthSession) -> None:
+        """Enfileira no pipeline a gravação da sessão e de seus índices"""
+        ttl = self._ttl_seconds(session)
+        digest_hex = session.access_token_digest.hex()
+        session_key = self.session_key(session.user_id, digest_hex)
+        index_key = self._index_key(session.user_id)
+
+        pipe.hset(session_key, mapping=self._serialize(session))
+        pipe.expire(session_key, ttl)
+        pipe.sadd(index_key, digest_hex)
+        # O índice do usuário vive tanto quanto a sessão mais longa
+        pipe.expire(index_key, ttl, nx=True)
+        pipe.expire(index_key, ttl, gt=True)
+        pipe.set(self._locator_key(session.id), f"{digest_hex}:{session.user_id}", ex=ttl)
+
+    def _pipeline(self):
+        # O localizador fica em outro slot: pipeline sem MULTI (compatível com Redis Cluster)
+        return self._client().pipeline(transaction=False)
+
+    async def create(self, session: AuthSession) -> AuthSession:
+        """Cria uma nova sessão"""
+        async with self._pipeline() as pipe:
+            self._write(pipe, session)
+            await pipe.execute()
+        return session
+
+    async def get_by_id(self, session_id: str) -> Optional[AuthSession]:
+        """Busca sessão por ID (localizador + hash)"""
+        location = await self._locate(session_id)
+        if location is None:
+            return None
+        digest_hex, user_id = location
+        return self.deserialize(await self._client().hgetall(self.session_key(user_id, digest_hex)))
+
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthSession]:
+        """Busca sessão por token de acesso (um único HGETALL)"""
+        session_key = self.session_key_for_token(access_token)
+        if session_key is None:
+            return None
+        return self.deserialize(await self._client().hgetall(session_key))
+
+    async def get_by_user_id(self, user_id: str) -> List[AuthSession]:
+        """Busca todas as sessões de um usuário"""
+        client = self._client()
+        digests = [_to_str(digest_hex) for digest_hex in await client.smembers(self._index_key(user_id))]
+        if not digests:
+            return []
+
+        async with client.pipeline(transaction=False) as pipe:
+            for digest_hex in digests:
+                pipe.hgetall(self.session_key(user_id, digest_hex))
+            results = await pipe.execute()
+
+        sessions = [self.deserialize(data) for data in results]
+        return [session for session in sessions if session is not None]
+
+    async def update(self, session: AuthSession) -> AuthSession:
+        """Atualiza uma sessão (se o token mudou, a chave antiga é removida)"""
+        location = await self._locate(session.id)
+        if location is not None:
+            previous_digest_hex, previous_user_id = location
+            async with self._pipeline() as pipe:
+                if (previous_digest_hex, previous_user_id) != (session.access_token_digest.hex(), session.user_id):
+                    pipe.delete(self.session_key(previous_user_id, previous_digest_hex))
+                    pipe.srem(self._index_key(previous_user_id), previous_digest_hex)
+                self._write(pipe, session)
+                await pipe.execute()
+        return session
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove uma sessão"""
+        location = await self._locate(session_id)
+        if location is None:
+            return False
+
+        digest_hex, user_id = location
+        async with self._pipeline() as pipe:
+            pipe.delete(self.session_key(user_id, digest_hex))
+            pipe.srem(self._index_key(user_id), digest_hex)
+            pipe.delete(self._locator_key(session_id))
+            await pipe.execute()
+        return True
+
+    async def revoke_user_sessions(self, user_id: str) -> int:
+        """
+        Revoga todas as sessões de um usuário
+
+        Lê o índice e revoga as sessões listadas em um script atômico. Uma sessão
+        criada entre as duas etapas não é revogada; para "sair de todos os
+        dispositivos" a época de sessão (SessionEpochRepository) cobre esse caso.
+        """
+        client = self._client()
+        index_key = self._index_key(user_id)
+        digests = [_to_str(digest_hex) for digest_hex in await client.smembers(index_key)]
+        if not digests:
+            return 0
+
+        if self._revoke_script is None:
+            self._revoke_script = client.register_script(_REVOKE_USER_SESSIONS_SCRIPT)
+
+        revoked = await self._revoke_script(
+            keys=[index_key, *(self.session_key(user_id, digest_hex) for digest_hex in digests)],
+            args=[SessionStatus.REVOKED.value, datetime.utcnow().isoformat(), *digests]
+        )
+        return int(revoked)
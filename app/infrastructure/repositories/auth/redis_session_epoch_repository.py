@@ -0,0 +1,27 @@
+from app.infrastructure.database.redis.setup import RedisSetup
+from .session_epoch_repository import SessionEpochRepository
+
+
+class RedisSessionEpochRepository(SessionEpochRepository):
+    """
+    Implementação Redis do repositório de épocas de sessão
+    
+    Cada usuário tem um contador em session:epoch:{user_id}; o INCR é atômico
+    e visível imediatamente para todos os workers.
+    """
+    
+    def __init__(self, redis_setup: RedisSetup, namespace: str = "session:"):
+        self.redis_setup = redis_setup
+        self.namespace = namespace
+    
+    def _epoch_key(self, user_id: str) -> str:
+        return f"{self.namespace}epoch:{user_id}"
+    
+    async def get_epoch(self, user_id: str) -> int:
+        """Retorna a época atual do usuário (0 se nunca incrementada)"""
+        value = await self.redis_setup.get_async_client().get(self._epoch_key(user_id))
+        return int(value) if value is not None else 0
+    
+    async def bump_epoch(self, user_id: str) -> int:
+        """Incrementa a época do usuário e retorna o novo valor"""
+        return int(await self.redis_setup.get_async_client().incr(self._epoch_key(user_id)))
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+
+
+class SessionEpochRepository(ABC):
+    """
+    Interface do repositório de épocas de sessão por usuário
+    
+    Todo token carrega a época vigente do usuário na emissão; incrementar a
+    época invalida de uma vez todos os tokens emitidos anteriormente.
+    """
+    
+    @abstractmethod
+    async def get_epoch(self, user_id: str) -> int:
+        """Retorna a época atual do usuário (0 se nunca incrementada)"""
+        pass
+    
+    @abstractmethod
+    async def bump_epoch(self, user_id: str) -> int:
+        """Incrementa a época do usuário e retorna o novo valor"""
+        pass
+
+
+class InMemorySessionEpochRepository(SessionEpochRepository):
+    """Implementação em memória do repositório de épocas (para desenvolvimento)"""
+    
+    def __init__(self):
+        self._epochs: dict[str, int] = {}
+    
+    async def get_epoch(self, user_id: str) -> int:
+        """Retorna a época atual do usuário (0 se nunca incrementada)"""
+        return self._epochs.get(user_id, 0)
+    
+    async def bump_epoch(self, user_id: str) -> int:
+        """Incrementa a época do usuário e retorna o novo valor"""
+        epoch = self._epochs.get(user_id, 0) + 1
+        self._epochs[user_id] = epoch
+        return epoch
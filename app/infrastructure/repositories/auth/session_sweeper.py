@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from .auth_session_repository import AuthSessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """
+    Tarefa de fundo que remove sessões vencidas ou revogadas
+
+    A cada intervalo, chama `purge_expired` em lotes limitados, devolvendo o
+    controle ao event loop entre um lote e outro: uma varredura grande nunca
+    bloqueia as requisições em andamento. Backends com expiração nativa
+    (Redis, MongoDB com índice TTL) retornam 0 e a varredura é imediata.
+    """
+
+    def __init__(
+        self,
+        repository: AuthSessionRepository,
+        interval_seconds: float = 60.0,
+        batch_size: int = 500,
+        max_batches_per_run: int = 100
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser maior que zero")
+
+        self.repository = repository
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches_per_run = max_batches_per_run
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.purged = 0
+        self.errors = 0
+        self.last_run_ms = 0.0
+        self.last_purged = 0
+
+    async def sweep(self) -> int:
+        """
+        Executa uma varredura completa (limitada a max_batches_per_run lotes)
+
+        Returns:
+            int: Número de sessões removidas
+        """
+        started_at = time.perf_counter()
+        purged = 0
+        for _ in range(self.max_batches_per_run):
+            removed = await self.repository.purge_expired(self.batch_size)
+            purged += removed
+            if removed < self.batch_size:
+                break
+            # Cede o event loop entre lotes
+            await asyncio.sleep(0)
+
+        self.runs += 1
+        self.purged += purged
+        self.last_purged = purged
+        self.last_run_ms = round((time.perf_counter() - started_at) * 1000, 3)
+        return purged
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                purged = await self.sweep()
+                if purged:
+                    logger.debug("Varredura de sessões removeu %s sessões em %s ms", purged, self.last_run_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Falha na varredura de sessões expiradas: {e}")
+
+    async def start(self) -> None:
+        """Inicia a varredura periódica (no-op com intervalo <= 0)"""
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Encerra a varredura periódica"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas da varredura"""
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "purged": self.purged,
+            "last_purged": self.last_purged,
+            "last_run_ms": self.last_run_ms,
+            "errors": self.errors
+        }
@@ -0,0 +1,143 @@
+import copy
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.domain.auth.auth_session import AuthSession
+from app.domain.auth.user import User
+from app.shared.single_flight import SingleFlight
+from app.shared.token_digest import token_digest
+from .auth_session_repository import AuthSessionRepository
+from .user_repository import UserRepository
+
+
+def _copy(entity: Optional[Any]) -> Optional[Any]:
+    # Cada chamador recebe sua cópia: o resultado é compartilhado entre as chamadas agrupadas
+    return copy.copy(entity) if entity is not None else None
+
+
+class SingleFlightUserRepository(UserRepository):
+    """
+    Decorator que agrupa buscas concorrentes idênticas de usuários
+
+    Centenas de validações simultâneas do mesmo usuário (ex.: após expirar um
+    cache) resultam em uma única consulta ao repositório de origem.
+    """
+
+    def __init__(self, repository: UserRepository, single_flight: Optional[SingleFlight] = None):
+        self.repository = repository
+        self.single_flight = single_flight or SingleFlight()
+
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def _forget(self, user: User) -> None:
+        self.single_flight.forget(("id", user.id))
+        self.single_flight.forget(("email", self._normalize_email(user.email)))
+
+    async def create(self, user: User) -> User:
+        """Cria um novo usuário"""
+        created = await self.repository.create(user)
+        self._forget(created)
+        return created
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        """Busca usuário por ID (agrupando chamadas concorrentes)"""
+        user = await self.single_flight.do(("id", user_id), lambda: self.repository.get_by_id(user_id))
+        return _copy(user)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Busca usuário por email (agrupando chamadas concorrentes)"""
+        user = await self.single_flight.do(
+            ("email", self._normalize_email(email)),
+            lambda: self.repository.get_by_email(email)
+        )
+        return _copy(user)
+
+    async def update(self, user: User) -> User:
+        """Atualiza um usuário; buscas em andamento não são reaproveitadas depois da escrita"""
+        updated = await self.repository.update(user)
+        self._forget(updated)
+        return updated
+
+    async def delete(self, user_id: str) -> bool:
+        """Remove um usuário"""
+        deleted = await self.repository.delete(user_id)
+        self.single_flight.forget(("id", user_id))
+        return deleted
+
+    async def list_all(self, limit: int = 100, offset: int = 0) -> List[User]:
+        """Lista todos os usuários"""
+        return await self.repository.list_all(limit, offset)
+
+    async def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[User]]:
+        """Percorre todos os usuários em lotes (sem agrupamento)"""
+        async with aclosing(self.repository.iter_batches(batch_size)) as batches:
+            async for batch in batches:
+                yield batch
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de agrupamento"""
+        return self.single_flight.get_stats()
+
+
+class SingleFlightAuthSessionRepository(AuthSessionRepository):
+    """Decorator que agrupa buscas concorrentes idênticas de sessões"""
+
+    def __init__(self, repository: AuthSessionRepository, single_flight: Optional[SingleFlight] = None):
+        self.repository = repository
+        self.single_flight = single_flight or SingleFlight()
+
+    def _forget(self, session: AuthSession) -> None:
+        self.single_flight.forget(("id", session.id))
+        self.single_flight.forget(("token", session.access_token_digest))
+        self.single_flight.forget(("user", session.user_id))
+
+    async def create(self, session: AuthSession) -> AuthSession:
+        """Cria uma nova sessão"""
+        created = await self.repository.create(session)
+        self._forget(created)
+        return created
+
+    async def get_by_id(self, session_id: str) -> Optional[AuthSession]:
+        """Busca sessão por ID (agrupando chamadas concorrentes)"""
+        session = await self.single_flight.do(("id", session_id), lambda: self.repository.get_by_id(session_id))
+        return _copy(session)
+
+    async def get_by_access_token(self, access_token: str) -> Optional[AuthSession]:
+        """Busca sessão por token de acesso (agrupando chamadas concorrentes pelo digest)"""
+        session = await self.single_flight.do(
+            ("token", token_digest(access_token)),
+            lambda: self.repository.get_by_access_token(access_token)
+        )
+        return _copy(session)
+
+    async def get_by_user_id(self, user_id: str) -> List[AuthSession]:
+        """Busca todas as sessões de um usuário (agrupando chamadas concorrentes)"""
+        sessions = await self.single_flight.do(("user", user_id), lambda: self.repository.get_by_user_id(user_id))
+        return [copy.copy(session) for session in sessions]
+
+    async def update(self, session: AuthSession) -> AuthSession:
+        """Atualiza uma sessão"""
+        updated = await self.repository.update(session)
+        self._forget(updated)
+        return updated
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove uma sessão"""
+        deleted = await self.repository.delete(session_id)
+        self.single_flight.forget(("id", session_id))
+        return deleted
+
+    async def revoke_user_sessions(self, user_id: str) -> int:
+        """Revoga todas as sessões de um usuário"""
+        revoked = await self.repository.revoke_user_sessions(user_id)
+        self.single_flight.forget(("user", user_id))
+        return revoked
+
+    async def purge_expired(self, limit: int = 1000) -> int:
+        """Remove sessões vencidas ou revogadas no repositório de origem"""
+        return await self.repository.purge_expired(limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de agrupamento"""
+        return self.single_flight.get_stats()
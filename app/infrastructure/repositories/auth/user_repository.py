@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from itertools import islice
+from typing import AsyncIterator, Optional, List
 from app.domain.auth.user import User
 
 
+class UserAlreadyExistsError(ValueError):
+    """Lançado quando o email (sem diferenciar maiúsculas/minúsculas) já pertence a outro usuário"""
+    
+    def __init__(self):
+        super().__init__("Usuário já existe com este email")
+
+
 class UserRepository(ABC):
     """Interface do repositório de usuários"""
     
     @abstractmethod
     async def create(self, user: User) -> User:
-        """Cria um novo usuário"""
+        """
+        Cria um novo usuário
+        
+        Raises:
+            UserAlreadyExistsError: Se o email já estiver em uso
+        """
         pass
     
     @abstractmethod
@@ -35,6 +48,27 @@ class UserRepository(ABC):
     async def list_all(self, limit: int = 100, offset: int = 0) -> List[User]:
         """Lista todos os usuários"""
         pass
+    
+    async def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[User]]:
+        """
+        Percorre todos os usuários em lotes, para exportação
+        
+        A implementação padrão pagina com list_all; backends com cursor no
+        servidor devem sobrescrever para não repetir o offset a cada lote.
+        
+        Args:
+            batch_size: Usuários por lote
+            
+        Yields:
+            List[User]: Próximo lote (ordem de criação)
+        """
+        offset = 0
+        while True:
+            batch = await self.list_all(batch_size, offset)
+            if not batch:
+                return
+            yield batch
+            offset += len(batch)
 
 
 class InMemoryUserRepository(UserRepository):
@@ -42,10 +76,35 @@ class InMemoryUserRepository(UserRepository):
     
     def __init__(self):
         self._users: dict[str, User] = {}
+        # Índice secundário: email normalizado -> id (e o inverso, para manter consistência)
+        self._email_index: dict[str, str] = {}
+        self._email_by_id: dict[str, str] = {}
+    
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return email.strip().lower()
+    
+    def _check_email_available(self, user: User) -> None:
+        owner = self._email_index.get(self._normalize_email(user.email))
+        if owner is not None and owner != user.id:
+            raise UserAlreadyExistsError()
+    
+    def _index_email(self, user: User) -> None:
+        old_email = self._email_by_id.get(user.id)
+        new_email = self._normalize_email(user.email)
+        if old_email == new_email:
+            return
+        
+        if old_email is not None and self._email_index.get(old_email) == user.id:
+            del self._email_index[old_email]
+        self._email_index[new_email] = user.id
+        self._email_by_id[user.id] = new_email
     
     async def create(self, user: User) -> User:
-        """Cria um novo usuário"""
+        """Cria um novo usuário (rejeita email duplicado, como o índice único do PostgreSQL)"""
+        self._check_email_available(user)
         self._users[user.id] = user
+        self._index_email(user)
         return user
     
     async def get_by_id(self, user_id: str) -> Optional[User]:
@@ -53,26 +112,45 @@ class InMemoryUserRepository(UserRepository):
         return self._users.get(user_id)
     
     async def get_by_email(self, email: str) -> Optional[User]:
-        """Busca usuário por email"""
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        """Busca usuário por email (sem diferenciar maiúsculas/minúsculas)"""
+        user_id = self._email_index.get(self._normalize_email(email))
+        if user_id is None:
+            return None
+        return self._users.get(user_id)
     
     async def update(self, user: User) -> User:
         """Atualiza um usuário"""
         if user.id in self._users:
+            self._check_email_available(user)
             self._users[user.id] = user
+            self._index_email(user)
         return user
     
     async def delete(self, user_id: str) -> bool:
         """Remove um usuário"""
         if user_id in self._users:
             del self._users[user_id]
+            email = self._email_by_id.pop(user_id, None)
+            if email is not None and self._email_index.get(email) == user_id:
+                del self._email_index[email]
             return True
         return False
     
     async def list_all(self, limit: int = 100, offset: int = 0) -> List[User]:
-        """Lista todos os usuários"""
-        users = list(self._users.values())
-        return users[offset:offset + limit]
+        """Lista todos os usuários em ordem de inserção, sem copiar o dicionário inteiro"""
+        return list(islice(self._users.values(), offset, offset + limit))
+    
+    async def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[User]]:
+        """
+        Percorre os usuários em lotes com islice, como list_all (memória O(batch_size))
+        
+        Cada lote abre um novo iterador: um iterador mantido entre os yields falharia
+        se um cadastro alterasse o dicionário durante a exportação.
+        """
+        offset = 0
+        while True:
+            batch = list(islice(self._users.values(), offset, offset + batch_size))
+            if not batch:
+                return
+            yield batch
+            offset += len(batch)
@@ -0,0 +1,10 @@
+"""
+Repositórios de Planos
+"""
+
+from .plan_repository import PlanRepository, InMemoryPlanRepository
+
+__all__ = [
+    "PlanRepository",
+    "InMemoryPlanRepository"
+]
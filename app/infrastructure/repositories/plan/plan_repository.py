@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from app.domain.plan.plan import Plan
+
+
+class PlanRepository(ABC):
+    """Interface do repositório de planos"""
+
+    @abstractmethod
+    async def get_by_id(self, plan_id: str) -> Optional[Plan]:
+        """Busca plano por ID"""
+        pass
+
+    @abstractmethod
+    async def get_by_account(self, account_id: str) -> Optional[Plan]:
+        """Busca o plano vigente da conta (via assinatura)"""
+        pass
+
+
+class InMemoryPlanRepository(PlanRepository):
+    """Implementação em memória do repositório de planos (para desenvolvimento)"""
+
+    def __init__(self, default_plan_id: Optional[str] = None):
+        self._plans: Dict[str, Plan] = {}
+        # Assinatura vigente: account_id -> plan_id
+        self._account_plans: Dict[str, str] = {}
+        self.default_plan_id = default_plan_id
+
+    async def save(self, plan: Plan) -> Plan:
+        """Cria ou atualiza um plano"""
+        self._plans[plan.id] = plan
+        return plan
+
+    async def assign(self, account_id: str, plan_id: str) -> None:
+        """Associa a conta a um plano"""
+        self._account_plans[account_id] = plan_id
+
+    async def get_by_id(self, plan_id: str) -> Optional[Plan]:
+        """Busca plano por ID"""
+        return self._plans.get(plan_id)
+
+    async def get_by_account(self, account_id: str) -> Optional[Plan]:
+        """Busca o plano da conta (ou o plano padrão, se configurado)"""
+        plan_id = self._account_plans.get(account_id, self.default_plan_id)
+        return self._plans.get(plan_id) if plan_id is not None else None
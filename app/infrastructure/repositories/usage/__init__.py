@@ -0,0 +1,10 @@
+"""
+Repositórios de Consumo
+"""
+
+from .usage_repository import UsageRepository, InMemoryUsageRepository
+
+__all__ = [
+    "UsageRepository",
+    "InMemoryUsageRepository"
+]
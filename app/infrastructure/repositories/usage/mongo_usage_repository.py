@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any, List, Mapping, Optional
+from pymongo import UpdateOne
+from app.domain.usage.usage import USAGE_METRICS, Usage
+from app.infrastructure.database.mongo.setup import MongoSetup
+from app.shared.id_generator import new_id
+from .usage_repository import UsageRepository
+
+
+def _from_document(document: Optional[Mapping[str, Any]]) -> Optional[Usage]:
+    if document is None:
+        return None
+
+    return Usage(
+        id=document["_id"],
+        account_id=document["account_id"],
+        period_start=document["period_start"],
+        period_end=document["period_end"],
+        messages_count=document.get("messages_count", 0),
+        groups_count=document.get("groups_count", 0),
+        storage_bytes=document.get("storage_bytes", 0)
+    )
+
+
+class MongoUsageRepository(UsageRepository):
+    """
+    Implementação MongoDB do repositório de consumo (coleção "usage")
+
+    Índice único (account_id, period_start): a consolidação é um upsert
+    idempotente, que pode ser repetido sem duplicar documentos.
+    """
+
+    def __init__(self, mongo_setup: MongoSetup, collection_name: str = "usage"):
+        self.mongo_setup = mongo_setup
+        self.collection_name = collection_name
+
+    def _collection(self):
+        return self.mongo_setup.get_async_collection(self.collection_name)
+
+    async def upsert_many(self, usages: List[Usage]) -> int:
+        """Grava os totais em um único bulk_write não ordenado"""
+        if not usages:
+            return 0
+
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"account_id": usage.account_id, "period_start": usage.period_start},
+                {
+                    "$set": {
+                        "period_end": usage.period_end,
+                        **{metric: getattr(usage, metric) for metric in USAGE_METRICS},
+                        "updated_at": now
+                    },
+                    "$setOnInsert": {"_id": usage.id or new_id("usage_")}
+                },
+                upsert=True
+            )
+            for usage in usages
+        ]
+        await self._collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def get_by_account_period(self, account_id: str, period_start: datetime) -> Optional[Usage]:
+        """Busca o consumo de uma conta em um período"""
+        document = await self._collection().find_one({"account_id": account_id, "period_start": period_start})
+        return _from_document(document)
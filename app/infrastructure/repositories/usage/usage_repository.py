@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.domain.usage.usage import Usage
+
+
+class UsageRepository(ABC):
+    """Interface do repositório de consumo (um documento por conta e período)"""
+
+    @abstractmethod
+    async def upsert_many(self, usages: List[Usage]) -> int:
+        """
+        Grava os totais de cada conta/período, substituindo os valores anteriores
+
+        Args:
+            usages: Totais consolidados
+
+        Returns:
+            int: Número de documentos gravados
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_account_period(self, account_id: str, period_start: datetime) -> Optional[Usage]:
+        """Busca o consumo de uma conta em um período"""
+        pass
+
+
+class InMemoryUsageRepository(UsageRepository):
+    """Implementação em memória do repositório de consumo (para desenvolvimento)"""
+
+    def __init__(self):
+        self._usages: Dict[Tuple[str, datetime], Usage] = {}
+
+    async def upsert_many(self, usages: List[Usage]) -> int:
+        """Grava os totais de cada conta/período (o id do primeiro registro é mantido)"""
+        for usage in usages:
+            key = (usage.account_id, usage.period_start)
+            existing = self._usages.get(key)
+            self._usages[key] = replace(usage, id=existing.id) if existing is not None else usage
+        return len(usages)
+
+    async def get_by_account_period(self, account_id: str, period_start: datetime) -> Optional[Usage]:
+        """Busca o consumo de uma conta em um período"""
+        return self._usages.get((account_id, period_start))
@@ -0,0 +1,7 @@
+"""
+Interface de Auditoria
+"""
+
+from .audit_log_controller import audit_log_router
+
+__all__ = ["audit_log_router"]
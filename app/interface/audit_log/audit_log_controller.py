@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from app.aplication.audit_log.audit_log_query_use_case import AuditLogQueryUseCase
+from app.interface.auth.auth_middleware import AuthMiddleware
+from app.interface.dependencies import get_audit_log_query_use_case
+from app.interface.streaming import ndjson_response
+
+
+# Router de auditoria (respostas serializadas com orjson)
+audit_log_router = APIRouter(prefix="/api/v1", tags=["Audit"], default_response_class=ORJSONResponse)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+
+def _audit_response(success: bool, message: str, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> ORJSONResponse:
+    return ORJSONResponse({"success": success, "message": message, "data": data, "error": error})
+
+
+@audit_log_router.get("/audit-logs")
+async def list_audit_logs(
+    account_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: int = Query(AuditLogQueryUseCase.DEFAULT_LIMIT, ge=1, le=AuditLogQueryUseCase.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (ex.: action,user_id)"),
+    current_user: dict = Depends(AuthMiddleware.require_role("admin")),
+    audit_log_query_use_case: AuditLogQueryUseCase = Depends(get_audit_log_query_use_case)
+):
+    """
+    Consulta dos registros de auditoria (somente admin)
+    
+    Ordenação do mais recente ao mais antigo. A paginação é por cursor: envie o
+    next_cursor da resposta para obter a página seguinte (None na última).
+    """
+    try:
+        result = await audit_log_query_use_case.execute(
+            account_id=account_id,
+            user_id=user_id,
+            action=action,
+            created_from=created_from,
+            created_to=created_to,
+            limit=limit,
+            cursor=cursor,
+            fields=_parse_fields(fields)
+        )
+        return _audit_response(success=True, message="Registros de auditoria", data=result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
+@audit_log_router.get("/audit-logs/export")
+async def export_audit_logs(
+    account_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (ex.: action,user_id)"),
+    gzip: bool = False,
+    current_user: dict = Depends(AuthMiddleware.require_role("admin")),
+    audit_log_query_use_case: AuditLogQueryUseCase = Depends(get_audit_log_query_use_case)
+):
+    """
+    Exportação dos registros de auditoria em NDJSON (somente admin)
+    
+    Mesmos filtros da consulta, sem paginação: o arquivo é gerado em fluxo,
+    lote a lote, do mais recente ao mais antigo. gzip=true comprime o fluxo.
+    """
+    try:
+        chunks = audit_log_query_use_case.export(
+            account_id=account_id,
+            user_id=user_id,
+            action=action,
+            created_from=created_from,
+            created_to=created_to,
+            fields=_parse_fields(fields),
+            compress=gzip
+        )
+        return ndjson_response(chunks, "audit_logs", compress=gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
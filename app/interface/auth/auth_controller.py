@@ -1,37 +1,60 @@
 from fastapi import APIRouter, HTTPException, Depends, Header
-from typing import Optional
-from app.interface.auth.auth_dto import SignInRequest, SignUpRequest, AuthResponse, SessionInfo
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, Optional
+from app.interface.auth.auth_dto import (
+    SignInRequest,
+    SignUpRequest,
+    AuthResponse,
+    SignInResponse,
+    SignUpResponse,
+    PrincipalResponse,
+    RefreshResponse,
+)
 from app.aplication.auth.signin_use_case import SignInUseCase
 from app.aplication.auth.signup_use_case import SignUpUseCase
 from app.aplication.auth.token_validation_use_case import TokenValidationUseCase
+from app.aplication.auth.user_export_use_case import UserExportUseCase
 from app.domain.auth.auth_provider import AuthProviderType
-from app.domain.auth.services.token_service import TokenService
-from app.domain.auth.services.auth_service import AuthService
-from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
-from app.infrastructure.repositories.auth.auth_session_repository import InMemoryAuthSessionRepository
-from app.infrastructure.repositories.auth.auth_provider_repository import InMemoryAuthProviderRepository
+from app.domain.auth.services.password_hasher import PasswordHasherError
+from app.domain.auth.services.login_admission import AdmissionRejectedError
+from app.interface.dependencies import (
+    AppContainer,
+    get_client_ip,
+    get_container,
+    get_signin_use_case,
+    get_signup_use_case,
+    get_token_validation_use_case,
+    get_user_export_use_case,
+)
+from app.interface.auth.auth_middleware import AuthMiddleware
+from app.interface.streaming import ndjson_response
 
 
-# Inicialização dos repositórios (em produção, usar injeção de dependência)
-user_repository = InMemoryUserRepository()
-session_repository = InMemoryAuthSessionRepository()
-provider_repository = InMemoryAuthProviderRepository()
+# Router para autenticação (respostas serializadas com orjson)
+auth_router = APIRouter(prefix="/api/v1", tags=["Authentication"], default_response_class=ORJSONResponse)
 
-# Inicialização dos serviços
-token_service = TokenService(secret_key="your-secret-key-here")  # Em produção, usar variável de ambiente
-auth_service = AuthService(token_service)
 
-# Inicialização dos casos de uso
-signin_use_case = SignInUseCase(auth_service, user_repository, session_repository)
-signup_use_case = SignUpUseCase(auth_service, user_repository, provider_repository)
-token_validation_use_case = TokenValidationUseCase(token_service, user_repository, session_repository)
-
-# Router para autenticação
-auth_router = APIRouter(prefix="/api/v1", tags=["Authentication"])
+def _auth_response(
+    success: bool,
+    message: str,
+    data: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None
+) -> ORJSONResponse:
+    """
+    Monta a resposta já serializada
+    
+    Os dados dos casos de uso já estão em tipos JSON nativos; retornar a Response
+    diretamente evita a revalidação pelo response_model (que fica apenas na documentação).
+    """
+    return ORJSONResponse({"success": success, "message": message, "data": data, "error": error})
 
 
-@auth_router.post("/signin", response_model=AuthResponse)
-async def signin(request: SignInRequest):
+@auth_router.post("/signin", response_model=SignInResponse)
+async def signin(
+    request: SignInRequest,
+    client_ip: Optional[str] = Depends(get_client_ip),
+    signin_use_case: SignInUseCase = Depends(get_signin_use_case)
+):
     """
     Endpoint de login
     
@@ -49,7 +72,7 @@ async def signin(request: SignInRequest):
             if not password:
                 raise HTTPException(status_code=400, detail="Senha é obrigatória para login básico")
             
-            result = await signin_use_case.execute_basic(request.email, password)
+            result = await signin_use_case.execute_basic(request.email, password, client_ip)
             
         elif provider_type in [AuthProviderType.GOOGLE, AuthProviderType.MICROSOFT]:
             # Para login social, assumimos que o providerId é o email por enquanto
@@ -63,26 +86,42 @@ async def signin(request: SignInRequest):
             raise HTTPException(status_code=400, detail="Tipo de provedor não suportado")
         
         if not result:
-            return AuthResponse(
+            return _auth_response(
                 success=False,
                 message="Credenciais inválidas",
                 error="INVALID_CREDENTIALS"
             )
         
-        return AuthResponse(
+        return _auth_response(
             success=True,
             message="Login realizado com sucesso",
             data=result
         )
         
+    except HTTPException:
+        raise
+    except AdmissionRejectedError as e:
+        # Excesso por email/IP → 429; excesso global → 503
+        status_code = 429 if e.reason == AdmissionRejectedError.REASON_KEY else 503
+        raise HTTPException(
+            status_code=status_code,
+            detail="Muitas tentativas de login, tente novamente em instantes",
+            headers={"Retry-After": str(e.retry_after_seconds)}
+        )
+    except PasswordHasherError:
+        raise HTTPException(
+            status_code=503,
+            detail="Serviço de autenticação sobrecarregado, tente novamente",
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
-@auth_router.post("/signup", response_model=AuthResponse)
-async def signup(request: SignUpRequest):
+@auth_router.post("/signup", response_model=SignUpResponse)
+async def signup(request: SignUpRequest, signup_use_case: SignUpUseCase = Depends(get_signup_use_case)):
     """
     Endpoint de cadastro
     
@@ -113,20 +152,31 @@ async def signup(request: SignUpRequest):
                 detail="Para cadastro básico forneça 'password' ou para social forneça 'providerAuth' e 'providerId'"
             )
         
-        return AuthResponse(
+        return _auth_response(
             success=True,
             message=result["message"],
             data=result
         )
         
+    except HTTPException:
+        raise
+    except PasswordHasherError:
+        raise HTTPException(
+            status_code=503,
+            detail="Serviço de autenticação sobrecarregado, tente novamente",
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
-@auth_router.get("/me")
-async def get_current_user(authorization: Optional[str] = Header(None)):
+@auth_router.get("/me", response_model=PrincipalResponse)
+async def get_current_user(
+    authorization: Optional[str] = Header(None),
+    token_validation_use_case: TokenValidationUseCase = Depends(get_token_validation_use_case)
+):
     """
     Endpoint para obter informações do usuário atual
     """
@@ -140,7 +190,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         if not result:
             raise HTTPException(status_code=401, detail="Token inválido ou expirado")
         
-        return AuthResponse(
+        return _auth_response(
             success=True,
             message="Usuário autenticado",
             data=result
@@ -152,8 +202,45 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
-@auth_router.post("/refresh")
-async def refresh_token(refresh_token: str):
+@auth_router.post("/logout-all", response_model=AuthResponse)
+async def logout_all(
+    authorization: Optional[str] = Header(None),
+    token_validation_use_case: TokenValidationUseCase = Depends(get_token_validation_use_case)
+):
+    """
+    Endpoint para encerrar todas as sessões do usuário atual
+    
+    Incrementa a época de sessão do usuário, invalidando todos os tokens já emitidos.
+    """
+    try:
+        if not authorization or not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Token de autorização não fornecido")
+        
+        access_token = authorization.replace("Bearer ", "")
+        result = await token_validation_use_case.execute(access_token)
+        
+        if not result:
+            raise HTTPException(status_code=401, detail="Token inválido ou expirado")
+        
+        await token_validation_use_case.revoke_user_sessions(result["user"]["id"])
+        token_validation_use_case.invalidate_principal(access_token)
+        
+        return _auth_response(
+            success=True,
+            message="Todas as sessões foram encerradas"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
+@auth_router.post("/refresh", response_model=RefreshResponse)
+async def refresh_token(
+    refresh_token: str,
+    token_validation_use_case: TokenValidationUseCase = Depends(get_token_validation_use_case)
+):
     """
     Endpoint para renovar token de acesso
     """
@@ -163,7 +250,7 @@ async def refresh_token(refresh_token: str):
         if not result:
             raise HTTPException(status_code=401, detail="Refresh token inválido ou expirado")
         
-        return AuthResponse(
+        return _auth_response(
             success=True,
             message="Token renovado com sucesso",
             data=result
@@ -175,3 +262,41 @@ async def refresh_token(refresh_token: str):
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
+@auth_router.get("/users/export")
+async def export_users(
+    gzip: bool = False,
+    current_user: dict = Depends(AuthMiddleware.require_role("admin")),
+    user_export_use_case: UserExportUseCase = Depends(get_user_export_use_case)
+):
+    """
+    Exportação dos usuários em NDJSON (somente admin, sem hash de senha)
+    
+    O arquivo é gerado em fluxo a partir de um cursor no banco, lote a lote;
+    gzip=true comprime o fluxo.
+    """
+    return ndjson_response(user_export_use_case.execute(compress=gzip), "users", compress=gzip)
+
+
+@auth_router.get("/auth/metrics")
+async def auth_metrics(
+    current_user: dict = Depends(AuthMiddleware.require_role("admin")),
+    app_container: AppContainer = Depends(get_container)
+):
+    """
+    Métricas do controle de admissão, do motor de hash de senhas, dos caches, da varredura de sessões, da medição de consumo e dos limites de plano (somente admin)
+    """
+    return {
+        "admission": app_container.admission_controller.get_metrics(),
+        "password_hasher": app_container.password_hasher.get_stats(),
+        "token_cache": app_container.token_service.get_cache_stats(),
+        "principal_cache": app_container.token_validation_use_case.get_cache_stats(),
+        "user_cache": app_container.user_cache.get_cache_stats() if app_container.user_cache else None,
+        "session_sweeper": app_container.session_sweeper.get_stats() if app_container.session_sweeper else None,
+        "usage_meter": app_container.usage_meter.get_stats() if app_container.usage_meter else None,
+        "quota_engine": app_container.quota_engine.get_stats() if app_container.quota_engine else None,
+        "audit_log": app_container.audit_log_sink.get_stats() if app_container.audit_log_sink else None,
+        "single_flight": {
+            "users": app_container.user_single_flight.get_stats() if app_container.user_single_flight else None,
+            "sessions": app_container.session_single_flight.get_stats() if app_container.session_single_flight else None
+        }
+    }
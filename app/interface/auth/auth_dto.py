@@ -28,6 +28,42 @@ class AuthResponse(BaseModel):
     error: Optional[str] = None
 
 
+class UserSummary(BaseModel):
+    """DTO com o resumo do usuário autenticado"""
+    id: str
+    email: str
+    name: str
+    role: str
+    status: str
+
+
+class SessionSummary(BaseModel):
+    """DTO com o resumo da sessão do token"""
+    id: str
+    expires_at: str
+
+
+class SignInData(BaseModel):
+    """DTO com os tokens emitidos no login"""
+    access_token: str
+    refresh_token: str
+    expires_at: str
+    user: UserSummary
+
+
+class PrincipalData(BaseModel):
+    """DTO com o usuário e a sessão do token validado"""
+    user: UserSummary
+    session: SessionSummary
+
+
+class RefreshData(BaseModel):
+    """DTO com os tokens renovados"""
+    access_token: str
+    refresh_token: str
+    expires_at: str
+
+
 class UserInfo(BaseModel):
     """DTO para informações do usuário"""
     id: str
@@ -45,3 +81,29 @@ class SessionInfo(BaseModel):
     refresh_token: str
     expires_at: str
     user: UserInfo
+
+
+class SignUpData(BaseModel):
+    """DTO com o usuário criado no cadastro"""
+    user: UserInfo
+    message: str
+
+
+class SignInResponse(AuthResponse):
+    """Resposta do login (documentação do schema)"""
+    data: Optional[SignInData] = None
+
+
+class SignUpResponse(AuthResponse):
+    """Resposta do cadastro (documentação do schema)"""
+    data: Optional[SignUpData] = None
+
+
+class PrincipalResponse(AuthResponse):
+    """Resposta da validação do token (documentação do schema)"""
+    data: Optional[PrincipalData] = None
+
+
+class RefreshResponse(AuthResponse):
+    """Resposta da renovação de tokens (documentação do schema)"""
+    data: Optional[RefreshData] = None
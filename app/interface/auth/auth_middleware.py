@@ -2,15 +2,7 @@ from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from app.aplication.auth.token_validation_use_case import TokenValidationUseCase
-from app.domain.auth.services.token_service import TokenService
-from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
-from app.infrastructure.repositories.auth.auth_session_repository import InMemoryAuthSessionRepository
-
-# Inicialização dos serviços (em produção, usar injeção de dependência)
-user_repository = InMemoryUserRepository()
-session_repository = InMemoryAuthSessionRepository()
-token_service = TokenService(secret_key="your-secret-key-here")
-token_validation_use_case = TokenValidationUseCase(token_service, user_repository, session_repository)
+from app.interface.dependencies import get_token_validation_use_case
 
 # Esquema de autenticação HTTP Bearer
 security = HTTPBearer()
@@ -20,12 +12,16 @@ class AuthMiddleware:
     """Middleware de autenticação JWT"""
     
     @staticmethod
-    async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def get_current_user(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        token_validation_use_case: TokenValidationUseCase = Depends(get_token_validation_use_case)
+    ):
         """
         Dependência para obter o usuário atual autenticado
         
         Args:
             credentials: Credenciais de autorização HTTP Bearer
+            token_validation_use_case: Caso de uso compartilhado via container de dependências
             
         Returns:
             dict: Dados do usuário autenticado
@@ -55,12 +51,16 @@ class AuthMiddleware:
             )
     
     @staticmethod
-    async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))):
+    async def get_current_user_optional(
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+        token_validation_use_case: TokenValidationUseCase = Depends(get_token_validation_use_case)
+    ):
         """
         Dependência opcional para obter o usuário atual (não falha se não autenticado)
         
         Args:
             credentials: Credenciais de autorização HTTP Bearer (opcional)
+            token_validation_use_case: Caso de uso compartilhado via container de dependências
             
         Returns:
             Optional[dict]: Dados do usuário autenticado ou None
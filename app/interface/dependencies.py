@@ -0,0 +1,437 @@
+"""
+Container de dependências da aplicação
+
+Constrói repositórios, pools e serviços uma única vez por worker (no startup do
+FastAPI) e os entrega aos controllers e ao middleware via `Depends`.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import Depends, Request
+
+from app.aplication.auth.signin_use_case import SignInUseCase
+from app.aplication.auth.signup_use_case import SignUpUseCase
+from app.aplication.auth.token_validation_use_case import TokenValidationUseCase
+from app.aplication.auth.user_export_use_case import UserExportUseCase
+from app.aplication.audit_log.audit_log_query_use_case import AuditLogQueryUseCase
+from app.domain.auth.services.auth_service import AuthService
+from app.domain.auth.services.login_admission import LoginAdmissionController
+from app.domain.auth.services.password_hasher import AsyncPasswordHasher
+from app.domain.auth.services.token_service import TokenService
+from app.infrastructure.repositories.auth.auth_context_repository import AuthContextRepository
+from app.infrastructure.repositories.auth.auth_provider_repository import (
+    AuthProviderRepository,
+    InMemoryAuthProviderRepository,
+)
+from app.infrastructure.repositories.auth.auth_session_repository import (
+    AuthSessionRepository,
+    InMemoryAuthSessionRepository,
+)
+from app.infrastructure.repositories.auth.single_flight_repository import (
+    SingleFlightAuthSessionRepository,
+    SingleFlightUserRepository,
+)
+from app.infrastructure.repositories.auth.session_epoch_repository import (
+    InMemorySessionEpochRepository,
+    SessionEpochRepository,
+)
+from app.infrastructure.repositories.auth.session_sweeper import SessionSweeper
+from app.infrastructure.repositories.auth.cached_user_repository import CachedUserRepository
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository, UserRepository
+from app.infrastructure.repositories.usage.usage_repository import InMemoryUsageRepository, UsageRepository
+from app.infrastructure.repositories.plan.plan_repository import InMemoryPlanRepository, PlanRepository
+from app.infrastructure.repositories.account.account_membership_repository import (
+    AccountMembershipRepository,
+    InMemoryAccountMembershipRepository,
+)
+from app.infrastructure.metering.usage_meter import UsageMeter
+from app.infrastructure.metering.quota_engine import QuotaEngine
+from app.infrastructure.repositories.audit_log.audit_log_repository import (
+    AuditLogRepository,
+    InMemoryAuditLogRepository,
+)
+from app.infrastructure.audit.audit_log_sink import AuditLogSink
+from app.shared.client_ip import parse_trusted_proxies, resolve_client_ip
+from app.shared.config import Settings, settings
+from app.shared.id_generator import IdGenerator, get_id_generator, set_id_generator
+
+logger = logging.getLogger(__name__)
+
+
+class AppContainer:
+    """
+    Container de dependências com ciclo de vida gerenciado
+
+    Cada backend (PostgreSQL, Redis) é inicializado no máximo uma vez, de modo que
+    o processo mantém exatamente um pool por backend, compartilhado por todos os
+    repositórios, controllers e pelo middleware de autenticação.
+    """
+
+    def __init__(self, config: Settings = settings):
+        self.config = config
+        self._started = False
+        self._backends: List[Any] = []
+        self.startup_report: Dict[str, Any] = {}
+        self.trusted_proxies = parse_trusted_proxies(config.TRUSTED_PROXIES)
+
+        self.user_repository: Optional[UserRepository] = None
+        self.user_cache: Optional[CachedUserRepository] = None
+        self.user_single_flight: Optional[SingleFlightUserRepository] = None
+        self.session_single_flight: Optional[SingleFlightAuthSessionRepository] = None
+        self.provider_repository: Optional[AuthProviderRepository] = None
+        self.session_repository: Optional[AuthSessionRepository] = None
+        # Repositório de sessões sem decorators (o contexto de autenticação lê suas chaves direto)
+        self._session_store: Optional[AuthSessionRepository] = None
+        self.auth_context_repository: Optional[AuthContextRepository] = None
+        self.session_sweeper: Optional[SessionSweeper] = None
+        self.epoch_repository: Optional[SessionEpochRepository] = None
+        self.usage_repository: Optional[UsageRepository] = None
+        self.usage_meter: Optional[UsageMeter] = None
+        self.plan_repository: Optional[PlanRepository] = None
+        self.account_membership_repository: Optional[AccountMembershipRepository] = None
+        self.quota_engine: Optional[QuotaEngine] = None
+        self.audit_log_repository: Optional[AuditLogRepository] = None
+        self.audit_log_sink: Optional[AuditLogSink] = None
+        self.token_service: Optional[TokenService] = None
+        self.password_hasher: Optional[AsyncPasswordHasher] = None
+        self.admission_controller: Optional[LoginAdmissionController] = None
+        self.auth_service: Optional[AuthService] = None
+        self.signin_use_case: Optional[SignInUseCase] = None
+        self.signup_use_case: Optional[SignUpUseCase] = None
+        self.token_validation_use_case: Optional[TokenValidationUseCase] = None
+        self.audit_log_query_use_case: Optional[AuditLogQueryUseCase] = None
+        self.user_export_use_case: Optional[UserExportUseCase] = None
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def _initialize_backend(self, name: str, backend: Any) -> None:
+        """Inicializa (uma vez por processo) e pré-aquece o backend via DatabaseManager"""
+        from app.infrastructure.database import database_manager
+        if not await database_manager.ensure_initialized(name):
+            raise RuntimeError(f"Falha ao inicializar o backend {name}")
+        if backend not in self._backends:
+            self._backends.append(backend)
+        self.startup_report.setdefault("backends", {})[name] = database_manager.get_startup_report().get(name)
+
+    async def _build_user_repositories(self) -> None:
+        if self.config.AUTH_USER_BACKEND == "postgres":
+            from app.infrastructure.database.postgres.setup import postgres_setup
+            from app.infrastructure.repositories.auth.postgres_user_repository import PostgresUserRepository
+            from app.infrastructure.repositories.auth.postgres_auth_provider_repository import (
+                PostgresAuthProviderRepository,
+            )
+            await self._initialize_backend("postgres", postgres_setup)
+            self.user_repository = PostgresUserRepository(postgres_setup)
+            self.provider_repository = PostgresAuthProviderRepository(postgres_setup)
+        else:
+            self.user_repository = InMemoryUserRepository()
+            self.provider_repository = InMemoryAuthProviderRepository()
+
+        # Single-flight junto à origem: misses concorrentes do cache viram uma única consulta
+        if self.config.AUTH_SINGLE_FLIGHT_ENABLED:
+            self.user_single_flight = SingleFlightUserRepository(self.user_repository)
+            self.user_repository = self.user_single_flight
+
+        if self.config.USER_CACHE_BACKEND in ("memory", "redis"):
+            redis_backend = None
+            if self.config.USER_CACHE_BACKEND == "redis":
+                from app.infrastructure.database.redis.setup import redis_setup
+                await self._initialize_backend("redis", redis_setup)
+                redis_backend = redis_setup
+            self.user_cache = CachedUserRepository(
+                self.user_repository,
+                redis_backend,
+                l1_max_size=self.config.USER_CACHE_L1_SIZE,
+                l1_ttl_seconds=self.config.USER_CACHE_L1_TTL_SECONDS,
+                l2_ttl_seconds=self.config.USER_CACHE_L2_TTL_SECONDS,
+                early_refresh_beta=self.config.AUTH_CACHE_EARLY_REFRESH_BETA
+            )
+            await self.user_cache.start()
+            self.user_repository = self.user_cache
+
+    async def _build_session_repositories(self) -> None:
+        if self.config.AUTH_SESSION_BACKEND == "redis":
+            from app.infrastructure.database.redis.setup import redis_setup
+            from app.infrastructure.repositories.auth.redis_auth_session_repository import RedisAuthSessionRepository
+            from app.infrastructure.repositories.auth.redis_session_epoch_repository import (
+                RedisSessionEpochRepository,
+            )
+            await self._initialize_backend("redis", redis_setup)
+            self.session_repository = RedisAuthSessionRepository(redis_setup)
+            self.epoch_repository = RedisSessionEpochRepository(redis_setup)
+        else:
+            if self.config.AUTH_SESSION_BACKEND == "postgres":
+                # auth_sessions.user_id referencia users.id: os usuários precisam estar no mesmo banco
+                if self.config.AUTH_USER_BACKEND != "postgres":
+                    raise RuntimeError("AUTH_SESSION_BACKEND=postgres requer AUTH_USER_BACKEND=postgres")
+                from app.infrastructure.database.postgres.setup import postgres_setup
+                from app.infrastructure.repositories.auth.postgres_auth_session_repository import (
+                    PostgresAuthSessionRepository,
+                )
+                await self._initialize_backend("postgres", postgres_setup)
+                self.session_repository = PostgresAuthSessionRepository(
+                    postgres_setup,
+                    revoked_retention_seconds=self.config.AUTH_SESSION_REVOKED_RETENTION_SECONDS
+                )
+            else:
+                self.session_repository = InMemoryAuthSessionRepository(
+                    revoked_retention_seconds=self.config.AUTH_SESSION_REVOKED_RETENTION_SECONDS
+                )
+            self.epoch_repository = InMemorySessionEpochRepository()
+            # Redis expira as chaves por TTL; memória e PostgreSQL precisam de varredura
+            self.session_sweeper = SessionSweeper(
+                self.session_repository,
+                interval_seconds=self.config.AUTH_SESSION_SWEEP_INTERVAL_SECONDS,
+                batch_size=self.config.AUTH_SESSION_SWEEP_BATCH_SIZE
+            )
+            await self.session_sweeper.start()
+
+        self._session_store = self.session_repository
+        if self.config.AUTH_SINGLE_FLIGHT_ENABLED:
+            self.session_single_flight = SingleFlightAuthSessionRepository(self.session_repository)
+            self.session_repository = self.session_single_flight
+
+    async def _build_usage_metering(self) -> None:
+        config = self.config
+        if config.USAGE_REPOSITORY_BACKEND == "mongo":
+            from app.infrastructure.database.mongo.setup import mongo_setup
+            from app.infrastructure.repositories.usage.mongo_usage_repository import MongoUsageRepository
+            await self._initialize_backend("mongo", mongo_setup)
+            self.usage_repository = MongoUsageRepository(mongo_setup)
+        else:
+            self.usage_repository = InMemoryUsageRepository()
+
+        redis_backend = None
+        if config.USAGE_METER_BACKEND == "redis":
+            from app.infrastructure.database.redis.setup import redis_setup
+            await self._initialize_backend("redis", redis_setup)
+            redis_backend = redis_setup
+        self.usage_meter = UsageMeter(
+            redis_backend,
+            self.usage_repository,
+            flush_interval_seconds=config.USAGE_METER_FLUSH_INTERVAL_SECONDS,
+            rollup_interval_seconds=config.USAGE_ROLLUP_INTERVAL_SECONDS,
+            max_pending_keys=config.USAGE_METER_MAX_PENDING_KEYS
+        )
+        await self.usage_meter.start()
+
+        self.plan_repository = InMemoryPlanRepository()
+        self.account_membership_repository = InMemoryAccountMembershipRepository()
+        self.quota_engine = QuotaEngine(
+            self.plan_repository,
+            self.usage_meter,
+            limits_ttl_seconds=config.QUOTA_LIMITS_TTL_SECONDS,
+            reconcile_interval_seconds=config.QUOTA_RECONCILE_INTERVAL_SECONDS,
+            max_accounts=config.QUOTA_MAX_ACCOUNTS
+        )
+
+    async def _build_audit_log(self) -> None:
+        config = self.config
+        if config.AUDIT_LOG_BACKEND == "mongo":
+            from app.infrastructure.database.mongo.setup import mongo_setup
+            from app.infrastructure.repositories.audit_log.mongo_audit_log_repository import (
+                MongoAuditLogRepository,
+            )
+            await self._initialize_backend("mongo", mongo_setup)
+            self.audit_log_repository = MongoAuditLogRepository(mongo_setup)
+        else:
+            self.audit_log_repository = InMemoryAuditLogRepository()
+
+        self.audit_log_sink = AuditLogSink(
+            self.audit_log_repository,
+            max_queue_size=config.AUDIT_LOG_QUEUE_SIZE,
+            batch_size=config.AUDIT_LOG_BATCH_SIZE,
+            flush_interval_seconds=config.AUDIT_LOG_FLUSH_INTERVAL_SECONDS,
+            overflow_policy=config.AUDIT_LOG_OVERFLOW_POLICY
+        )
+        await self.audit_log_sink.start()
+
+    def _build_services(self) -> None:
+        config = self.config
+        if config.ID_WORKER_ID is not None and get_id_generator().worker_id != config.ID_WORKER_ID:
+            set_id_generator(IdGenerator(worker_id=config.ID_WORKER_ID))
+        self.token_service = TokenService(
+            secret_key=config.JWT_SECRET_KEY,
+            algorithm=config.JWT_ALGORITHM,
+            cache_max_size=config.JWT_VERIFY_CACHE_SIZE,
+            cache_ttl_seconds=config.JWT_VERIFY_CACHE_TTL_SECONDS
+        )
+        self.password_hasher = AsyncPasswordHasher(
+            executor_type=config.PASSWORD_HASH_EXECUTOR,
+            max_workers=config.PASSWORD_HASH_MAX_WORKERS,
+            max_pending=config.PASSWORD_HASH_MAX_PENDING,
+            timeout_seconds=config.PASSWORD_HASH_TIMEOUT_SECONDS
+        )
+        self.admission_controller = LoginAdmissionController(
+            max_concurrent=config.LOGIN_MAX_CONCURRENT,
+            max_waiting=config.LOGIN_MAX_WAITING,
+            max_per_email=config.LOGIN_MAX_PER_EMAIL,
+            max_per_ip=config.LOGIN_MAX_PER_IP,
+            wait_timeout_seconds=config.LOGIN_WAIT_TIMEOUT_SECONDS,
+            retry_after_seconds=config.LOGIN_RETRY_AFTER_SECONDS
+        )
+        self.auth_service = AuthService(self.token_service, self.password_hasher, self.admission_controller)
+
+    def _build_auth_context_repository(self) -> None:
+        """Escolhe como resolver sessão + usuário de um token em um único round trip"""
+        backend = self.config.AUTH_SESSION_BACKEND
+        if backend == "redis":
+            from app.infrastructure.repositories.auth.redis_auth_context_repository import (
+                RedisAuthContextRepository,
+            )
+            # Pipeline com o hash da sessão e o usuário no L2 (quando o cache de usuários usa Redis)
+            self.auth_context_repository = RedisAuthContextRepository(
+                self._session_store,
+                self.user_repository,
+                self.user_cache
+            )
+        elif backend == "postgres":
+            from app.infrastructure.database.postgres.setup import postgres_setup
+            from app.infrastructure.repositories.auth.postgres_auth_context_repository import (
+                PostgresAuthContextRepository,
+            )
+            self.auth_context_repository = PostgresAuthContextRepository(postgres_setup)
+        else:
+            # Em memória as duas buscas não têm I/O: a composição basta
+            self.auth_context_repository = None
+
+    def _build_use_cases(self) -> None:
+        config = self.config
+        self._build_auth_context_repository()
+        self.signin_use_case = SignInUseCase(
+            self.auth_service,
+            self.user_repository,
+            self.session_repository,
+            self.epoch_repository,
+            self.audit_log_sink
+        )
+        self.signup_use_case = SignUpUseCase(
+            self.auth_service,
+            self.user_repository,
+            self.provider_repository,
+            self.audit_log_sink
+        )
+        self.token_validation_use_case = TokenValidationUseCase(
+            self.token_service,
+            self.user_repository,
+            self.session_repository,
+            auth_context_repository=self.auth_context_repository,
+            principal_cache_ttl_seconds=config.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+            principal_cache_size=config.AUTH_PRINCIPAL_CACHE_SIZE,
+            epoch_repository=self.epoch_repository,
+            epoch_cache_ttl_seconds=config.AUTH_SESSION_EPOCH_CACHE_TTL_SECONDS,
+            early_refresh_beta=config.AUTH_CACHE_EARLY_REFRESH_BETA
+        )
+        self.audit_log_query_use_case = AuditLogQueryUseCase(
+            self.audit_log_repository,
+            export_batch_size=config.EXPORT_BATCH_SIZE
+        )
+        self.user_export_use_case = UserExportUseCase(self.user_repository, batch_size=config.EXPORT_BATCH_SIZE)
+
+    async def startup(self) -> None:
+        """Inicializa backends, repositórios e serviços (idempotente)"""
+        if self._started:
+            return
+
+        started_at = time.perf_counter()
+        # Backends independentes sobem em paralelo: o startup custa o mais lento, não a soma
+        await asyncio.gather(
+            self._build_user_repositories(),
+            self._build_session_repositories(),
+            self._build_usage_metering(),
+            self._build_audit_log()
+        )
+        self._build_services()
+        self._build_use_cases()
+        self._started = True
+        self.startup_report["total_ms"] = round((time.perf_counter() - started_at) * 1000, 2)
+        logger.info(
+            "Container de dependências inicializado em %s ms (usuários: %s, sessões: %s)",
+            self.startup_report["total_ms"],
+            self.config.AUTH_USER_BACKEND,
+            self.config.AUTH_SESSION_BACKEND
+        )
+
+    async def shutdown(self) -> None:
+        """Libera pools de execução e conexões dos backends"""
+        if self.password_hasher is not None:
+            self.password_hasher.shutdown()
+        if self.user_cache is not None:
+            await self.user_cache.stop()
+        if self.session_sweeper is not None:
+            await self.session_sweeper.stop()
+        if self.usage_meter is not None:
+            # Grava os incrementos pendentes antes de fechar as conexões
+            await self.usage_meter.stop()
+        if self.audit_log_sink is not None:
+            await self.audit_log_sink.stop()
+        for backend in self._backends:
+            try:
+                backend.close_connections()
+            except Exception as e:
+                logger.error(f"Erro ao fechar conexões: {e}")
+        self._backends.clear()
+        self._started = False
+
+
+# Instância única por processo (worker)
+container = AppContainer()
+
+
+def get_container() -> AppContainer:
+    """
+    Dependência que retorna o container inicializado
+
+    Raises:
+        RuntimeError: Se o startup da aplicação ainda não foi executado
+    """
+    if not container.started:
+        raise RuntimeError("Container de dependências não inicializado")
+    return container
+
+
+def get_signin_use_case(app_container: AppContainer = Depends(get_container)) -> SignInUseCase:
+    return app_container.signin_use_case
+
+
+def get_signup_use_case(app_container: AppContainer = Depends(get_container)) -> SignUpUseCase:
+    return app_container.signup_use_case
+
+
+def get_usage_meter(app_container: AppContainer = Depends(get_container)) -> UsageMeter:
+    return app_container.usage_meter
+
+
+def get_quota_engine(app_container: AppContainer = Depends(get_container)) -> QuotaEngine:
+    return app_container.quota_engine
+
+
+def get_account_membership_repository(
+    app_container: AppContainer = Depends(get_container)
+) -> AccountMembershipRepository:
+    return app_container.account_membership_repository
+
+
+def get_token_validation_use_case(app_container: AppContainer = Depends(get_container)) -> TokenValidationUseCase:
+    return app_container.token_validation_use_case
+
+
+def get_audit_log_query_use_case(app_container: AppContainer = Depends(get_container)) -> AuditLogQueryUseCase:
+    return app_container.audit_log_query_use_case
+
+
+def get_user_export_use_case(app_container: AppContainer = Depends(get_container)) -> UserExportUseCase:
+    return app_container.user_export_use_case
+
+
+def get_client_ip(request: Request, app_container: AppContainer = Depends(get_container)) -> Optional[str]:
+    """IP do cliente; X-Forwarded-For só é aceito quando a conexão vem de TRUSTED_PROXIES"""
+    return resolve_client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+        app_container.trusted_proxies
+    )
@@ -0,0 +1,44 @@
+"""
+Respostas em fluxo compartilhadas pelos controllers
+"""
+from typing import AsyncIterator
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que sempre fecha o gerador ao terminar
+    
+    Quando o cliente desconecta, o Starlette cancela o envio, mas o gerador
+    fica suspenso até o coletor de lixo. Fechá-lo aqui libera na hora o
+    cursor e a conexão do banco usados pela exportação.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def ndjson_response(chunks: AsyncIterator[bytes], filename: str, compress: bool = False) -> StreamingResponse:
+    """
+    Envia blocos NDJSON como download, sem montar o arquivo em memória
+    
+    Args:
+        chunks: Blocos gerados por encode_ndjson
+        filename: Nome do arquivo sem extensão
+        compress: Os blocos estão em gzip
+    """
+    if compress:
+        media_type, filename = "application/gzip", f"{filename}.ndjson.gz"
+    else:
+        media_type, filename = "application/x-ndjson", f"{filename}.ndjson"
+    return ClosingStreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,7 @@
+"""
+Interface de Consumo
+"""
+
+from .quota_middleware import QuotaMiddleware, quota_middleware
+
+__all__ = ["QuotaMiddleware", "quota_middleware"]
@@ -0,0 +1,69 @@
+from fastapi import Depends, HTTPException
+from app.domain.usage.usage import USAGE_METRICS
+from app.infrastructure.metering.quota_engine import NoActivePlanError, QuotaCheck, QuotaEngine, QuotaExceededError
+from app.infrastructure.repositories.account.account_membership_repository import AccountMembershipRepository
+from app.interface.auth.auth_middleware import AuthMiddleware
+from app.interface.dependencies import get_account_membership_repository, get_quota_engine
+
+
+class QuotaMiddleware:
+    """Middleware de limites do plano (consumo da conta x Plan.limits)"""
+
+    @staticmethod
+    def require_quota(metric: str, amount: int = 1, consume: bool = False):
+        """
+        Dependência que bloqueia a requisição se a conta estiver acima do limite
+
+        A conta cobrada é a do usuário autenticado (token Bearer), nunca um valor
+        enviado pelo cliente. Usuário sem conta ou conta sem plano vigente → 403.
+        A verificação usa apenas o estado local do QuotaEngine (sem consulta ao
+        banco por requisição).
+
+        Args:
+            metric: "messages_count", "groups_count" ou "storage_bytes"
+            amount: Unidades que a requisição consome
+            consume: Se True, registra o consumo quando a requisição é admitida
+
+        Returns:
+            function: Dependência que retorna o QuotaCheck da conta
+
+        Raises:
+            ValueError: Se a métrica não existir
+        """
+        if metric not in USAGE_METRICS:
+            raise ValueError(f"Métrica de consumo desconhecida: {metric}")
+
+        async def quota_checker(
+            current_user: dict = Depends(AuthMiddleware.get_current_user),
+            account_repository: AccountMembershipRepository = Depends(get_account_membership_repository),
+            quota_engine: QuotaEngine = Depends(get_quota_engine)
+        ) -> QuotaCheck:
+            account_id = await account_repository.get_account_id(current_user["user"]["id"])
+            if account_id is None:
+                raise HTTPException(status_code=403, detail={"error": "ACCOUNT_NOT_FOUND"})
+            try:
+                if consume:
+                    return await quota_engine.consume(account_id, metric, amount)
+                check = await quota_engine.check(account_id, metric, amount)
+                if not check.allowed:
+                    raise QuotaExceededError(check)
+                return check
+            except NoActivePlanError:
+                raise HTTPException(status_code=403, detail={"error": "NO_ACTIVE_PLAN"})
+            except QuotaExceededError as e:
+                raise HTTPException(
+                    status_code=429,
+                    detail={
+                        "error": "QUOTA_EXCEEDED",
+                        "metric": e.check.metric,
+                        "limit": e.check.limit,
+                        "used": e.check.used
+                    },
+                    headers={"Retry-After": str(e.check.retry_after_seconds)}
+                )
+
+        return quota_checker
+
+
+# Instância global do middleware
+quota_middleware = QuotaMiddleware()
@@ -0,0 +1,131 @@
+"""
+Cache em memória com política LRU e expiração por entrada
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUTTLCache:
+    """
+    Cache LRU limitado em tamanho, com TTL individual por entrada
+    
+    Opcionalmente aplica expiração antecipada probabilística (XFetch): perto do
+    vencimento, uma leitura pode ser tratada como miss com probabilidade que cresce
+    com o custo de recomputar o valor, de modo que um único chamador renova a
+    entrada antes que todos a percam ao mesmo tempo.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 10000,
+        default_ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior que zero")
+        
+        self.max_size = max_size
+        self.default_ttl_seconds = default_ttl_seconds
+        self._clock = clock
+        # chave -> (valor, expira_em, custo de recomputação em segundos)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.early_refreshes = 0
+    
+    def get(self, key: Hashable, default: Any = None, early_refresh_beta: float = 0.0) -> Any:
+        """
+        Retorna o valor da chave se presente e não expirado
+        
+        Args:
+            key: Chave
+            default: Valor retornado em caso de miss
+            early_refresh_beta: Agressividade da expiração antecipada (0 desativa; 1 é o usual)
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        value, expires_at, compute_seconds = entry
+        now = self._clock()
+        if expires_at <= now:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        
+        if early_refresh_beta > 0 and compute_seconds > 0:
+            # XFetch: now - custo * beta * ln(U) >= expira_em  (U uniforme em (0, 1])
+            if now - compute_seconds * early_refresh_beta * math.log(1.0 - random.random()) >= expires_at:
+                self.early_refreshes += 1
+                self.misses += 1
+                return default
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor sem alterar a ordem LRU nem as métricas"""
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= self._clock():
+            return default
+        return entry[0]
+    
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        compute_seconds: float = 0.0
+    ) -> None:
+        """
+        Armazena um valor; TTL não positivo remove a chave
+        
+        Args:
+            key: Chave
+            value: Valor
+            ttl_seconds: TTL da entrada (padrão: default_ttl_seconds)
+            compute_seconds: Tempo gasto para obter o valor, usado pela expiração antecipada
+        """
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        
+        self._data[key] = (value, self._clock() + ttl, compute_seconds)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def delete(self, key: Hashable) -> bool:
+        """Remove uma chave do cache"""
+        return self._data.pop(key, None) is not None
+    
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "early_refreshes": self.early_refreshes
+        }
@@ -0,0 +1,69 @@
+"""
+Resolução do IP de origem atrás de proxies confiáveis
+"""
+import ipaddress
+from typing import Iterable, List, Optional, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_trusted_proxies(value: Optional[str]) -> List[IPNetwork]:
+    """
+    Converte a lista de proxies confiáveis da configuração
+
+    Args:
+        value: IPs ou redes CIDR separados por vírgula (ex.: "10.0.0.0/8,127.0.0.1")
+
+    Returns:
+        List[IPNetwork]: Redes confiáveis (vazia: X-Forwarded-For é ignorado)
+
+    Raises:
+        ValueError: Se algum item não for um IP ou rede válida
+    """
+    if not value:
+        return []
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+def _is_trusted(address: str, trusted_proxies: Iterable[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def resolve_client_ip(
+    peer_ip: Optional[str],
+    forwarded_for: Optional[str],
+    trusted_proxies: List[IPNetwork]
+) -> Optional[str]:
+    """
+    Determina o IP do cliente a partir da conexão e do X-Forwarded-For
+
+    O cabeçalho só é considerado quando a conexão vem de um proxy confiável; nesse
+    caso é percorrido da direita para a esquerda e o primeiro endereço que não é de
+    um proxy confiável é o cliente. Entradas à esquerda dele são ignoradas, pois o
+    próprio cliente pode forjá-las.
+
+    Args:
+        peer_ip: IP da conexão TCP
+        forwarded_for: Valor do cabeçalho X-Forwarded-For
+        trusted_proxies: Redes dos proxies confiáveis
+
+    Returns:
+        Optional[str]: IP do cliente
+    """
+    if not peer_ip or not forwarded_for or not _is_trusted(peer_ip, trusted_proxies):
+        return peer_ip
+
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            try:
+                return str(ipaddress.ip_address(hop))
+            except ValueError:
+                # Entrada malformada: nada à esquerda dela é confiável
+                return peer_ip
+    # Todos os saltos são proxies confiáveis: o mais à esquerda é a origem
+    return hops[0] if hops else peer_ip
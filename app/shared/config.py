@@ -16,6 +16,51 @@ class Settings:
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_ACCESS_TOKEN_EXPIRE_HOURS: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_HOURS", "24"))
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    JWT_VERIFY_CACHE_SIZE: int = int(os.getenv("JWT_VERIFY_CACHE_SIZE", "10000"))  # 0 desativa o cache
+    JWT_VERIFY_CACHE_TTL_SECONDS: float = float(os.getenv("JWT_VERIFY_CACHE_TTL_SECONDS", "300"))
+    AUTH_PRINCIPAL_CACHE_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "5"))  # 0 desativa
+    AUTH_SESSION_EPOCH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_SESSION_EPOCH_CACHE_TTL_SECONDS", "1"))
+    # Proteção contra stampede: agrupa buscas concorrentes idênticas e renova caches antes do vencimento
+    AUTH_SINGLE_FLIGHT_ENABLED: bool = os.getenv("AUTH_SINGLE_FLIGHT_ENABLED", "True").lower() == "true"
+    AUTH_CACHE_EARLY_REFRESH_BETA: float = float(os.getenv("AUTH_CACHE_EARLY_REFRESH_BETA", "1"))  # 0 desativa
+    
+    # Backend de armazenamento das sessões: "memory" (processo local), "redis" ou "postgres" (compartilhados;
+    # "postgres" requer AUTH_USER_BACKEND=postgres e valida tokens com um JOIN sessão + usuário)
+    AUTH_SESSION_BACKEND: str = os.getenv("AUTH_SESSION_BACKEND", "memory")
+    # Varredura de sessões vencidas/revogadas (backends "memory" e "postgres"; Redis expira por TTL)
+    AUTH_SESSION_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("AUTH_SESSION_SWEEP_INTERVAL_SECONDS", "60"))  # 0 desativa
+    AUTH_SESSION_SWEEP_BATCH_SIZE: int = int(os.getenv("AUTH_SESSION_SWEEP_BATCH_SIZE", "500"))
+    AUTH_SESSION_REVOKED_RETENTION_SECONDS: float = float(os.getenv("AUTH_SESSION_REVOKED_RETENTION_SECONDS", "0"))
+    # Backend de usuários e provedores: "memory" ou "postgres"
+    AUTH_USER_BACKEND: str = os.getenv("AUTH_USER_BACKEND", "memory")
+    # Cache de usuários: "none", "memory" (só L1 no processo) ou "redis" (L1 + L2 com invalidação via pub/sub)
+    USER_CACHE_BACKEND: str = os.getenv("USER_CACHE_BACKEND", "none")
+    USER_CACHE_L1_SIZE: int = int(os.getenv("USER_CACHE_L1_SIZE", "10000"))
+    USER_CACHE_L1_TTL_SECONDS: float = float(os.getenv("USER_CACHE_L1_TTL_SECONDS", "5"))  # janela máxima de inconsistência
+    USER_CACHE_L2_TTL_SECONDS: int = int(os.getenv("USER_CACHE_L2_TTL_SECONDS", "300"))
+    # Worker id (0-65535) embutido nos IDs gerados; vazio sorteia um por processo
+    ID_WORKER_ID: Optional[int] = int(os.getenv("ID_WORKER_ID")) if os.getenv("ID_WORKER_ID") else None
+    
+    # Medição de consumo: "memory" (totais no processo) ou "redis" (HINCRBY em lote no namespace metrics:)
+    USAGE_METER_BACKEND: str = os.getenv("USAGE_METER_BACKEND", "memory")
+    USAGE_METER_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("USAGE_METER_FLUSH_INTERVAL_SECONDS", "1"))  # perda máxima em queda
+    USAGE_METER_MAX_PENDING_KEYS: int = int(os.getenv("USAGE_METER_MAX_PENDING_KEYS", "100000"))
+    # Consolidação em documentos Usage: "memory" ou "mongo" (coleção usage)
+    USAGE_REPOSITORY_BACKEND: str = os.getenv("USAGE_REPOSITORY_BACKEND", "memory")
+    USAGE_ROLLUP_INTERVAL_SECONDS: float = float(os.getenv("USAGE_ROLLUP_INTERVAL_SECONDS", "60"))
+    # Limites do plano: estado local por conta reconciliado com os contadores compartilhados
+    QUOTA_LIMITS_TTL_SECONDS: float = float(os.getenv("QUOTA_LIMITS_TTL_SECONDS", "60"))  # atraso máximo de mudança de plano
+    QUOTA_RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("QUOTA_RECONCILE_INTERVAL_SECONDS", "1"))
+    QUOTA_MAX_ACCOUNTS: int = int(os.getenv("QUOTA_MAX_ACCOUNTS", "100000"))
+    # Auditoria: "memory" ou "mongo" (coleção audit_logs), gravada em lote fora da requisição
+    AUDIT_LOG_BACKEND: str = os.getenv("AUDIT_LOG_BACKEND", "memory")
+    AUDIT_LOG_QUEUE_SIZE: int = int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000"))
+    AUDIT_LOG_BATCH_SIZE: int = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500"))
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_SECONDS", "1"))
+    AUDIT_LOG_OVERFLOW_POLICY: str = os.getenv("AUDIT_LOG_OVERFLOW_POLICY", "drop_oldest")  # ou drop_newest
+    # Exportações NDJSON: registros por lote lido do banco (limita a memória por exportação)
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
     
     # Configurações de Banco de Dados
     DB_POSTGRES_HOST: Optional[str] = os.getenv("DB_POSTGRES_HOST")
@@ -55,6 +100,22 @@ class Settings:
     PASSWORD_REQUIRE_LOWERCASE: bool = os.getenv("PASSWORD_REQUIRE_LOWERCASE", "True").lower() == "true"
     PASSWORD_REQUIRE_DIGITS: bool = os.getenv("PASSWORD_REQUIRE_DIGITS", "True").lower() == "true"
     PASSWORD_REQUIRE_SPECIAL: bool = os.getenv("PASSWORD_REQUIRE_SPECIAL", "True").lower() == "true"
+    
+    # Configurações do motor de hash de senhas (PBKDF2 fora do event loop)
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" ou "process"
+    PASSWORD_HASH_MAX_WORKERS: int = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+    
+    # Controle de admissão para verificação de senha (login)
+    LOGIN_MAX_CONCURRENT: int = int(os.getenv("LOGIN_MAX_CONCURRENT", "8"))
+    LOGIN_MAX_WAITING: int = int(os.getenv("LOGIN_MAX_WAITING", "32"))
+    LOGIN_MAX_PER_EMAIL: int = int(os.getenv("LOGIN_MAX_PER_EMAIL", "2"))
+    LOGIN_MAX_PER_IP: int = int(os.getenv("LOGIN_MAX_PER_IP", "16"))
+    # Proxies cujo X-Forwarded-For é aceito (IPs/CIDR separados por vírgula; vazio ignora o cabeçalho)
+    TRUSTED_PROXIES: str = os.getenv("TRUSTED_PROXIES", "")
+    LOGIN_WAIT_TIMEOUT_SECONDS: float = float(os.getenv("LOGIN_WAIT_TIMEOUT_SECONDS", "2"))
+    LOGIN_RETRY_AFTER_SECONDS: int = int(os.getenv("LOGIN_RETRY_AFTER_SECONDS", "1"))
 
 
 # Instância global das configurações
@@ -0,0 +1,155 @@
+"""
+Geração de IDs únicos, monotônicos e ordenados pelo tempo
+"""
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+# Base32 de Crockford: ordem lexicográfica das strings == ordem numérica dos IDs
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: index for index, char in enumerate(_ALPHABET)}
+# Tabela de pares de caracteres (10 bits por consulta): 13 consultas em vez de 26
+_PAIRS = [first + second for first in _ALPHABET for second in _ALPHABET]
+
+ID_LENGTH = 26  # 128 bits em base32
+WORKER_ID_BITS = 16
+SEQUENCE_BITS = 64
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+_MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+# O início aleatório de cada milissegundo deixa metade do espaço livre para incrementos
+_SEQUENCE_START_BITS = SEQUENCE_BITS - 1
+
+
+def _encode(value: int) -> str:
+    return "".join([_PAIRS[(value >> shift) & 1023] for shift in range(120, -1, -10)])
+
+
+def _decode(encoded: str) -> int:
+    value = 0
+    for char in encoded.upper():
+        value = (value << 5) | _DECODE[char]
+    return value
+
+
+class IdGenerator:
+    """
+    Gerador de IDs de 128 bits no estilo ULID/Snowflake, sem coordenação entre workers
+
+    Layout: 48 bits de timestamp (ms) | 16 bits de worker | 64 bits de sequência.
+
+    - Ordenado pelo tempo: inserções caem no fim do índice B-tree (boa localidade
+      no PostgreSQL e no MongoDB) e a listagem por ID segue a ordem de criação
+    - Monotônico no processo: dentro do mesmo milissegundo a sequência é
+      incrementada; se o relógio voltar, o último timestamp é mantido
+    - Único entre workers: o worker id (configurado ou aleatório) e o início
+      aleatório da sequência a cada milissegundo tornam colisões desprezíveis
+    """
+
+    def __init__(self, worker_id: Optional[int] = None, clock: Callable[[], int] = time.time_ns):
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id deve estar entre 0 e {MAX_WORKER_ID}")
+
+        self._configured_worker_id = worker_id
+        self._clock = clock
+        self._reset()
+        # Processos filhos (fork) não podem herdar o mesmo estado do pai
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self.worker_id = (
+            self._configured_worker_id
+            if self._configured_worker_id is not None
+            else secrets.randbits(WORKER_ID_BITS)
+        )
+        self._last_ms = 0
+        self._sequence = 0
+        self.generated = 0
+        self.clock_regressions = 0
+
+    def _next_value(self) -> int:
+        with self._lock:
+            # Lido sob o lock: uma leitura feita antes de esperar pelo lock pode
+            # chegar atrasada e ser tomada por um retrocesso do relógio
+            now_ms = self._clock() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = secrets.randbits(_SEQUENCE_START_BITS)
+            else:
+                if now_ms < self._last_ms:
+                    self.clock_regressions += 1
+                self._sequence += 1
+                if self._sequence > _MAX_SEQUENCE:
+                    # Sequência esgotada: avança para o próximo milissegundo
+                    self._last_ms += 1
+                    self._sequence = secrets.randbits(_SEQUENCE_START_BITS)
+            self.generated += 1
+            return (self._last_ms << (WORKER_ID_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+    def generate(self) -> str:
+        """Retorna um novo ID de 26 caracteres"""
+        return _encode(self._next_value())
+
+    def new_id(self, prefix: str = "") -> str:
+        """
+        Retorna um novo ID com prefixo opcional
+
+        Args:
+            prefix: Prefixo legível (ex.: "user_")
+
+        Returns:
+            str: Prefixo seguido de 26 caracteres ordenáveis pelo tempo
+        """
+        return f"{prefix}{self.generate()}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do gerador"""
+        return {
+            "worker_id": self.worker_id,
+            "generated": self.generated,
+            "clock_regressions": self.clock_regressions
+        }
+
+
+def id_timestamp(value: str) -> datetime:
+    """
+    Extrai o instante de criação de um ID gerado por IdGenerator
+
+    Args:
+        value: ID com ou sem prefixo
+
+    Returns:
+        datetime: Instante de criação (UTC, sem timezone)
+
+    Raises:
+        ValueError: Se o valor não termina com um ID válido
+    """
+    encoded = value[-ID_LENGTH:]
+    if len(encoded) != ID_LENGTH or any(char not in _DECODE for char in encoded.upper()):
+        raise ValueError("ID inválido")
+    timestamp_ms = _decode(encoded) >> (WORKER_ID_BITS + SEQUENCE_BITS)
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+# Gerador do processo; substituível (ex.: worker id fixo por configuração)
+_generator = IdGenerator()
+
+
+def get_id_generator() -> IdGenerator:
+    """Retorna o gerador em uso no processo"""
+    return _generator
+
+
+def set_id_generator(generator: IdGenerator) -> None:
+    """Substitui o gerador em uso no processo"""
+    global _generator
+    _generator = generator
+
+
+def new_id(prefix: str = "") -> str:
+    """Gera um novo ID com o gerador do processo"""
+    return _generator.new_id(prefix)
@@ -0,0 +1,48 @@
+"""
+Serialização NDJSON em fluxo (opcionalmente gzip) para exportações
+"""
+import zlib
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List
+
+import orjson
+
+# wbits=31: formato gzip (cabeçalho + CRC), não zlib puro
+_GZIP_WBITS = 31
+
+
+async def encode_ndjson(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    compress: bool = False,
+    compress_level: int = 6
+) -> AsyncIterator[bytes]:
+    """
+    Converte lotes de registros em blocos NDJSON (uma linha JSON por registro)
+
+    Cada lote vira um único bloco: a memória fica limitada ao lote corrente,
+    independente do tamanho total da exportação. Se o consumidor parar (ex.:
+    cliente desconectou), o iterador de origem é fechado, liberando o cursor
+    do banco.
+
+    Args:
+        batches: Lotes de registros já em tipos JSON (datetime é aceito)
+        compress: Comprime o fluxo em gzip
+        compress_level: Nível de compressão (1 a 9)
+
+    Yields:
+        bytes: Bloco de linhas NDJSON (comprimido se compress=True)
+    """
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, _GZIP_WBITS) if compress else None
+    async with aclosing(batches):
+        async for batch in batches:
+            if not batch:
+                continue
+            chunk = b"\n".join([orjson.dumps(record) for record in batch]) + b"\n"
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    # O compressor ainda está acumulando: nada a enviar neste lote
+                    continue
+            yield chunk
+    if compressor is not None:
+        yield compressor.flush()
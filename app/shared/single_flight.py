@@ -0,0 +1,65 @@
+"""
+Agrupamento de chamadas concorrentes idênticas (single-flight)
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Garante no máximo uma execução em andamento por chave
+
+    Chamadas concorrentes com a mesma chave aguardam o mesmo resultado (ou a
+    mesma exceção) em vez de repetir a consulta ao backend. A execução roda em
+    uma task própria: se quem a iniciou for cancelado, os demais continuam
+    aguardando normalmente.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Marca a exceção como consumida mesmo se todos os chamadores foram cancelados
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Executa `func` ou aguarda a execução já em andamento para a mesma chave
+
+        Args:
+            key: Identificador da consulta (ex.: ("id", user_id))
+            func: Função assíncrona sem argumentos que faz a consulta
+
+        Returns:
+            T: Resultado compartilhado entre todos os chamadores concorrentes
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._on_done(key, done))
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """Desassocia a execução em andamento: a próxima chamada consulta o backend novamente"""
+        self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de agrupamento"""
+        coalesced = self.calls - self.executions
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": coalesced,
+            "coalesced_rate": coalesced / self.calls if self.calls else 0.0,
+            "in_flight": len(self._in_flight)
+        }
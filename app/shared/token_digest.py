@@ -0,0 +1,11 @@
+"""
+Digest compacto de tokens para uso como chave de cache e de índice
+"""
+import hashlib
+
+TOKEN_DIGEST_SIZE = 16
+
+
+def token_digest(token: str) -> bytes:
+    """Retorna o digest BLAKE2b de tamanho fixo de um token"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=TOKEN_DIGEST_SIZE).digest()
@@ -14,6 +14,8 @@ import uvicorn
 
 # Importar rotas de autenticação
 from app.interface.auth.auth_controller import auth_router
+from app.interface.audit_log.audit_log_controller import audit_log_router
+from app.interface.dependencies import container
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +41,7 @@ app.add_middleware(
 
 # Incluir rotas de autenticação
 app.include_router(auth_router)
+app.include_router(audit_log_router)
 
 # Variáveis de ambiente
 PROJECT_NAME = os.getenv("PROJECT_NAME", "VZR-LBS-v0-mvp-base-back")
@@ -113,6 +116,7 @@ async def database_status():
     
     return {
         "databases": status,
+        "startup": container.startup_report,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -178,11 +182,13 @@ async def startup_event():
     logger.info(f"🚀 Iniciando {PROJECT_NAME} na porta {API_PORT}")
     logger.info(f"📊 Modo debug: {API_DEBUG}")
     logger.info(f"🌐 Host: {API_HOST}")
+    await container.startup()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento de finalização"""
     logger.info(f"🛑 Finalizando {PROJECT_NAME}")
+    await container.shutdown()
 
 if __name__ == "__main__":
     uvicorn.run(
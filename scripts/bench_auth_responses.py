@@ -0,0 +1,66 @@
+"""
+Benchmark do custo de serialização das respostas de autenticação
+
+Faz `--requests` chamadas sequenciais a GET /api/v1/me pelo httpx.ASGITransport
+(sem rede, backends em memória) e relata o CPU do processo por requisição
+(inclui o cliente) e a latência p99, em `--runs` rodadas.
+
+Uso (na raiz do repositório):
+    python -m scripts.bench_auth_responses [--requests 5000] [--runs 3]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import main as application
+from app.domain.auth.user import UserStatus
+from app.interface.dependencies import container
+
+
+async def _signed_in_token(client: httpx.AsyncClient) -> str:
+    credentials = {"email": "bench@example.com", "password": "Senha@123"}
+    await client.post("/api/v1/signup", json={"name": "Benchmark", **credentials})
+    user = await container.user_repository.get_by_email(credentials["email"])
+    user.status = UserStatus.ACTIVE
+    user.email_verified = True
+    await container.user_repository.update(user)
+    response = await client.post("/api/v1/signin", json={"providerAuth": "basic", **credentials})
+    return response.json()["data"]["access_token"]
+
+
+async def _run(args) -> None:
+    await container.startup()
+    try:
+        transport = httpx.ASGITransport(app=application.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            headers = {"Authorization": f"Bearer {await _signed_in_token(client)}"}
+            for _ in range(200):
+                await client.get("/api/v1/me", headers=headers)
+
+            for run in range(1, args.runs + 1):
+                latencies = []
+                cpu_started_at = time.process_time()
+                for _ in range(args.requests):
+                    started_at = time.perf_counter()
+                    response = await client.get("/api/v1/me", headers=headers)
+                    latencies.append(time.perf_counter() - started_at)
+                    response.raise_for_status()
+                cpu_us = (time.process_time() - cpu_started_at) / args.requests * 1e6
+                latencies.sort()
+                p99_ms = latencies[int(len(latencies) * 0.99) - 1] * 1000
+                print(f"rodada {run}: {cpu_us:.0f} us CPU/req | p99 {p99_ms:.2f} ms")
+    finally:
+        await container.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--runs", type=int, default=3)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark de vazão do IdGenerator
+
+Relata IDs/s de generate() em uma thread e com `--threads` threads disputando
+o mesmo gerador (`--ids` IDs por thread), em `--runs` rodadas, e confere que
+nenhum ID se repete.
+
+Uso (na raiz do repositório):
+    python -m scripts.bench_id_generator [--threads 16] [--ids 50000] [--runs 3]
+"""
+import argparse
+import threading
+import time
+
+from app.shared.id_generator import IdGenerator
+
+
+def _measure(threads: int, ids_per_thread: int) -> float:
+    generator = IdGenerator(worker_id=1)
+    barrier = threading.Barrier(threads + 1)
+    results = [None] * threads
+
+    def worker(index: int) -> None:
+        generate = generator.generate
+        barrier.wait()
+        results[index] = [generate() for _ in range(ids_per_thread)]
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started_at = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    total = threads * ids_per_thread
+    if len({value for ids in results for value in ids}) != total:
+        raise RuntimeError("IDs duplicados")
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ids", type=int, default=50_000, help="IDs por thread")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for run in range(1, args.runs + 1):
+        single = _measure(1, args.ids)
+        concurrent = _measure(args.threads, args.ids)
+        print(f"rodada {run}: 1 thread {single:,.0f} IDs/s | {args.threads} threads {concurrent:,.0f} IDs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark de vazão do PostgresUserRepository (buscas quentes do login)
+
+Popula `--users` usuários e dispara `--concurrency` tarefas que alternam
+get_by_email e get_by_id durante `--seconds`, relatando operações/s e
+latências p50/p99. Os usuários criados pelo benchmark são removidos no fim.
+
+Contra o PostgreSQL do docker-compose (usa as variáveis DB_POSTGRES_*):
+    docker compose up -d postgres
+    DB_POSTGRES_HOST=localhost python -m scripts.bench_postgres_user_repository
+
+Sem servidor, `--sqlite` roda os mesmos statements em um SQLite em memória
+(só para validar o script; os números não representam o PostgreSQL).
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.domain.auth.user import User
+from app.infrastructure.database.postgres.tables import metadata
+from app.infrastructure.repositories.auth.postgres_user_repository import PostgresUserRepository
+
+
+class _SQLiteSetup:
+    """Mesma interface de sessão do PostgreSQLSetup sobre SQLite em memória"""
+
+    def __init__(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.get_async_session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def initialize(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+
+async def _worker(repository: PostgresUserRepository, users, deadline: float, latencies) -> None:
+    while time.perf_counter() < deadline:
+        user = random.choice(users)
+        started_at = time.perf_counter()
+        if random.random() < 0.5:
+            await repository.get_by_email(user.email.upper())
+        else:
+            await repository.get_by_id(user.id)
+        latencies.append(time.perf_counter() - started_at)
+
+
+async def _run(args) -> None:
+    if args.sqlite:
+        setup = _SQLiteSetup()
+        await setup.initialize()
+    else:
+        from app.infrastructure.database.postgres.setup import postgres_setup as setup
+        await setup.initialize()
+
+    repository = PostgresUserRepository(setup)
+    run_id = uuid.uuid4().hex[:8]
+    users = [
+        User(f"bench_{run_id}_{index}", f"bench-{run_id}-{index}@example.com", "Benchmark")
+        for index in range(args.users)
+    ]
+    try:
+        for user in users:
+            await repository.create(user)
+
+        latencies = []
+        deadline = time.perf_counter() + args.seconds
+        started_at = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(repository, users, deadline, latencies) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started_at
+
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(
+            f"{len(latencies)} buscas em {elapsed:.1f}s com {args.concurrency} tarefas: "
+            f"{len(latencies) / elapsed:,.0f} ops/s | p50 {statistics.median(latencies) * 1000:.2f} ms | "
+            f"p99 {p99:.2f} ms"
+        )
+    finally:
+        for user in users:
+            await repository.delete(user.id)
+        if args.sqlite:
+            await setup.close()
+        else:
+            setup.close_connections()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sqlite", action="store_true", help="SQLite em memória em vez do PostgreSQL")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark das buscas no repositório de sessões em memória
+
+Mede get_by_access_token e revoke_user_sessions com 1k, 10k e 100k sessões.
+Para comparar com outra versão, rode o mesmo script em um checkout dela
+(ex.: `git worktree add /tmp/antes <commit>` e `cd /tmp/antes`).
+
+Uso (na raiz do repositório):
+    python -m scripts.bench_session_lookup [--sizes 1000 10000 100000] [--lookups 2000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.domain.auth.auth_session import AuthSession
+from app.infrastructure.repositories.auth.auth_session_repository import InMemoryAuthSessionRepository
+
+
+async def _measure(size: int, lookups: int) -> None:
+    repository = InMemoryAuthSessionRepository()
+    tokens = []
+    for index in range(size):
+        # 10 sessões por usuário
+        session = AuthSession.create(f"user_{index // 10}", f"access-{index}", f"refresh-{index}")
+        await repository.create(session)
+        tokens.append(session.access_token)
+
+    sample = random.sample(tokens, min(lookups, size))
+    started_at = time.perf_counter()
+    for token in sample:
+        await repository.get_by_access_token(token)
+    lookup_us = (time.perf_counter() - started_at) / len(sample) * 1e6
+
+    users = random.sample(range(size // 10), min(100, size // 10))
+    started_at = time.perf_counter()
+    for user_index in users:
+        await repository.revoke_user_sessions(f"user_{user_index}")
+    revoke_us = (time.perf_counter() - started_at) / len(users) * 1e6
+
+    print(f"{size:>8} sessões | get_by_access_token {lookup_us:9.1f} us | revoke_user_sessions {revoke_us:9.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(_measure(size, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
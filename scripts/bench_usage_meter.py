@@ -0,0 +1,83 @@
+"""
+Benchmark de vazão do UsageMeter (meta: 50 mil incrementos/s por worker)
+
+Relata, em `--runs` rodadas, quantos incrementos/s o processo sustenta:
+- só increment() (agregação em memória, sem I/O)
+- increment() seguido de flush() a cada `--flush-every` incrementos, gravando
+  os deltas no Redis (HINCRBY em pipelines MULTI/EXEC)
+
+Os incrementos se espalham por `--accounts` contas e pelas três métricas.
+
+Contra o Redis do docker-compose (usa as variáveis REDIS_*):
+    docker compose up -d redis
+    python -m scripts.bench_usage_meter
+
+Sem servidor, `--fakeredis` usa o fakeredis em memória (só para validar o
+script; o custo do flush não representa o Redis real).
+"""
+import argparse
+import asyncio
+import time
+
+from app.domain.usage.usage import USAGE_METRICS
+from app.infrastructure.metering.usage_meter import UsageMeter
+
+
+def _events(count: int, accounts: int):
+    metrics = list(USAGE_METRICS)
+    return [(f"acc_{index % accounts}", metrics[index % len(metrics)]) for index in range(count)]
+
+
+def _increment_only(events) -> float:
+    meter = UsageMeter()
+    increment = meter.increment
+    started_at = time.perf_counter()
+    for account_id, metric in events:
+        increment(account_id, metric)
+    return len(events) / (time.perf_counter() - started_at)
+
+
+async def _with_flush(redis_setup, events, flush_every: int) -> float:
+    meter = UsageMeter(redis_setup, namespace=f"bench:usage:{time.time_ns()}:")
+    increment = meter.increment
+    started_at = time.perf_counter()
+    for index, (account_id, metric) in enumerate(events, 1):
+        increment(account_id, metric)
+        if index % flush_every == 0:
+            await meter.flush()
+    await meter.flush()
+    elapsed = time.perf_counter() - started_at
+    if meter.flush_errors:
+        raise RuntimeError(f"{meter.flush_errors} flushes falharam")
+    return len(events) / elapsed
+
+
+async def _run(args) -> None:
+    if args.fakeredis:
+        from tests.fake_redis import FakeRedisSetup
+        redis_setup = FakeRedisSetup()
+    else:
+        from app.infrastructure.database.redis.setup import redis_setup
+
+    events = _events(args.increments, args.accounts)
+    for run in range(1, args.runs + 1):
+        memory_rate = _increment_only(events)
+        redis_rate = await _with_flush(redis_setup, events, args.flush_every)
+        print(
+            f"rodada {run}: increment() {memory_rate:,.0f}/s | "
+            f"increment() + flush no Redis {redis_rate:,.0f}/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--increments", type=int, default=500_000)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--flush-every", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--fakeredis", action="store_true", help="fakeredis em memória em vez do Redis")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
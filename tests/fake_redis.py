@@ -0,0 +1,12 @@
+"""
+RedisSetup em memória (fakeredis) para os testes
+"""
+import fakeredis
+
+
+class FakeRedisSetup:
+    def __init__(self):
+        self.client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    def get_async_client(self):
+        return self.client
@@ -0,0 +1,53 @@
+"""
+Testes da fila de auditoria: encerramento limitado por shutdown_timeout_seconds
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.domain.audit_log.audit_log import AuditLog
+from app.infrastructure.audit.audit_log_sink import AuditLogSink
+from app.infrastructure.repositories.audit_log.audit_log_repository import InMemoryAuditLogRepository
+
+
+class HangingAuditLogRepository(InMemoryAuditLogRepository):
+    """Repositório cuja gravação em lote nunca termina"""
+
+    async def insert_many(self, logs):
+        await asyncio.Event().wait()
+
+
+def _log(index: int) -> AuditLog:
+    return AuditLog.create("auth.signin", "user", f"user_{index}", user_id=f"user_{index}")
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_queue():
+    repository = InMemoryAuditLogRepository()
+    sink = AuditLogSink(repository, batch_size=10)
+    for index in range(25):
+        sink.emit(_log(index))
+
+    await sink.stop()
+
+    stats = sink.get_stats()
+    assert stats["written"] == 25
+    assert stats["dropped"] == 0
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_respects_deadline_when_write_hangs():
+    sink = AuditLogSink(HangingAuditLogRepository(), batch_size=10, shutdown_timeout_seconds=0.2)
+    for index in range(25):
+        sink.emit(_log(index))
+
+    started_at = time.monotonic()
+    await asyncio.wait_for(sink.stop(), timeout=2)
+
+    assert time.monotonic() - started_at < 1
+    stats = sink.get_stats()
+    assert stats["written"] == 0
+    assert stats["dropped"] == 25
+    assert stats["queued"] == 0
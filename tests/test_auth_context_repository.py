@@ -0,0 +1,193 @@
+"""
+Testes do contexto de autenticação: sessão e usuário em um único round trip
+"""
+import secrets
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.domain.auth.auth_session import AuthSession, SessionStatus
+from app.domain.auth.user import User, UserStatus
+from app.infrastructure.database.postgres.tables import metadata
+from app.infrastructure.repositories.auth.cached_user_repository import CachedUserRepository
+from app.infrastructure.repositories.auth.postgres_auth_context_repository import PostgresAuthContextRepository
+from app.infrastructure.repositories.auth.postgres_auth_session_repository import PostgresAuthSessionRepository
+from app.infrastructure.repositories.auth.postgres_user_repository import PostgresUserRepository
+from app.infrastructure.repositories.auth.redis_auth_context_repository import RedisAuthContextRepository
+from app.infrastructure.repositories.auth.redis_auth_session_repository import RedisAuthSessionRepository
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
+from tests.fake_redis import FakeRedisSetup
+
+
+def _token(user_id: str) -> str:
+    return jwt.encode({"user_id": user_id, "jti": secrets.token_hex(8)}, "test-secret", algorithm="HS256")
+
+
+def _session(user_id: str) -> AuthSession:
+    return AuthSession.create(user_id, _token(user_id), _token(user_id))
+
+
+class CountingUserRepository(InMemoryUserRepository):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get_by_id(self, user_id):
+        self.reads += 1
+        return await super().get_by_id(user_id)
+
+
+class RoundTripCounter:
+    """Conta comandos avulsos e pipelines enviados ao Redis"""
+
+    def __init__(self, client):
+        self.commands = 0
+        self.pipelines = 0
+        execute_command = client.execute_command
+        pipeline = client.pipeline
+
+        async def counting_execute_command(*args, **kwargs):
+            self.commands += 1
+            return await execute_command(*args, **kwargs)
+
+        def counting_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def counting_execute(*execute_args, **execute_kwargs):
+                self.pipelines += 1
+                return await execute(*execute_args, **execute_kwargs)
+            pipe.execute = counting_execute
+            return pipe
+
+        client.execute_command = counting_execute_command
+        client.pipeline = counting_pipeline
+
+    @property
+    def round_trips(self) -> int:
+        return self.commands + self.pipelines
+
+
+async def _redis_setup():
+    redis_setup = FakeRedisSetup()
+    origin = CountingUserRepository()
+    await origin.create(User("user_1", "ana@example.com", "Ana", status=UserStatus.ACTIVE, email_verified=True))
+    sessions = RedisAuthSessionRepository(redis_setup)
+    cache = CachedUserRepository(origin, redis_setup)
+    session = _session("user_1")
+    await sessions.create(session)
+    return redis_setup, origin, sessions, cache, session
+
+
+@pytest.mark.asyncio
+async def test_redis_context_reads_session_and_l2_user_in_one_pipeline():
+    redis_setup, origin, sessions, cache, session = await _redis_setup()
+    # Outro worker já preencheu o L2
+    await CachedUserRepository(origin, redis_setup).get_by_id("user_1")
+    origin.reads = 0
+    repository = RedisAuthContextRepository(sessions, cache, cache)
+    counter = RoundTripCounter(redis_setup.client)
+
+    context = await repository.get_by_access_token(session.access_token)
+
+    assert context.session.id == session.id and context.user.id == "user_1"
+    assert counter.round_trips == 1
+    assert origin.reads == 0
+
+    # Usuário agora no L1: só o HGETALL da sessão
+    counter.commands = counter.pipelines = 0
+    assert (await repository.get_by_access_token(session.access_token)).user.id == "user_1"
+    assert counter.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_context_falls_back_to_origin_on_l2_miss():
+    redis_setup, origin, sessions, cache, session = await _redis_setup()
+    repository = RedisAuthContextRepository(sessions, cache, cache)
+
+    context = await repository.get_by_access_token(session.access_token)
+
+    assert context.user.id == "user_1"
+    assert origin.reads == 1
+    assert await redis_setup.client.get(cache.l2_key("user_1")) is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_context_rejects_unknown_and_unreadable_tokens():
+    redis_setup, origin, sessions, cache, session = await _redis_setup()
+    repository = RedisAuthContextRepository(sessions, cache, cache)
+
+    assert await repository.get_by_access_token(_token("user_1")) is None
+    assert await repository.get_by_access_token("not-a-jwt") is None
+    # Sessão inexistente: a origem de usuários nem é consultada
+    assert origin.reads == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_context_without_user_cache():
+    redis_setup, origin, sessions, cache, session = await _redis_setup()
+    repository = RedisAuthContextRepository(sessions, origin)
+
+    context = await repository.get_by_access_token(session.access_token)
+
+    assert context.session.id == session.id and context.user.id == "user_1"
+
+
+class SQLitePostgresSetup:
+    """Mesma interface do PostgreSQLSetup sobre SQLite em memória (statements portáveis)"""
+
+    def __init__(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.get_async_session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def create_tables(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+
+async def _postgres_setup():
+    postgres_setup = SQLitePostgresSetup()
+    await postgres_setup.create_tables()
+    users = PostgresUserRepository(postgres_setup)
+    sessions = PostgresAuthSessionRepository(postgres_setup)
+    await users.create(User("user_1", "ana@example.com", "Ana", status=UserStatus.ACTIVE, email_verified=True))
+    return postgres_setup, users, sessions
+
+
+@pytest.mark.asyncio
+async def test_postgres_context_joins_session_and_user():
+    postgres_setup, users, sessions = await _postgres_setup()
+    session = _session("user_1")
+    await sessions.create(session)
+    repository = PostgresAuthContextRepository(postgres_setup)
+
+    context = await repository.get_by_access_token(session.access_token)
+
+    assert context.session.id == session.id
+    assert context.session.access_token_digest == session.access_token_digest
+    assert context.user.id == "user_1" and context.user.email == "ana@example.com"
+    assert context.session.created_at == session.created_at
+    assert context.is_valid()
+    assert await repository.get_by_access_token(_token("user_1")) is None
+    await postgres_setup.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_postgres_sessions_revoke_and_purge():
+    postgres_setup, users, sessions = await _postgres_setup()
+    active, revoked, expired = _session("user_1"), _session("user_1"), _session("user_1")
+    expired.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    for session in (active, revoked, expired):
+        await sessions.create(session)
+
+    revoked.revoke()
+    await sessions.update(revoked)
+    assert (await sessions.get_by_access_token(revoked.access_token)).status == SessionStatus.REVOKED
+
+    assert await sessions.purge_expired(limit=10) == 2
+    assert [session.id for session in await sessions.get_by_user_id("user_1")] == [active.id]
+    assert await sessions.revoke_user_sessions("user_1") == 1
+    assert (await sessions.get_by_id(active.id)).status == SessionStatus.REVOKED
+    await postgres_setup.engine.dispose()
@@ -0,0 +1,54 @@
+"""
+Testes de contrato das respostas de autenticação: o JSON de cada endpoint
+corresponde exatamente ao modelo documentado no response_model
+"""
+import uuid
+
+import httpx
+import pytest
+
+import main as application
+from app.domain.auth.user import UserStatus
+from app.interface.auth.auth_dto import PrincipalResponse, RefreshResponse, SignInResponse, SignUpResponse
+from app.interface.dependencies import container
+
+
+def _assert_matches(model, body: dict) -> None:
+    # Round trip: campos faltando falham na validação, campos extras na comparação
+    assert model.model_validate(body).model_dump(mode="json") == body
+
+
+@pytest.mark.asyncio
+async def test_auth_endpoints_match_documented_models():
+    credentials = {"email": f"contract-{uuid.uuid4().hex[:8]}@example.com", "password": "Senha@123"}
+    await container.startup()
+    try:
+        transport = httpx.ASGITransport(app=application.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/signup", json={"name": "Contrato", **credentials})
+            assert response.status_code == 200
+            _assert_matches(SignUpResponse, response.json())
+
+            user = await container.user_repository.get_by_email(credentials["email"])
+            user.status = UserStatus.ACTIVE
+            user.email_verified = True
+            await container.user_repository.update(user)
+
+            response = await client.post("/api/v1/signin", json={"providerAuth": "basic", **credentials})
+            assert response.status_code == 200
+            signin = response.json()
+            _assert_matches(SignInResponse, signin)
+
+            headers = {"Authorization": f"Bearer {signin['data']['access_token']}"}
+            response = await client.get("/api/v1/me", headers=headers)
+            assert response.status_code == 200
+            _assert_matches(PrincipalResponse, response.json())
+
+            response = await client.post(
+                "/api/v1/refresh",
+                params={"refresh_token": signin["data"]["refresh_token"]}
+            )
+            assert response.status_code == 200
+            _assert_matches(RefreshResponse, response.json())
+    finally:
+        await container.shutdown()
@@ -0,0 +1,46 @@
+"""
+Testes do repositório de sessões em memória: varredura limitada por chamada
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.auth.auth_session import AuthSession
+from app.infrastructure.repositories.auth.auth_session_repository import InMemoryAuthSessionRepository
+
+
+def _session(index: int, expires_at: datetime) -> AuthSession:
+    session = AuthSession.create(f"user_{index}", f"access-{index}", f"refresh-{index}")
+    session.expires_at = expires_at
+    return session
+
+
+@pytest.mark.asyncio
+async def test_purge_counts_stale_heap_entries_against_limit():
+    repository = InMemoryAuthSessionRepository()
+    past = datetime.utcnow() - timedelta(minutes=1)
+    sessions = [_session(index, past) for index in range(100)]
+    for session in sessions:
+        await repository.create(session)
+    # Removidas antes da varredura: só deixam entradas antigas no heap
+    for session in sessions[:80]:
+        await repository.delete(session.id)
+
+    heap_size = len(repository._expiry_heap)
+    assert await repository.purge_expired(limit=50) == 0
+    assert heap_size - len(repository._expiry_heap) == 50
+
+    assert await repository.purge_expired(limit=50) == 20
+    assert await repository.get_by_user_id("user_99") == []
+
+
+@pytest.mark.asyncio
+async def test_purge_keeps_sessions_that_were_extended():
+    repository = InMemoryAuthSessionRepository()
+    session = _session(1, datetime.utcnow() - timedelta(seconds=1))
+    await repository.create(session)
+    session.expires_at = datetime.utcnow() + timedelta(hours=1)
+    await repository.update(session)
+
+    assert await repository.purge_expired(limit=10) == 0
+    assert (await repository.get_by_access_token("access-1")).id == session.id
@@ -0,0 +1,69 @@
+"""
+Testes do cache de usuários em dois níveis: preenchimentos atrasados não sobrescrevem escritas
+"""
+import asyncio
+
+import pytest
+
+from app.domain.auth.user import User, UserStatus
+from app.infrastructure.repositories.auth.cached_user_repository import CachedUserRepository
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
+from tests.fake_redis import FakeRedisSetup
+
+
+class SlowReadUserRepository(InMemoryUserRepository):
+    """Origem cuja leitura devolve a linha antes de uma escrita concorrente terminar"""
+
+    def __init__(self):
+        super().__init__()
+        self.read_started = asyncio.Event()
+        self.release_read = asyncio.Event()
+
+    async def get_by_id(self, user_id):
+        user = await super().get_by_id(user_id)
+        snapshot = User.from_row(user.to_row()) if user is not None else None
+        self.read_started.set()
+        await self.release_read.wait()
+        return snapshot
+
+
+async def _setup():
+    origin = SlowReadUserRepository()
+    await origin.create(User("user_1", "ana@example.com", "Ana", status=UserStatus.ACTIVE))
+    redis_setup = FakeRedisSetup()
+    reader = CachedUserRepository(origin, redis_setup)
+    writer = CachedUserRepository(origin, redis_setup)
+    return origin, redis_setup, reader, writer
+
+
+@pytest.mark.asyncio
+async def test_stale_read_fill_does_not_overwrite_update():
+    origin, redis_setup, reader, writer = await _setup()
+
+    pending_read = asyncio.ensure_future(reader.get_by_id("user_1"))
+    await origin.read_started.wait()
+
+    suspended = User.from_row((await InMemoryUserRepository.get_by_id(origin, "user_1")).to_row())
+    suspended.status = UserStatus.SUSPENDED
+    await writer.update(suspended)
+
+    origin.release_read.set()
+    await pending_read
+
+    # Outro worker, sem L1: lê do L2, que deve manter o valor da escrita
+    other = CachedUserRepository(origin, redis_setup)
+    assert (await other.get_by_id("user_1")).status == UserStatus.SUSPENDED
+
+
+@pytest.mark.asyncio
+async def test_stale_read_fill_does_not_resurrect_deleted_user():
+    origin, redis_setup, reader, writer = await _setup()
+
+    pending_read = asyncio.ensure_future(reader.get_by_id("user_1"))
+    await origin.read_started.wait()
+    await writer.delete("user_1")
+    origin.release_read.set()
+    await pending_read
+
+    other = CachedUserRepository(origin, redis_setup)
+    assert await other.get_by_id("user_1") is None
@@ -0,0 +1,77 @@
+"""
+Testes do controle de admissão do login e da resolução do IP do cliente
+"""
+from contextlib import AsyncExitStack
+
+import pytest
+
+from app.domain.auth.services.login_admission import AdmissionRejectedError, LoginAdmissionController
+from app.shared.client_ip import parse_trusted_proxies, resolve_client_ip
+
+
+async def _hold(controller: LoginAdmissionController, stack: AsyncExitStack, count: int, **keys) -> None:
+    for _ in range(count):
+        await stack.enter_async_context(controller.admit(**keys))
+
+
+@pytest.mark.asyncio
+async def test_email_and_ip_have_separate_limits():
+    controller = LoginAdmissionController(max_concurrent=64, max_per_email=1, max_per_ip=3)
+    async with AsyncExitStack() as stack:
+        # Três emails diferentes no mesmo IP cabem no orçamento do IP
+        for index in range(3):
+            await _hold(controller, stack, 1, email=f"user{index}@example.com", client_ip="203.0.113.7")
+
+        with pytest.raises(AdmissionRejectedError) as ip_rejection:
+            await _hold(controller, stack, 1, email="user9@example.com", client_ip="203.0.113.7")
+        with pytest.raises(AdmissionRejectedError) as email_rejection:
+            await _hold(controller, stack, 1, email="USER0@example.com", client_ip="198.51.100.1")
+
+    assert ip_rejection.value.reason == AdmissionRejectedError.REASON_KEY
+    assert email_rejection.value.reason == AdmissionRejectedError.REASON_KEY
+    metrics = controller.get_metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["shed"][AdmissionRejectedError.REASON_KEY] == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_attempt_does_not_hold_keys():
+    controller = LoginAdmissionController(max_concurrent=1, max_waiting=0, max_per_email=2, max_per_ip=2)
+    async with controller.admit(email="a@example.com", client_ip="203.0.113.7"):
+        with pytest.raises(AdmissionRejectedError) as rejection:
+            async with controller.admit(email="b@example.com", client_ip="203.0.113.7"):
+                pass
+    assert rejection.value.reason == AdmissionRejectedError.REASON_GLOBAL
+
+    async with controller.admit(email="b@example.com", client_ip="203.0.113.7"):
+        assert controller.get_metrics()["in_flight"] == 1
+
+
+TRUSTED = parse_trusted_proxies("10.0.0.0/8, 127.0.0.1")
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peer():
+    assert resolve_client_ip("203.0.113.7", "1.2.3.4", TRUSTED) == "203.0.113.7"
+
+
+def test_forwarded_for_from_trusted_proxy_uses_rightmost_untrusted_hop():
+    # O cliente forjou "1.2.3.4"; o proxy acrescentou o IP real da conexão
+    assert resolve_client_ip("10.0.0.5", "1.2.3.4, 203.0.113.7, 10.0.0.9", TRUSTED) == "203.0.113.7"
+
+
+def test_forwarded_for_without_untrusted_hop_uses_leftmost():
+    assert resolve_client_ip("127.0.0.1", "10.1.1.1, 10.0.0.9", TRUSTED) == "10.1.1.1"
+
+
+def test_malformed_forwarded_for_falls_back_to_peer():
+    assert resolve_client_ip("10.0.0.5", "1.2.3.4, not-an-ip", TRUSTED) == "10.0.0.5"
+
+
+def test_no_trusted_proxies_by_default():
+    assert parse_trusted_proxies("") == []
+    assert resolve_client_ip("127.0.0.1", "1.2.3.4", []) == "127.0.0.1"
+
+
+def test_invalid_trusted_proxy_is_rejected():
+    with pytest.raises(ValueError):
+        parse_trusted_proxies("10.0.0.0/8,proxy.local")
@@ -0,0 +1,65 @@
+"""
+Testes do AsyncPasswordHasher: hashes que excedem o tempo limite continuam
+ocupando a fila até terminarem no pool
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.domain.auth.services.password_hasher import (
+    AsyncPasswordHasher,
+    PasswordHasherBusyError,
+    PasswordHasherTimeoutError,
+)
+
+
+async def _wait_pending(hasher: AsyncPasswordHasher, expected: int) -> None:
+    for _ in range(200):
+        if hasher.get_stats()["pending"] == expected:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"pending={hasher.get_stats()['pending']}, esperado {expected}")
+
+
+@pytest.mark.asyncio
+async def test_timed_out_hash_keeps_its_slot_until_done():
+    hasher = AsyncPasswordHasher(max_workers=1, max_pending=1, timeout_seconds=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(PasswordHasherTimeoutError):
+            await hasher._run(release.wait)
+        assert hasher.get_stats()["pending"] == 1
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher._run(lambda: True)
+
+        release.set()
+        await _wait_pending(hasher, 0)
+        assert await hasher._run(lambda: True) is True
+        assert hasher.get_stats()["timeouts"] == 1
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_queued_hash_is_cancelled():
+    hasher = AsyncPasswordHasher(max_workers=1, max_pending=2, timeout_seconds=0.05)
+    release = threading.Event()
+    ran = []
+    try:
+        results = await asyncio.gather(
+            hasher._run(release.wait),
+            hasher._run(ran.append, "queued"),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, PasswordHasherTimeoutError) for result in results)
+        # Só o trabalho em execução segura a vaga; o que estava na fila do pool foi cancelado
+        await _wait_pending(hasher, 1)
+
+        release.set()
+        await _wait_pending(hasher, 0)
+        assert ran == []
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,36 @@
+"""
+Testes do QuotaEngine: contas sem plano são negadas, nunca ilimitadas
+"""
+import pytest
+
+from app.domain.plan.plan import BillingCycle, Plan
+from app.infrastructure.metering.quota_engine import NoActivePlanError, QuotaEngine, QuotaExceededError
+from app.infrastructure.metering.usage_meter import UsageMeter
+from app.infrastructure.repositories.plan.plan_repository import InMemoryPlanRepository
+
+
+def _plan(limits):
+    return Plan("plan_free", "free", "Free", "free", 0.0, BillingCycle("monthly", 1), limits, [], "active")
+
+
+@pytest.mark.asyncio
+async def test_account_without_plan_is_denied():
+    engine = QuotaEngine(InMemoryPlanRepository(), UsageMeter())
+
+    with pytest.raises(NoActivePlanError):
+        await engine.check("acc_unknown", "messages_count")
+    with pytest.raises(NoActivePlanError):
+        await engine.consume("acc_unknown", "messages_count")
+
+
+@pytest.mark.asyncio
+async def test_explicit_default_plan_applies_to_unassigned_accounts():
+    plans = InMemoryPlanRepository(default_plan_id="plan_free")
+    await plans.save(_plan({"messages_count": 2}))
+    engine = QuotaEngine(plans, UsageMeter())
+
+    await engine.consume("acc_1", "messages_count")
+    check = await engine.consume("acc_1", "messages_count")
+    assert check.remaining == 0
+    with pytest.raises(QuotaExceededError):
+        await engine.consume("acc_1", "messages_count")
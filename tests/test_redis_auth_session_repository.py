@@ -0,0 +1,134 @@
+"""
+Testes do repositório de sessões no Redis: chaves com hash tag e scripts só com KEYS
+"""
+import secrets
+
+import jwt
+import pytest
+
+from app.domain.auth.auth_session import AuthSession, SessionStatus
+from app.domain.auth.services.token_service import TokenService
+from app.infrastructure.repositories.auth.redis_auth_session_repository import (
+    _REVOKE_USER_SESSIONS_SCRIPT,
+    RedisAuthSessionRepository,
+)
+from tests.fake_redis import FakeRedisSetup
+
+
+
+def _token(user_id: str) -> str:
+    # jti aleatório: tokens do mesmo usuário emitidos no mesmo segundo seriam idênticos
+    return jwt.encode({"user_id": user_id, "jti": secrets.token_hex(8)}, "test-secret", algorithm="HS256")
+
+
+def _session(user_id: str) -> AuthSession:
+    return AuthSession.create(user_id, _token(user_id), _token(user_id))
+
+
+def _declared_keys_only(redis_setup: FakeRedisSetup):
+    """Envolve o script para registrar as chaves declaradas em cada chamada"""
+    calls = []
+    client = redis_setup.client
+    register_script = client.register_script
+
+    def recording_register_script(script):
+        registered = register_script(script)
+
+        async def call(keys=(), args=(), client=None):
+            calls.append(list(keys))
+            return await registered(keys=keys, args=args)
+        return call
+
+    client.register_script = recording_register_script
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_session_keys_share_the_user_slot():
+    redis_setup = FakeRedisSetup()
+    repository = RedisAuthSessionRepository(redis_setup)
+    session = _session("user_1")
+    await repository.create(session)
+
+    keys = sorted(await redis_setup.client.keys("*"))
+    assert keys == sorted([
+        f"session:{{user_1}}:{session.access_token_digest.hex()}",
+        "session:{user_1}:index",
+        f"session:id:{session.id}"
+    ])
+
+
+@pytest.mark.asyncio
+async def test_lookups_by_token_id_and_user():
+    repository = RedisAuthSessionRepository(FakeRedisSetup())
+    session = _session("user_1")
+    other = _session("user_2")
+    await repository.create(session)
+    await repository.create(other)
+
+    assert (await repository.get_by_access_token(session.access_token)).id == session.id
+    assert (await repository.get_by_id(session.id)).user_id == "user_1"
+    assert [found.id for found in await repository.get_by_user_id("user_1")] == [session.id]
+    assert await repository.get_by_access_token("not-a-jwt") is None
+    assert await repository.get_by_access_token(_token("user_1")) is None
+    assert TokenService.peek_user_id(session.access_token) == "user_1"
+
+
+@pytest.mark.asyncio
+async def test_update_with_new_token_moves_the_session():
+    redis_setup = FakeRedisSetup()
+    repository = RedisAuthSessionRepository(redis_setup)
+    session = _session("user_1")
+    await repository.create(session)
+
+    refreshed = _session("user_1")
+    old_token = session.access_token
+    session.access_token = refreshed.access_token
+    session.access_token_digest = refreshed.access_token_digest
+    await repository.update(session)
+
+    assert await repository.get_by_access_token(old_token) is None
+    assert (await repository.get_by_access_token(refreshed.access_token)).id == session.id
+    assert await redis_setup.client.smembers("session:{user_1}:index") == {refreshed.access_token_digest.hex()}
+
+
+@pytest.mark.asyncio
+async def test_revoke_declares_every_touched_key():
+    redis_setup = FakeRedisSetup()
+    calls = _declared_keys_only(redis_setup)
+    repository = RedisAuthSessionRepository(redis_setup)
+    sessions = [_session("user_1") for _ in range(3)]
+    for session in sessions:
+        await repository.create(session)
+    # Sessão expirada: some o hash, o digest continua no índice
+    await redis_setup.client.delete(repository.session_key("user_1", sessions[0].access_token_digest.hex()))
+
+    assert await repository.revoke_user_sessions("user_1") == 2
+
+    assert len(calls) == 1
+    assert calls[0][0] == "session:{user_1}:index"
+    assert sorted(calls[0][1:]) == sorted(
+        repository.session_key("user_1", session.access_token_digest.hex()) for session in sessions
+    )
+    for session in sessions[1:]:
+        assert (await repository.get_by_access_token(session.access_token)).status == SessionStatus.REVOKED
+    assert await redis_setup.client.smembers("session:{user_1}:index") == {
+        session.access_token_digest.hex() for session in sessions[1:]
+    }
+
+
+def test_scripts_do_not_build_key_names():
+    # Chaves montadas dentro do script (concatenação com ARGV) quebram no Redis Cluster
+    assert ".." not in _REVOKE_USER_SESSIONS_SCRIPT
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_every_key():
+    redis_setup = FakeRedisSetup()
+    repository = RedisAuthSessionRepository(redis_setup)
+    session = _session("user_1")
+    await repository.create(session)
+
+    assert await repository.delete(session.id) is True
+    assert await repository.delete(session.id) is False
+    assert await redis_setup.client.keys("*") == []
@@ -0,0 +1,47 @@
+"""
+Testes do cadastro: cadastros concorrentes do mesmo email
+"""
+import asyncio
+
+import pytest
+
+from app.aplication.auth.signup_use_case import SignUpUseCase
+from app.domain.auth.services.auth_service import AuthService
+from app.domain.auth.services.token_service import TokenService
+from app.domain.auth.user import User
+from app.infrastructure.repositories.auth.auth_provider_repository import InMemoryAuthProviderRepository
+from app.infrastructure.repositories.auth.single_flight_repository import SingleFlightUserRepository
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository, UserAlreadyExistsError
+
+
+@pytest.mark.asyncio
+async def test_in_memory_create_rejects_duplicate_email():
+    repository = InMemoryUserRepository()
+    await repository.create(User("user_1", "ana@example.com", "Ana"))
+
+    with pytest.raises(UserAlreadyExistsError):
+        await repository.create(User("user_2", " Ana@Example.com", "Outra Ana"))
+
+    assert (await repository.get_by_email("ana@example.com")).id == "user_1"
+    assert await repository.get_by_id("user_2") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_signups_for_same_email_create_one_user():
+    origin = InMemoryUserRepository()
+    auth_service = AuthService(TokenService("test-secret"))
+    signup = SignUpUseCase(auth_service, SingleFlightUserRepository(origin), InMemoryAuthProviderRepository())
+    try:
+        # Os dois passam pela verificação prévia enquanto o hash da senha roda no executor
+        results = await asyncio.gather(
+            signup.execute_basic("ana@example.com", "Ana", "Senha@123"),
+            signup.execute_basic("ana@example.com", "Ana", "Senha@123"),
+            return_exceptions=True
+        )
+    finally:
+        auth_service.password_hasher.shutdown()
+
+    created = [result for result in results if isinstance(result, dict)]
+    rejected = [result for result in results if isinstance(result, ValueError)]
+    assert len(created) == 1 and len(rejected) == 1
+    assert len(await origin.list_all()) == 1
@@ -0,0 +1,143 @@
+"""
+Testes dos repositórios single-flight: chamadas ao backend sob buscas concorrentes idênticas
+"""
+import asyncio
+
+import pytest
+
+from app.aplication.auth.signin_use_case import SignInUseCase
+from app.aplication.auth.signup_use_case import SignUpUseCase
+from app.domain.auth.auth_session import AuthSession
+from app.domain.auth.services.auth_service import AuthService
+from app.domain.auth.services.token_service import TokenService
+from app.domain.auth.user import User, UserStatus
+from app.infrastructure.repositories.auth.auth_provider_repository import InMemoryAuthProviderRepository
+from app.infrastructure.repositories.auth.auth_session_repository import InMemoryAuthSessionRepository
+from app.infrastructure.repositories.auth.single_flight_repository import (
+    SingleFlightAuthSessionRepository,
+    SingleFlightUserRepository,
+)
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
+
+
+class CountingUserRepository(InMemoryUserRepository):
+    """Repositório em memória com latência artificial e contagem de leituras"""
+
+    def __init__(self, delay: float = 0.01):
+        super().__init__()
+        self.delay = delay
+        self.reads = 0
+        self.fail = False
+
+    async def get_by_email(self, email):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend indisponível")
+        return await super().get_by_email(email)
+
+    async def get_by_id(self, user_id):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return await super().get_by_id(user_id)
+
+
+class CountingSessionRepository(InMemoryAuthSessionRepository):
+    def __init__(self, delay: float = 0.01):
+        super().__init__()
+        self.delay = delay
+        self.reads = 0
+
+    async def get_by_access_token(self, access_token):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return await super().get_by_access_token(access_token)
+
+
+async def _user_repository():
+    origin = CountingUserRepository()
+    await origin.create(User("user_1", "ana@example.com", "Ana", status=UserStatus.ACTIVE))
+    return origin, SingleFlightUserRepository(origin)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_lookups_hit_backend_once():
+    origin, repository = await _user_repository()
+
+    users = await asyncio.gather(*(repository.get_by_email("Ana@Example.com ") for _ in range(100)))
+
+    assert origin.reads == 1
+    assert all(user.id == "user_1" for user in users)
+    # Cada chamador recebe sua própria cópia
+    assert len({id(user) for user in users}) == 100
+    assert repository.get_stats()["calls"] == 100
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_are_not_coalesced():
+    origin, repository = await _user_repository()
+
+    await asyncio.gather(repository.get_by_id("user_1"), repository.get_by_email("ana@example.com"))
+
+    assert origin.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_error_is_shared_by_all_waiters():
+    origin, repository = await _user_repository()
+    origin.fail = True
+
+    results = await asyncio.gather(
+        *(repository.get_by_email("ana@example.com") for _ in range(20)),
+        return_exceptions=True
+    )
+
+    assert origin.reads == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_write_detaches_in_flight_lookup():
+    origin, repository = await _user_repository()
+
+    pending = asyncio.ensure_future(repository.get_by_id("user_1"))
+    await asyncio.sleep(0)
+    user = await origin.get_by_id("user_1")
+    user.name = "Ana Maria"
+    await repository.update(user)
+    fresh = await repository.get_by_id("user_1")
+    await pending
+
+    assert origin.reads == 3
+    assert fresh.name == "Ana Maria"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_session_lookups_hit_backend_once():
+    origin = CountingSessionRepository()
+    repository = SingleFlightAuthSessionRepository(origin)
+    session = AuthSession.create("user_1", "access-token", "refresh-token")
+    await repository.create(session)
+
+    sessions = await asyncio.gather(*(repository.get_by_access_token("access-token") for _ in range(50)))
+
+    assert origin.reads == 1
+    assert all(found.id == session.id for found in sessions)
+
+
+@pytest.mark.asyncio
+async def test_signin_persists_last_login_through_single_flight():
+    origin = InMemoryUserRepository()
+    users = SingleFlightUserRepository(origin)
+    auth_service = AuthService(TokenService("test-secret"))
+    signup = SignUpUseCase(auth_service, users, InMemoryAuthProviderRepository())
+    signin = SignInUseCase(auth_service, users, InMemoryAuthSessionRepository())
+    try:
+        created = await signup.execute_basic("ana@example.com", "Ana", "Senha@123")
+        result = await signin.execute_basic("ana@example.com", "Senha@123")
+    finally:
+        auth_service.password_hasher.shutdown()
+
+    assert result is not None
+    stored = await origin.get_by_id(created["user"]["id"])
+    assert stored.last_login_at is not None
@@ -0,0 +1,181 @@
+"""
+Testes do UsageMeter: totais em memória e no Redis, fila em falhas, rollup
+idempotente, encerramento durante um flush e virada de período
+"""
+import asyncio
+import calendar
+from datetime import datetime
+
+import pytest
+from redis.asyncio.client import Pipeline
+
+from app.infrastructure.metering.usage_meter import UsageMeter
+from app.infrastructure.repositories.usage.usage_repository import InMemoryUsageRepository
+from tests.fake_redis import FakeRedisSetup
+
+NOW = calendar.timegm(datetime(2024, 5, 15, 12, 0).timetuple())
+MAY = datetime(2024, 5, 1)
+
+
+class _Clock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _redis_setup(backend: str):
+    return FakeRedisSetup() if backend == "redis" else None
+
+
+def _patch_execute(monkeypatch, before_execute):
+    """Executa `before_execute` antes de cada EXEC dos pipelines (fakeredis)"""
+    original = Pipeline.execute
+
+    async def execute(pipe, *args, **kwargs):
+        await before_execute()
+        return await original(pipe, *args, **kwargs)
+
+    monkeypatch.setattr(Pipeline, "execute", execute)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+async def test_flush_accumulates_totals(backend):
+    meter = UsageMeter(_redis_setup(backend), clock=_Clock(), flush_batch_size=2)
+    for _ in range(100):
+        meter.increment("acc_1", "messages_count")
+    meter.increment("acc_1", "storage_bytes", 2048)
+    meter.increment("acc_2", "groups_count", 3)
+    meter.increment("acc_2", "groups_count", -1)
+
+    assert await meter.flush() == 3
+    meter.increment("acc_1", "messages_count", 5)
+    assert await meter.flush() == 1
+
+    totals = await meter.get_period_totals(MAY)
+    assert totals["acc_1"] == {"messages_count": 105, "groups_count": 0, "storage_bytes": 2048}
+    assert totals["acc_2"] == {"messages_count": 0, "groups_count": 2, "storage_bytes": 0}
+    assert await meter.get_account_totals("acc_1") == totals["acc_1"]
+    assert meter.get_stats()["pending_keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_counters(monkeypatch):
+    async def fail():
+        raise ConnectionError("redis indisponível")
+
+    meter = UsageMeter(FakeRedisSetup(), clock=_Clock())
+    meter.increment("acc_1", "messages_count", 7)
+    _patch_execute(monkeypatch, fail)
+
+    assert await meter.flush() == 0
+    assert meter.flush_errors == 1
+    assert meter.get_pending("acc_1")["messages_count"] == 7
+
+    monkeypatch.undo()
+    meter.increment("acc_1", "messages_count", 1)
+    assert await meter.flush() == 1
+    assert (await meter.get_account_totals("acc_1"))["messages_count"] == 8
+
+
+@pytest.mark.asyncio
+async def test_requeue_is_bounded_by_max_pending_keys(monkeypatch):
+    meter = UsageMeter(FakeRedisSetup(), clock=_Clock(), max_pending_keys=2)
+
+    async def fail_after_new_traffic():
+        # Chaves novas chegam durante a gravação e ocupam a fila inteira
+        meter.increment("acc_3", "messages_count")
+        meter.increment("acc_4", "messages_count")
+        raise ConnectionError("redis indisponível")
+
+    meter.increment("acc_1", "messages_count")
+    meter.increment("acc_2", "messages_count")
+    _patch_execute(monkeypatch, fail_after_new_traffic)
+
+    assert await meter.flush() == 0
+    assert meter.dropped_keys == 2
+    assert meter.get_stats()["pending_keys"] == 2
+    assert meter.get_pending("acc_1")["messages_count"] == 0
+    assert meter.get_pending("acc_3")["messages_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rollup_is_idempotent():
+    repository = InMemoryUsageRepository()
+    meter = UsageMeter(repository=repository, clock=_Clock())
+    meter.increment("acc_1", "messages_count", 10)
+
+    assert await meter.rollup(MAY) == 1
+    first = await repository.get_by_account_period("acc_1", MAY)
+    assert await meter.rollup(MAY) == 1
+    again = await repository.get_by_account_period("acc_1", MAY)
+    assert again.id == first.id
+    assert again.messages_count == 10
+
+    meter.increment("acc_1", "messages_count", 5)
+    await meter.rollup(MAY)
+    updated = await repository.get_by_account_period("acc_1", MAY)
+    assert updated.id == first.id
+    assert updated.messages_count == 15
+    assert updated.period_end == datetime(2024, 6, 1)
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_keeps_counters(monkeypatch):
+    writing = asyncio.Event()
+
+    async def slow():
+        writing.set()
+        await asyncio.sleep(0.2)
+
+    meter = UsageMeter(FakeRedisSetup(), clock=_Clock(), flush_interval_seconds=0.01)
+    _patch_execute(monkeypatch, slow)
+    await meter.start()
+    for _ in range(1000):
+        meter.increment("acc_1", "messages_count")
+    await asyncio.wait_for(writing.wait(), timeout=1.0)
+    meter.increment("acc_1", "messages_count")
+
+    await meter.stop()
+
+    assert (await meter.get_account_totals("acc_1"))["messages_count"] == 1001
+    assert meter.flushes == 2
+    assert meter.get_stats()["pending_keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_requeues_counters(monkeypatch):
+    writing = asyncio.Event()
+
+    async def hang():
+        writing.set()
+        await asyncio.Event().wait()
+
+    meter = UsageMeter(FakeRedisSetup(), clock=_Clock())
+    meter.increment("acc_1", "messages_count", 3)
+    _patch_execute(monkeypatch, hang)
+    flush = asyncio.create_task(meter.flush())
+    await writing.wait()
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+
+    assert meter.get_pending("acc_1")["messages_count"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+async def test_increments_roll_over_to_next_period(backend):
+    clock = _Clock(calendar.timegm(datetime(2024, 5, 31, 23, 59, 59).timetuple()))
+    meter = UsageMeter(_redis_setup(backend), clock=clock)
+    meter.increment("acc_1", "messages_count", 2)
+    clock.now += 1
+    meter.increment("acc_1", "messages_count", 3)
+    await meter.flush()
+
+    assert meter.get_current_period() == (datetime(2024, 6, 1), datetime(2024, 7, 1))
+    assert (await meter.get_period_totals(MAY))["acc_1"]["messages_count"] == 2
+    assert (await meter.get_period_totals(datetime(2024, 6, 1)))["acc_1"]["messages_count"] == 3
+    assert (await meter.get_account_totals("acc_1"))["messages_count"] == 3
@@ -0,0 +1,24 @@
+"""
+Testes do repositório de usuários em memória: exportação em lotes
+"""
+import pytest
+
+from app.domain.auth.user import User
+from app.infrastructure.repositories.auth.user_repository import InMemoryUserRepository
+
+
+@pytest.mark.asyncio
+async def test_in_memory_iter_batches_tolerates_signups_during_export():
+    repository = InMemoryUserRepository()
+    for index in range(5):
+        await repository.create(User(f"user_{index}", f"user{index}@example.com", "Usuário"))
+
+    exported = []
+    async for batch in repository.iter_batches(batch_size=2):
+        assert len(batch) <= 2
+        exported.extend(user.id for user in batch)
+        if len(exported) == 2:
+            # Cadastro concorrente no meio da exportação
+            await repository.create(User("user_5", "user5@example.com", "Usuário"))
+
+    assert exported == [f"user_{index}" for index in range(6)]